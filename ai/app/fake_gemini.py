@@ -0,0 +1,148 @@
+"""Local stand-in for the Gemini REST API, for load tests.
+
+Answers ``POST /v1beta/models/{model}:generateContent`` with a response whose
+text is JSON matching the schema ``contract_ai.llm`` asks for, after a
+configurable latency. Failures can be injected as a random 500 rate and as
+periodic bursts of 429s (every ``--burst-every`` seconds for
+``--burst-seconds``). ``GET /stats`` returns request counters.
+
+Point the service at it with:
+
+    GEMINI_API_KEY=fake GEMINI_API_ENDPOINT=http://127.0.0.1:8089
+
+Usage: python -m app.fake_gemini --port 8089 --latency-ms 800 --error-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import asdict, dataclass
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 500.0
+    jitter_ms: float = 200.0
+    error_rate: float = 0.0
+    burst_every: float = 0.0
+    burst_seconds: float = 0.0
+
+
+_PARTIES_RE = re.compile(r"between\s+(.+?)\s+and\s+(.+?)[.,\n]", re.I)
+_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+
+
+def fake_payload(prompt: str) -> dict:
+    """Schema-valid extraction for the contract text after the prompt's ``TEXT:`` marker."""
+    text = prompt.split("TEXT:", 1)[-1]
+    parties = []
+    m = _PARTIES_RE.search(text)
+    if m:
+        parties = [{"name": m.group(1).strip(), "role": "Party A"}, {"name": m.group(2).strip(), "role": "Party B"}]
+    dates = _DATE_RE.findall(text)
+    risks = []
+    if "renew" in text.lower():
+        risks.append({
+            "id": "risk.auto_renew.llm",
+            "severity": "medium",
+            "title": "Automatic renewal",
+            "detail": "Contract renews automatically.",
+            "clause_snippet": None,
+            "references": [],
+        })
+    return {
+        "metadata": {
+            "parties": parties,
+            "effective_date": dates[0] if dates else None,
+            "execution_date": None,
+            "expiration_date": dates[1] if len(dates) > 1 else None,
+            "amounts": [],
+            "obligations": [],
+            "governing_law": None,
+        },
+        "risks": risks,
+    }
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake Gemini")
+    started = time.monotonic()
+    stats = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0}
+
+    def _in_burst() -> bool:
+        if config.burst_every <= 0 or config.burst_seconds <= 0:
+            return False
+        return (time.monotonic() - started) % config.burst_every >= config.burst_every - config.burst_seconds
+
+    @app.post("/v1beta/models/{target}")
+    async def generate_content(target: str, request: Request):
+        stats["requests"] += 1
+        body = await request.json()
+        if _in_burst():
+            stats["throttled"] += 1
+            return JSONResponse(status_code=429, content={"error": {"code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"}})
+        delay = max(0.0, random.gauss(config.latency_ms, config.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if random.random() < config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=500, content={"error": {"code": 500, "message": "Internal error", "status": "INTERNAL"}})
+        prompt = "".join(
+            part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])
+        )
+        stats["ok"] += 1
+        return {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [{"text": json.dumps(fake_payload(prompt))}]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": 200},
+            "modelVersion": target.split(":", 1)[0],
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "config": asdict(config)}
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        for key in stats:
+            stats[key] = 0
+        return stats
+
+    return app
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(prog="app.fake_gemini", description="Local stand-in for the Gemini API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8089)
+    p.add_argument("--latency-ms", dest="latency_ms", type=float, default=500.0, help="Mean response latency")
+    p.add_argument("--jitter-ms", dest="jitter_ms", type=float, default=200.0, help="Latency standard deviation")
+    p.add_argument("--error-rate", dest="error_rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    p.add_argument("--burst-every", dest="burst_every", type=float, default=0.0, help="Seconds between 429 bursts (0: none)")
+    p.add_argument("--burst-seconds", dest="burst_seconds", type=float, default=0.0, help="Length of each 429 burst")
+    args = p.parse_args(argv)
+    config = FakeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_seconds=args.burst_seconds,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
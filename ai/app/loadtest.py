@@ -0,0 +1,342 @@
+"""End-to-end load test of the service against the local fake Gemini.
+
+Starts ``app.fake_gemini`` and the service (``app.serve``, pointed at the fake
+through GEMINI_API_ENDPOINT), drives a concurrent mix of ``/extract``,
+``/analyze/upload`` and ``/draft`` requests for a fixed duration and prints a
+JSON report: requests per second, latency percentiles per endpoint, LLM
+fallback rate (LLM-path requests the fake did not answer successfully) and
+the service's resident memory.
+
+Usage:
+    python -m app.loadtest --workers 4 --concurrency 32 --duration 30 \\
+        --latency-ms 800 --error-rate 0.02 --burst-every 20 --burst-seconds 2
+
+Pass ``--url`` to load an already running service instead (with
+``--fake-url`` if it is wired to a fake Gemini, for the fallback rate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+
+ENDPOINTS = ("extract", "analyze_upload", "draft")
+LLM_ENDPOINTS = ("extract", "analyze_upload")
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def sample_contract(i: int, clauses: int = 20) -> str:
+    """A synthetic contract; ``i`` makes its bytes unique so no cache can answer it."""
+    lines = [
+        f"SERVICES AGREEMENT NO. {i}",
+        f"This Agreement is made between Acme Corp {i} and Beta LLC.",
+        "Effective date: 2025-01-01. Expires on 2026-12-31.",
+    ]
+    for n in range(1, clauses + 1):
+        lines.append(f"{n}. Clause {n}")
+        lines.append(
+            f"Beta LLC shall deliver item {n} of order {i} within thirty (30) days and "
+            f"Acme Corp {i} shall pay USD {1000 + n} on 2025-03-15."
+        )
+    lines.append(f"{clauses + 1}. Renewal\nThis agreement has automatic renewal.")
+    lines.append(f"{clauses + 2}. Governing Law\nThis Agreement is governed by the laws of Singapore.")
+    return "\n".join(lines) + "\n"
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+# --- memory (Linux /proc) ---------------------------------------------------
+
+def _proc_kb(pid: int, field: str) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="ascii") as f:
+            for child in f.read().split():
+                pids.extend(_process_tree(int(child)))
+    except OSError:
+        pass
+    return pids
+
+
+class MemorySampler:
+    """Tracks the summed RSS of a process tree while the load runs."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self.last_kb = 0
+        self.hwm_kb: Dict[int, int] = {}
+
+    def sample(self) -> None:
+        total = 0
+        for pid in _process_tree(self.pid):
+            rss = _proc_kb(pid, "VmRSS")
+            hwm = _proc_kb(pid, "VmHWM")
+            total += rss or 0
+            if hwm:
+                self.hwm_kb[pid] = max(self.hwm_kb.get(pid, 0), hwm)
+        self.last_kb = total
+        self.peak_kb = max(self.peak_kb, total)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        if self.pid is None or not os.path.exists(f"/proc/{self.pid}"):
+            return
+        while not stop.is_set():
+            self.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+        self.sample()
+
+    def report(self) -> Optional[Dict[str, object]]:
+        if not self.peak_kb:
+            return None
+        return {
+            "processes": len(self.hwm_kb),
+            "rss_peak_mb": round(self.peak_kb / 1024, 1),
+            "rss_final_mb": round(self.last_kb / 1024, 1),
+            "per_process_hwm_mb": sorted((round(v / 1024, 1) for v in self.hwm_kb.values()), reverse=True),
+        }
+
+
+# --- processes ----------------------------------------------------------------
+
+def _spawn(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", *args], cwd=str(APP_DIR), env=env, start_new_session=True)
+
+
+def _stop(proc: Optional[subprocess.Popen]) -> None:
+    if proc is None or proc.poll() is not None:
+        return
+    os.killpg(proc.pid, signal.SIGTERM)
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+async def _wait_ready(client: httpx.AsyncClient, url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+# --- load ---------------------------------------------------------------------
+
+async def _request(client: httpx.AsyncClient, base: str, endpoint: str, i: int, args) -> httpx.Response:
+    if endpoint == "extract":
+        return await client.post(f"{base}/extract", params={"text_mode": "none"}, json={"text": sample_contract(i, args.doc_clauses)})
+    if endpoint == "analyze_upload":
+        files = {"file": (f"contract-{i}.txt", sample_contract(i, args.doc_clauses).encode("utf-8"), "text/plain")}
+        return await client.post(f"{base}/analyze/upload", files=files)
+    return await client.post(
+        f"{base}/draft",
+        json={
+            "contract_type": "base",
+            "variables": {"party_a": f"Acme Corp {i}", "party_b": "Beta LLC"},
+            "clauses": ["confidentiality", "limitation_of_liability", "termination"],
+        },
+    )
+
+
+async def drive(base: str, args, weights: Dict[str, float]) -> Dict[str, List]:
+    """Run ``args.concurrency`` clients for ``args.duration`` seconds; returns per-endpoint samples."""
+    results: Dict[str, List] = {e: [] for e in ENDPOINTS}
+    names = list(weights)
+    probs = [weights[n] for n in names]
+    rng = random.Random(args.seed)
+    counter = iter(range(1, 1 << 62))
+    deadline = time.monotonic() + args.duration
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+
+        async def worker() -> None:
+            while time.monotonic() < deadline:
+                endpoint = rng.choices(names, probs)[0]
+                i = next(counter) if args.unique else 0
+                t0 = time.perf_counter()
+                try:
+                    status = (await _request(client, base, endpoint, i, args)).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                results[endpoint].append((status, time.perf_counter() - t0))
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return results
+
+
+def summarize(results: Dict[str, List], elapsed: float) -> Dict[str, object]:
+    report: Dict[str, object] = {}
+    total = ok = 0
+    for endpoint, samples in results.items():
+        if not samples:
+            continue
+        lat = sorted(s[1] * 1000 for s in samples)
+        errors = sum(1 for s in samples if s[0] != 200)
+        total += len(samples)
+        ok += len(samples) - errors
+        report[endpoint] = {
+            "requests": len(samples),
+            "errors": errors,
+            "rps": round(len(samples) / elapsed, 2),
+            "latency_ms": {
+                "p50": round(percentile(lat, 50), 1),
+                "p90": round(percentile(lat, 90), 1),
+                "p95": round(percentile(lat, 95), 1),
+                "p99": round(percentile(lat, 99), 1),
+                "max": round(lat[-1], 1),
+            },
+        }
+    return {"requests": total, "ok": ok, "rps": round(total / elapsed, 2), "endpoints": report}
+
+
+def _parse_mix(spec: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name} (expected {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def run(args) -> Dict[str, object]:
+    weights = _parse_mix(args.mix)
+    fake = service = None
+    fake_url = args.fake_url
+    base = args.url
+    env = dict(os.environ)
+    try:
+        if base is None:
+            if fake_url is None:
+                fake_url = f"http://127.0.0.1:{args.fake_port}"
+                fake = _spawn(
+                    [
+                        "app.fake_gemini", "--port", str(args.fake_port),
+                        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+                        "--error-rate", str(args.error_rate),
+                        "--burst-every", str(args.burst_every), "--burst-seconds", str(args.burst_seconds),
+                    ],
+                    env,
+                )
+            env.update(
+                GEMINI_API_KEY=env.get("GEMINI_API_KEY") or "fake",
+                GEMINI_API_ENDPOINT=fake_url,
+                WEB_CONCURRENCY=str(args.workers),
+                CONTRACT_AI_LLM_CACHE="1" if args.llm_cache else "0",
+                CONTRACT_AI_CACHE_DIR=env.get("CONTRACT_AI_CACHE_DIR") or tempfile.mkdtemp(prefix="contract-ai-load-"),
+            )
+            service = _spawn(["app.serve", "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(args.workers)], env)
+            base = f"http://127.0.0.1:{args.port}"
+
+        async with httpx.AsyncClient(timeout=10) as client:
+            if fake is not None:
+                await _wait_ready(client, f"{fake_url}/stats", args.startup_timeout)
+            await _wait_ready(client, f"{base}/ready", args.startup_timeout)
+            if fake_url:
+                await client.post(f"{fake_url}/stats/reset")
+
+        memory = MemorySampler(service.pid if service is not None else args.service_pid)
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(memory.run(stop))
+        t0 = time.monotonic()
+        results = await drive(base, args, weights)
+        elapsed = time.monotonic() - t0
+        stop.set()
+        await sampler
+
+        report = summarize(results, elapsed)
+        report["duration_s"] = round(elapsed, 2)
+        report["concurrency"] = args.concurrency
+        report["workers"] = args.workers if service is not None else None
+        report["memory"] = memory.report()
+        llm_requests = sum(1 for e in LLM_ENDPOINTS for s in results[e] if s[0] == 200)
+        report["llm_requests"] = llm_requests
+        report["fallback_rate"] = None
+        if fake_url:
+            async with httpx.AsyncClient(timeout=10) as client:
+                fake_stats = (await client.get(f"{fake_url}/stats")).json()
+            report["fake_gemini"] = fake_stats
+            if llm_requests:
+                answered = min(fake_stats["ok"], llm_requests)
+                report["fallback_rate"] = round(1 - answered / llm_requests, 4)
+        return report
+    finally:
+        _stop(service)
+        _stop(fake)
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(prog="app.loadtest", description="Load-test the service against a fake Gemini")
+    p.add_argument("--url", help="Load an already running service instead of starting one")
+    p.add_argument("--service-pid", dest="service_pid", type=int, help="With --url: pid of the service, for memory stats")
+    p.add_argument("--fake-url", dest="fake_url", help="Use an already running fake Gemini")
+    p.add_argument("--port", type=int, default=8099, help="Port for the spawned service")
+    p.add_argument("--fake-port", dest="fake_port", type=int, default=8089, help="Port for the spawned fake Gemini")
+    p.add_argument("--workers", type=int, default=1, help="Service worker processes")
+    p.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections")
+    p.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    p.add_argument("--mix", default="extract=4,analyze_upload=4,draft=2", help="Endpoint weights")
+    p.add_argument("--doc-clauses", dest="doc_clauses", type=int, default=20, help="Clauses per synthetic contract")
+    p.add_argument("--repeat-docs", dest="unique", action="store_false", help="Send the same document every time (cache-friendly)")
+    p.add_argument("--llm-cache", dest="llm_cache", action="store_true", help="Leave the service's Gemini response cache on")
+    p.add_argument("--latency-ms", dest="latency_ms", type=float, default=500.0)
+    p.add_argument("--jitter-ms", dest="jitter_ms", type=float, default=200.0)
+    p.add_argument("--error-rate", dest="error_rate", type=float, default=0.0)
+    p.add_argument("--burst-every", dest="burst_every", type=float, default=0.0)
+    p.add_argument("--burst-seconds", dest="burst_seconds", type=float, default=0.0)
+    p.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    p.add_argument("--startup-timeout", dest="startup_timeout", type=float, default=90.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--output", "-o", help="Also write the report to this file")
+    args = p.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import hmac
 import json
+import logging
 import os
 import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack, asynccontextmanager
+from datetime import date
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field
 
-from contract_ai.parser import load_text
+from contract_ai.cache import default_cache_dir, env_truthy, load_document_cached
+from contract_ai.clauses import classify as classify_clauses
 from contract_ai.extractor import extract
+from contract_ai.language import detect_languages
+from contract_ai.limits import PeakBusy, UploadTooLarge, cap_text, get_limits, track_peak
 from contract_ai.risk import analyze as analyze_risk
-from contract_ai.compliance import check as check_compliance, load_policies
-from contract_ai.drafting import render_contract, select_clauses
+from contract_ai.compliance import check as check_compliance, default_policies
+from contract_ai.drafting import TEMPLATES_DIR, load_clause_library, render_contract, select_clauses
+from contract_ai import warmup
+from contract_ai.parser import ParsedText
+from contract_ai.response import TEXT_MODES, parse_fields, shape_extraction, to_json
+from contract_ai.segment import lower_text
 from contract_ai.types import (
     ExtractionResult,
     AnalysisResult,
+    ClauseMatch,
+    RevisionAnalysisResult,
+    SearchHit,
+    ContractDiff,
+    SimilarContract,
     DraftRequest,
     DraftResult,
 )
@@ -28,16 +48,210 @@ try:
 except Exception:
     pass
 
-app = FastAPI(title="Contract AI Service", version="0.1.0")
+logger = logging.getLogger("contract_ai.app")
+
+
+async def _run_warm_up(app: FastAPI) -> None:
+    try:
+        app.state.warmup = await asyncio.to_thread(warmup.warm_up)
+    except Exception as e:
+        # A failed warm-up only means cold first requests; still become ready
+        logger.warning("warm-up failed: %s", e)
+        app.state.warmup = {"error": str(e)}
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.warmup = None
+    task = None
+    if warmup.last_timings is not None:
+        # Already warmed in the pre-fork master (see app.serve)
+        app.state.warmup = warmup.last_timings
+        app.state.ready = True
+    elif not warmup.enabled():
+        app.state.ready = True
+    else:
+        # Warm up in the background so /health answers immediately while /ready reports 503
+        task = asyncio.create_task(_run_warm_up(app))
+    yield
+    if task is not None and not task.done():
+        task.cancel()
+
+
+app = FastAPI(title="Contract AI Service", version="0.1.0", lifespan=lifespan)
+
+# Per-document memory budget (CONTRACT_AI_MAX_UPLOAD_MB / _MAX_PAGES / _MAX_CHARS)
+LIMITS = get_limits()
+
+
+class BodySizeLimit:
+    """
+    Reject request bodies above ``max_bytes`` with 413 before they are
+    buffered: up front from Content-Length, otherwise as soon as the streamed
+    body crosses the limit. Body parsers turn errors from ``receive`` into a
+    400, so that response is dropped and the 413 sent in its place.
+    """
+
+    def __init__(self, app, max_bytes: Optional[int]):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.max_bytes is None:
+            return await self.app(scope, receive, send)
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > self.max_bytes
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    response = JSONResponse(status_code=413, content={"detail": str(UploadTooLarge(self.max_bytes))})
+                    return await response(scope, receive, send)
+                break
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge(self.max_bytes)
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded and not started:
+                return
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # Whatever the app made of the failed read, the answer is 413
+            if not exceeded or started:
+                raise
+        if exceeded and not started:
+            response = JSONResponse(status_code=413, content={"detail": str(UploadTooLarge(self.max_bytes))})
+            await response(scope, receive, send)
+
+
+app.add_middleware(BodySizeLimit, max_bytes=LIMITS.max_upload_bytes)
+
+
+if env_truthy("CONTRACT_AI_TRACE_MEMORY"):
+    # Opt-in (tracemalloc slows allocation-heavy code): report a request's peak
+    # traced Python heap in X-Peak-Memory-KB. One request per worker is measured
+    # at a time; requests arriving meanwhile get "X-Peak-Memory-Status: busy". The
+    # measured request's value also includes allocations of requests running
+    # alongside it, so under load it is an upper bound.
+    tracemalloc.start()
+
+    @app.middleware("http")
+    async def trace_memory(request, call_next):
+        with ExitStack() as stack:
+            try:
+                peak = stack.enter_context(track_peak())
+            except PeakBusy:
+                peak = None
+            response = await call_next(request)
+        if peak is None:
+            response.headers["X-Peak-Memory-Status"] = "busy"
+            return response
+        response.headers["X-Peak-Memory-KB"] = str(peak.peak_bytes // 1024)
+        return response
+
+
+def _profiling_allowed(request) -> bool:
+    # Read per request so a deployed service can be opened up without a restart
+    token = os.getenv("CONTRACT_AI_PROFILING_TOKEN")
+    if token:
+        return hmac.compare_digest(request.headers.get("x-profile-token", ""), token)
+    return env_truthy("CONTRACT_AI_PROFILING")
+
+
+# Debug-only: a request carrying "X-Profile: pstats|speedscope" is profiled and
+# the file path returned in X-Profile-File when its X-Profile-Token matches
+# CONTRACT_AI_PROFILING_TOKEN or, without a token configured, when
+# CONTRACT_AI_PROFILING=1. Deploy with a token to profile live traffic on
+# demand; requests without the header only pay for one header lookup.
+# The profile covers the worker's event-loop thread for the request's duration,
+# so anything else that worker runs meanwhile (other requests, background
+# tasks) is included; profile on an otherwise idle worker for clean results.
+@app.middleware("http")
+async def profile_request(request, call_next):
+    fmt = request.headers.get("x-profile")
+    if not fmt or not _profiling_allowed(request):
+        return await call_next(request)
+    from contract_ai.profiling import FORMATS, ProfilerBusy, profiled
+
+    if fmt not in FORMATS:
+        return JSONResponse(status_code=400, content={"detail": f"X-Profile must be one of {', '.join(FORMATS)}"})
+    directory = Path(os.getenv("CONTRACT_AI_PROFILE_DIR") or default_cache_dir() / "profiles")
+    slug = request.url.path.strip("/").replace("/", "-") or "root"
+    path = directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{slug}.{'speedscope.json' if fmt == 'speedscope' else 'prof'}"
+    with ExitStack() as stack:
+        try:
+            prof = stack.enter_context(profiled(path, fmt, name=f"{request.method} {request.url.path}"))
+        except ProfilerBusy:
+            # Another request is being profiled; serve this one unprofiled
+            prof = None
+        response = await call_next(request)
+    if prof is None:
+        response.headers["X-Profile-Status"] = "busy"
+        return response
+    response.headers["X-Profile-File"] = str(prof.path)
+    response.headers["X-Profile-Seconds"] = f"{prof.elapsed:.4f}"
+    return response
 
 
 class ExtractBody(BaseModel):
     text: Optional[str] = None
+    # When set, the result is also written to the portfolio search index
+    document_id: Optional[str] = None
 
 
 class AnalyzeBody(BaseModel):
     text: Optional[str] = None
     policies: Optional[List[Dict[str, Any]]] = None
+    # Stable id for the contract, e.g. the API's contract id: indexes the result
+    # for /search, and /analyze/revision tracks revisions under it
+    document_id: Optional[str] = None
+
+
+class DiffBody(BaseModel):
+    old_text: Optional[str] = None
+    new_text: Optional[str] = None
+    policies: Optional[List[Dict[str, Any]]] = None
+    use_llm: bool = True
+
+
+class RevisionBody(AnalyzeBody):
+    # Compare a first upload against its closest indexed contract
+    reuse_similar: bool = False
+
+
+class SearchBody(BaseModel):
+    text: Optional[str] = None
+    party: Optional[str] = None
+    expires_after: Optional[date] = None
+    expires_before: Optional[date] = None
+    risk_id: Optional[str] = None
+    policy_id: Optional[str] = None
+    limit: int = Field(50, ge=1, le=1000)
+
+
+class SimilarBody(BaseModel):
+    text: Optional[str] = None
+    top_k: int = 5
+    threshold: float = 0.5
 
 
 @app.get("/health")
@@ -45,18 +259,22 @@ async def health():
     return {"status": "ok"}
 
 
-@app.post("/extract", response_model=ExtractionResult)
-async def extract_json(body: ExtractBody) -> ExtractionResult:
-    if not body.text:
-        raise HTTPException(status_code=400, detail="Missing text")
-    txt = body.text
+@app.get("/ready")
+async def ready():
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", "warmup_ms": app.state.warmup}
+
+
+def _extract_text(txt: str) -> ExtractionResult:
+    langs = detect_languages(txt)
     # Try LLM, fall back to rules
     try:
         from contract_ai.llm import GeminiClient
 
         llm = GeminiClient()
-        lr = llm.extract_and_analyze(txt)
-        rules = extract(txt)
+        lr = llm.extract_and_analyze(txt, langs[0])
+        rules = extract(txt, langs=langs)
         meta = lr.metadata.model_copy(
             update={
                 "effective_date": lr.metadata.effective_date or rules.metadata.effective_date,
@@ -67,65 +285,23 @@ async def extract_json(body: ExtractBody) -> ExtractionResult:
                 "obligations": lr.metadata.obligations or rules.metadata.obligations,
             }
         )
-        return ExtractionResult(text=txt, metadata=meta)
+        return ExtractionResult(text=txt, metadata=meta, language=langs[0])
     except Exception:
-        ex = extract(txt)
-        return ex
+        return extract(txt, langs=langs)
 
 
-@app.post("/extract/upload", response_model=ExtractionResult)
-async def extract_upload(file: UploadFile = File(...)) -> ExtractionResult:
-    # Persist to temp file to reuse existing loaders
-    suffix = "" if not file.filename else ("_" + os.path.basename(file.filename))
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    try:
-        content = await file.read()
-        tmp.write(content)
-        tmp.close()
-        txt = load_text(tmp.name)
-        # Reuse /extract logic without duplicating merge
-        try:
-            from contract_ai.llm import GeminiClient
-
-            llm = GeminiClient()
-            lr = llm.extract_and_analyze(txt)
-            rules = extract(txt)
-            meta = lr.metadata.model_copy(
-                update={
-                    "effective_date": lr.metadata.effective_date or rules.metadata.effective_date,
-                    "execution_date": lr.metadata.execution_date or rules.metadata.execution_date,
-                    "expiration_date": lr.metadata.expiration_date or rules.metadata.expiration_date,
-                    "parties": lr.metadata.parties or rules.metadata.parties,
-                    "amounts": lr.metadata.amounts or rules.metadata.amounts,
-                    "obligations": lr.metadata.obligations or rules.metadata.obligations,
-                }
-            )
-            return ExtractionResult(text=txt, metadata=meta)
-        except Exception:
-            return extract(txt)
-    finally:
-        try:
-            os.unlink(tmp.name)
-        except Exception:
-            pass
-
-
-@app.post("/analyze", response_model=AnalysisResult)
-async def analyze_json(body: AnalyzeBody) -> AnalysisResult:
-    if not body.text:
-        raise HTTPException(status_code=400, detail="Missing text")
-    txt = body.text
-    if body.policies is not None:
-        policies = body.policies
-    else:
-        res_path = Path(__file__).resolve().parent.parent / "contract_ai" / "resources" / "policies.yaml"
-        policies = load_policies(str(res_path)) if res_path.exists() else []
+def _analyze_text(txt: str, policies: List[Dict[str, Any]]) -> AnalysisResult:
+    # One lowercased view shared by clause classification, risk and compliance,
+    # and one language detection selecting the rule sets and prompt
+    lower = lower_text(txt)
+    langs = detect_languages(txt, lower)
+    clauses = classify_clauses(txt, lower=lower)
     try:
         from contract_ai.llm import GeminiClient
 
         llm = GeminiClient()
-        lr = llm.extract_and_analyze(txt)
-        rules = extract(txt)
+        lr = llm.extract_and_analyze(txt, langs[0])
+        rules = extract(txt, langs=langs)
         merged_meta = lr.metadata.model_copy(
             update={
                 "effective_date": rules.metadata.effective_date or lr.metadata.effective_date,
@@ -135,97 +311,253 @@ async def analyze_json(body: AnalyzeBody) -> AnalysisResult:
                 "obligations": rules.metadata.obligations or lr.metadata.obligations,
             }
         )
-        rr = analyze_risk(txt, merged_meta)
+        rr = analyze_risk(txt, merged_meta, clauses, lower, langs)
         combined = {r.id: r for r in lr.risks}
         for r in rr:
             combined.setdefault(r.id, r)
-        comp = check_compliance(merged_meta, txt, policies)
+        comp = check_compliance(merged_meta, txt, policies, clauses, lower)
         return AnalysisResult(
             metadata=merged_meta,
             risks=list(combined.values()),
             compliance=comp,
+            clauses=clauses,
+            language=langs[0],
         )
     except Exception:
-        ex = extract(txt)
-        risks = analyze_risk(txt, ex.metadata)
-        comp = check_compliance(ex.metadata, txt, policies)
-        return AnalysisResult(metadata=ex.metadata, risks=risks, compliance=comp)
+        ex = extract(txt, langs=langs)
+        risks = analyze_risk(txt, ex.metadata, clauses, lower, langs)
+        comp = check_compliance(ex.metadata, txt, policies, clauses, lower)
+        return AnalysisResult(metadata=ex.metadata, risks=risks, compliance=comp, clauses=clauses, language=langs[0])
 
 
-@app.post("/analyze/upload", response_model=AnalysisResult)
-async def analyze_upload(file: UploadFile = File(...)) -> AnalysisResult:
+async def _read_upload(file: UploadFile) -> ParsedText:
+    # Persist to temp file to reuse existing loaders, copying in chunks so the
+    # upload is never held in memory whole
+    limit = LIMITS.max_upload_bytes
+    if limit is not None and file.size is not None and file.size > limit:
+        raise HTTPException(status_code=413, detail=str(UploadTooLarge(limit)))
     suffix = "" if not file.filename else ("_" + os.path.basename(file.filename))
     tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
     try:
-        content = await file.read()
-        tmp.write(content)
+        written = 0
+        while chunk := await file.read(1 << 20):
+            written += len(chunk)
+            if limit is not None and written > limit:
+                raise HTTPException(status_code=413, detail=str(UploadTooLarge(limit)))
+            tmp.write(chunk)
         tmp.close()
-        txt = load_text(tmp.name)
-        # Default policies from resources
-        res_path = Path(__file__).resolve().parent.parent / "contract_ai" / "resources" / "policies.yaml"
-        policies = load_policies(str(res_path)) if res_path.exists() else []
-        try:
-            from contract_ai.llm import GeminiClient
-
-            llm = GeminiClient()
-            lr = llm.extract_and_analyze(txt)
-            rules = extract(txt)
-            merged_meta = lr.metadata.model_copy(
-                update={
-                    "effective_date": rules.metadata.effective_date or lr.metadata.effective_date,
-                    "execution_date": rules.metadata.execution_date or lr.metadata.execution_date,
-                    "expiration_date": rules.metadata.expiration_date or lr.metadata.expiration_date,
-                    "amounts": rules.metadata.amounts or lr.metadata.amounts,
-                    "obligations": rules.metadata.obligations or lr.metadata.obligations,
-                }
-            )
-            rr = analyze_risk(txt, merged_meta)
-            combined = {r.id: r for r in lr.risks}
-            for r in rr:
-                combined.setdefault(r.id, r)
-            comp = check_compliance(merged_meta, txt, policies)
-            return AnalysisResult(
-                metadata=merged_meta,
-                risks=list(combined.values()),
-                compliance=comp,
-            )
-        except Exception:
-            ex = extract(txt)
-            risks = analyze_risk(txt, ex.metadata)
-            comp = check_compliance(ex.metadata, txt, policies)
-            return AnalysisResult(metadata=ex.metadata, risks=risks, compliance=comp)
+        return load_document_cached(tmp.name, max_pages=LIMITS.max_pages, max_chars=LIMITS.max_chars)
     finally:
+        tmp.close()
         try:
             os.unlink(tmp.name)
         except Exception:
             pass
 
 
-@app.post("/draft", response_model=DraftResult)
-async def draft(request: DraftRequest) -> DraftResult:
-    resources = Path(__file__).resolve().parent.parent / "contract_ai" / "resources"
-    clauses_path = resources / "clauses.yaml"
-    clause_library = None
-    if clauses_path.exists():
+def _inline(txt: str) -> ParsedText:
+    """Text sent in a JSON body, cut to the character budget."""
+    text, truncation = cap_text(txt, LIMITS.max_chars)
+    return ParsedText(text=text, truncation=truncation)
+
+
+def _index(document_id: Optional[str], result: BaseModel, txt: str) -> None:
+    from contract_ai.search import index_document
+
+    if document_id:
+        index_document(document_id, result, txt)
+
+
+def _json_response(model: BaseModel, fields: Optional[str]) -> Response:
+    return Response(content=to_json(model, include=parse_fields(fields)), media_type="application/json")
+
+
+def _extraction_response(result: ExtractionResult, text_mode: str, fields: Optional[str], offsets: Optional[List[int]] = None) -> Response:
+    return _json_response(shape_extraction(result, text_mode, offsets), fields)
+
+
+# Response shaping shared by the extract/analyze endpoints:
+#   text_mode: full | none | hash | offsets (extract endpoints only)
+#   fields:    comma-separated dotted paths to include, e.g. "metadata.parties,risks"
+TextMode = Query("full", pattern="^(" + "|".join(TEXT_MODES) + ")$")
+Fields = Query(None, description="Comma-separated dotted field paths to include")
+
+
+@app.post("/extract", response_model=ExtractionResult)
+async def extract_json(body: ExtractBody, text_mode: str = TextMode, fields: Optional[str] = Fields):
+    if not body.text:
+        raise HTTPException(status_code=400, detail="Missing text")
+    parsed = _inline(body.text)
+    result = _extract_text(parsed.text)
+    result.truncation = parsed.truncation
+    _index(body.document_id, result, parsed.text)
+    return _extraction_response(result, text_mode, fields)
+
+
+@app.post("/extract/upload", response_model=ExtractionResult)
+async def extract_upload(
+    file: UploadFile = File(...),
+    document_id: Optional[str] = Form(None),
+    text_mode: str = TextMode,
+    fields: Optional[str] = Fields,
+):
+    parsed = await _read_upload(file)
+    result = _extract_text(parsed.text)
+    result.truncation = parsed.truncation
+    _index(document_id, result, parsed.text)
+    return _extraction_response(result, text_mode, fields, parsed.offsets or None)
+
+
+@app.post("/analyze", response_model=AnalysisResult)
+async def analyze_json(body: AnalyzeBody, fields: Optional[str] = Fields):
+    if not body.text:
+        raise HTTPException(status_code=400, detail="Missing text")
+    policies = body.policies if body.policies is not None else default_policies()
+    parsed = _inline(body.text)
+    result = _analyze_text(parsed.text, policies)
+    result.truncation = parsed.truncation
+    _index(body.document_id, result, parsed.text)
+    return _json_response(result, fields)
+
+
+@app.post("/analyze/upload", response_model=AnalysisResult)
+async def analyze_upload(
+    file: UploadFile = File(...),
+    document_id: Optional[str] = Form(None),
+    fields: Optional[str] = Fields,
+):
+    parsed = await _read_upload(file)
+    # Default policies from resources
+    result = _analyze_text(parsed.text, default_policies())
+    result.truncation = parsed.truncation
+    _index(document_id, result, parsed.text)
+    return _json_response(result, fields)
+
+
+@app.post("/analyze/revision", response_model=RevisionAnalysisResult)
+async def analyze_revision_json(body: RevisionBody, fields: Optional[str] = Fields):
+    from contract_ai.incremental import analyze_revision
+
+    if not body.text:
+        raise HTTPException(status_code=400, detail="Missing text")
+    policies = body.policies if body.policies is not None else default_policies()
+    parsed = _inline(body.text)
+    result = analyze_revision(parsed.text, policies, document_id=body.document_id, reuse_similar=body.reuse_similar)
+    result.truncation = parsed.truncation
+    return _json_response(result, fields)
+
+
+@app.post("/analyze/revision/upload", response_model=RevisionAnalysisResult)
+async def analyze_revision_upload(
+    file: UploadFile = File(...),
+    document_id: Optional[str] = Form(None),
+    reuse_similar: bool = Form(False),
+    fields: Optional[str] = Fields,
+):
+    from contract_ai.incremental import analyze_revision
+
+    parsed = await _read_upload(file)
+    result = analyze_revision(parsed.text, default_policies(), document_id=document_id, reuse_similar=reuse_similar)
+    result.truncation = parsed.truncation
+    return _json_response(result, fields)
+
+
+@app.post("/clauses", response_model=List[ClauseMatch])
+async def clauses_json(body: ExtractBody) -> List[ClauseMatch]:
+    if not body.text:
+        raise HTTPException(status_code=400, detail="Missing text")
+    return classify_clauses(_inline(body.text).text)
+
+
+@app.post("/clauses/upload", response_model=List[ClauseMatch])
+async def clauses_upload(file: UploadFile = File(...)) -> List[ClauseMatch]:
+    parsed = await _read_upload(file)
+    return classify_clauses(parsed.text)
+
+
+@app.post("/search", response_model=List[SearchHit])
+async def search(body: SearchBody) -> List[SearchHit]:
+    from contract_ai.search import get_search_index
+
+    index = get_search_index()
+    if index is None:
+        return []
+    return index.search(
+        text=body.text,
+        party=body.party,
+        expires_after=body.expires_after,
+        expires_before=body.expires_before,
+        risk_id=body.risk_id,
+        policy_id=body.policy_id,
+        limit=body.limit,
+    )
+
+
+def _similar(txt: str, top_k: int, threshold: float) -> List[SimilarContract]:
+    from contract_ai.similarity import get_default_index
+
+    index = get_default_index()
+    return index.query(txt, top_k=top_k, threshold=threshold) if index is not None else []
+
+
+@app.post("/similar", response_model=List[SimilarContract])
+async def similar_json(body: SimilarBody) -> List[SimilarContract]:
+    if not body.text:
+        raise HTTPException(status_code=400, detail="Missing text")
+    return _similar(_inline(body.text).text, body.top_k, body.threshold)
+
+
+@app.post("/similar/upload", response_model=List[SimilarContract])
+async def similar_upload(
+    file: UploadFile = File(...),
+    top_k: int = Form(5),
+    threshold: float = Form(0.5),
+) -> List[SimilarContract]:
+    parsed = await _read_upload(file)
+    return _similar(parsed.text, top_k, threshold)
+
+
+@app.post("/diff", response_model=ContractDiff)
+async def diff_json(body: DiffBody, fields: Optional[str] = Fields):
+    from contract_ai.diff import diff_documents
+
+    if body.old_text is None or body.new_text is None:
+        raise HTTPException(status_code=400, detail="Missing old_text or new_text")
+    old, new = _inline(body.old_text), _inline(body.new_text)
+    result = diff_documents(old.text, new.text, body.policies, use_llm=body.use_llm)
+    result.old_truncation, result.new_truncation = old.truncation, new.truncation
+    return _json_response(result, fields)
+
+
+@app.post("/diff/upload", response_model=ContractDiff)
+async def diff_upload(
+    old_file: UploadFile = File(...),
+    new_file: UploadFile = File(...),
+    use_llm: bool = Form(True),
+    # JSON list of policies, same shape as DiffBody.policies
+    policies: Optional[str] = Form(None),
+    fields: Optional[str] = Fields,
+):
+    from contract_ai.diff import diff_documents
+
+    policy_list = None
+    if policies:
         try:
-            # Try YAML via compliance loader
-            from contract_ai import compliance as comp_mod  # type: ignore
+            policy_list = json.loads(policies)
+        except ValueError:
+            policy_list = None
+        if not isinstance(policy_list, list) or not all(isinstance(p, dict) for p in policy_list):
+            raise HTTPException(status_code=400, detail="policies must be a JSON list of policy objects")
+    old = await _read_upload(old_file)
+    new = await _read_upload(new_file)
+    result = diff_documents(old.text, new.text, policy_list, use_llm=use_llm)
+    result.old_truncation, result.new_truncation = old.truncation, new.truncation
+    return _json_response(result, fields)
 
-            if getattr(comp_mod, "yaml", None) is not None:
-                clause_library = comp_mod.yaml.safe_load(clauses_path.read_text(encoding="utf-8"))
-        except Exception:
-            clause_library = None
-        if clause_library is None:
-            try:
-                clause_library = json.loads(clauses_path.read_text(encoding="utf-8"))
-            except Exception:
-                clause_library = None
-    if clause_library is None:
-        clause_library = {
-            "confidentiality": "Each party shall keep confidential any proprietary information...",
-            "governing_law": "This Agreement shall be governed by the laws of [Jurisdiction].",
-            "limitation_of_liability": "In no event shall either party be liable for indirect, incidental, special, or consequential damages...",
-        }
+
+@app.post("/draft", response_model=DraftResult)
+async def draft(request: DraftRequest) -> DraftResult:
+    clause_library = load_clause_library()
 
     requested = request.clauses or []
     selected = select_clauses(clause_library, requested)
@@ -234,5 +566,5 @@ async def draft(request: DraftRequest) -> DraftResult:
     # Simple template mapping by contract_type
     template_map = {"base": "base_contract.jinja"}
     template_name = template_map.get(request.contract_type, "base_contract.jinja")
-    content = render_contract(template_name, variables, resources / "templates")
+    content = render_contract(template_name, variables, TEMPLATES_DIR)
     return DraftResult(content=content, used_clauses=list(selected.keys()))
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Pre-fork server for running the FastAPI app on several cores.
+
+The master process loads the app and runs the warm-up (dateparser locales,
+compiled rules, policies, templates) once, freezes the GC so those objects
+stay in shared copy-on-write pages, binds the socket and then forks N uvicorn
+workers that accept on it. Dead workers are respawned until SIGTERM/SIGINT.
+
+Usage: python -m app.serve --host 0.0.0.0 --port 80 --workers 4
+(--workers defaults to $WEB_CONCURRENCY, or 1 which serves in-process).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import sys
+import time
+
+import uvicorn
+
+
+logger = logging.getLogger("contract_ai.serve")
+
+
+def _default_workers() -> int:
+    try:
+        return max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    except ValueError:
+        return 1
+
+
+def _run_worker(config: uvicorn.Config, sock) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    finally:
+        os._exit(0)
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(prog="app.serve", description="Serve the Contract AI app with pre-forked workers")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=80)
+    p.add_argument("--workers", type=int, default=_default_workers())
+    args = p.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    from contract_ai import warmup
+    from app.main import app
+
+    if warmup.enabled():
+        logger.info("warm-up: %s", warmup.warm_up())
+
+    config = uvicorn.Config(app, host=args.host, port=args.port)
+    if args.workers <= 1:
+        uvicorn.Server(config).run()
+        return
+
+    sock = config.bind_socket()
+    # Keep preloaded objects out of GC generations so collections in the
+    # workers don't touch (and un-share) their pages.
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, int] = {}
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(config, sock)
+        children[pid] = slot
+        logger.info("started worker %d (pid %d)", slot, pid)
+
+    def stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for slot in range(args.workers):
+        spawn(slot)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        logger.warning("worker %d (pid %d) exited with status %d; restarting", slot, pid, status)
+        time.sleep(1)
+        spawn(slot)
+    sock.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from .parser import PARSER_VERSION, ParsedText, load_document
+
+
+_DEFAULT_MAX_MB = 256
+_DEFAULT_LLM_MAX_ENTRIES = 5000
+_CHUNK = 1 << 20
+
+
+def env_truthy(name: str, default: bool = False) -> bool:
+    val = os.getenv(name)
+    if val is None or not val.strip():
+        return default
+    return val.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def default_cache_dir() -> Path:
+    env_dir = os.getenv("CONTRACT_AI_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir).expanduser()
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "contract_ai"
+
+
+def file_key(path: str | Path) -> str:
+    """SHA-256 over parser version, file suffix and raw bytes (streamed)."""
+    p = Path(path)
+    h = hashlib.sha256()
+    h.update(f"{PARSER_VERSION}:{p.suffix.lower()}:".encode("utf-8"))
+    with p.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParsedTextCache:
+    """
+    Disk cache of parsed document text, zlib-compressed, one file per content hash.
+    Entries are evicted least-recently-used (by mtime, refreshed on hit) once the
+    directory exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_bytes: int | None = None):
+        self.directory = Path(directory) if directory else default_cache_dir() / "parsed"
+        if max_bytes is None:
+            try:
+                max_bytes = int(float(os.getenv("CONTRACT_AI_PARSE_CACHE_MAX_MB", _DEFAULT_MAX_MB)) * 1024 * 1024)
+            except ValueError:
+                max_bytes = _DEFAULT_MAX_MB * 1024 * 1024
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json.z"
+
+    def get(self, key: str) -> Optional[ParsedText]:
+        p = self._path(key)
+        try:
+            data = json.loads(zlib.decompress(p.read_bytes()).decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt entry: drop it and treat as a miss
+            try:
+                p.unlink()
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        truncation = data.get("truncation")
+        if truncation:
+            from .types import Truncation
+
+            truncation = Truncation.model_validate(truncation)
+        return ParsedText(
+            text=data.get("text", ""),
+            offsets=list(data.get("offsets") or []),
+            truncation=truncation or None,
+        )
+
+    def put(self, key: str, parsed: ParsedText) -> None:
+        payload = json.dumps(
+            {
+                "text": parsed.text,
+                "offsets": parsed.offsets,
+                "truncation": parsed.truncation.model_dump() if parsed.truncation else None,
+            },
+            ensure_ascii=False,
+        )
+        blob = zlib.compress(payload.encode("utf-8"), 6)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(blob)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if not e.name.endswith(".json.z"):
+                        continue
+                    st = e.stat()
+                    entries.append((st.st_mtime, st.st_size, e.path))
+                    total += st.st_size
+        except OSError:
+            return
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+
+_default_cache: Optional[ParsedTextCache] = None
+
+
+def get_default_cache() -> Optional[ParsedTextCache]:
+    """Process-wide cache, or None when disabled via CONTRACT_AI_PARSE_CACHE=0."""
+    global _default_cache
+    if not env_truthy("CONTRACT_AI_PARSE_CACHE", default=True):
+        return None
+    if _default_cache is None:
+        _default_cache = ParsedTextCache()
+    return _default_cache
+
+
+def load_document_cached(
+    path: str | Path,
+    cache: ParsedTextCache | None = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> ParsedText:
+    """Like ``parser.load_document`` but reuses a previous parse of identical bytes (and limits)."""
+    cache = cache if cache is not None else get_default_cache()
+    if cache is None:
+        return load_document(path, max_pages, max_chars)
+    key = file_key(path)
+    if max_pages is not None or max_chars is not None:
+        key = f"{key}-p{max_pages}-c{max_chars}"
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    parsed = load_document(path, max_pages, max_chars)
+    cache.put(key, parsed)
+    return parsed
+
+
+def load_text_cached(path: str | Path, cache: ParsedTextCache | None = None) -> str:
+    return load_document_cached(path, cache).text
+
+
+# Hits refresh an entry's last_used at most this often (seconds), so the read
+# path stays read-only for hot keys instead of a write transaction per hit
+_TOUCH_INTERVAL = 300.0
+
+
+class SQLiteCache:
+    """
+    Small key/value store in a local SQLite file (WAL mode), shared by every
+    worker process on the host. Values are zlib-compressed bytes; the oldest
+    entries by last access (to within ``_TOUCH_INTERVAL``) are evicted beyond
+    ``max_entries``.
+
+    Connections are opened lazily per process, so instances created before a
+    fork are safe to use in the children.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = _DEFAULT_LLM_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn_obj: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._puts = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._conn_obj is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, last_used REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS kv_last_used ON kv(last_used)")
+            conn.commit()
+            self._conn_obj = conn
+            self._pid = os.getpid()
+        return self._conn_obj
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with self._lock:
+                conn = self._conn()
+                row = conn.execute("SELECT value, last_used FROM kv WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - row[1] > _TOUCH_INTERVAL:
+                    conn.execute("UPDATE kv SET last_used = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            return zlib.decompress(row[0])
+        except (sqlite3.Error, zlib.error, OSError):
+            return None
+
+    def put(self, key: str, value: bytes) -> None:
+        blob = zlib.compress(value, 6)
+        try:
+            with self._lock:
+                conn = self._conn()
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv (key, value, last_used) VALUES (?, ?, ?)",
+                    (key, blob, time.time()),
+                )
+                self._puts += 1
+                # Eviction scans the index, so only do it every few writes
+                if self._puts % 50 == 0:
+                    conn.execute(
+                        "DELETE FROM kv WHERE key IN (SELECT key FROM kv ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+                conn.commit()
+        except (sqlite3.Error, OSError):
+            return
+
+
+_llm_cache: Optional[SQLiteCache] = None
+
+
+def get_llm_cache() -> Optional[SQLiteCache]:
+    """Process-wide LLM response cache, or None when disabled via CONTRACT_AI_LLM_CACHE=0."""
+    global _llm_cache
+    if not env_truthy("CONTRACT_AI_LLM_CACHE", default=True):
+        return None
+    if _llm_cache is None:
+        try:
+            max_entries = int(os.getenv("CONTRACT_AI_LLM_CACHE_MAX_ENTRIES", _DEFAULT_LLM_MAX_ENTRIES))
+        except ValueError:
+            max_entries = _DEFAULT_LLM_MAX_ENTRIES
+        _llm_cache = SQLiteCache(default_cache_dir() / "llm.sqlite3", max_entries=max_entries)
+    return _llm_cache
+
+
+_segment_cache: Optional[SQLiteCache] = None
+
+
+def get_segment_cache() -> Optional[SQLiteCache]:
+    """
+    Per-segment analysis results and document revision state used by
+    contract_ai.incremental, or None when disabled via CONTRACT_AI_SEGMENT_CACHE=0.
+    """
+    global _segment_cache
+    if not env_truthy("CONTRACT_AI_SEGMENT_CACHE", default=True):
+        return None
+    if _segment_cache is None:
+        try:
+            max_entries = int(os.getenv("CONTRACT_AI_SEGMENT_CACHE_MAX_ENTRIES", 200_000))
+        except ValueError:
+            max_entries = 200_000
+        _segment_cache = SQLiteCache(default_cache_dir() / "segments.sqlite3", max_entries=max_entries)
+    return _segment_cache
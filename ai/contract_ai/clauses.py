@@ -0,0 +1,165 @@
+"""Offline classification of contract clauses against the clause library.
+
+Segments (``segment.clause_segments``) and library clauses
+(``resources/clauses.yaml``) are turned into hashed word uni/bigram TF-IDF
+vectors, and every segment is scored against every library clause with one
+batched matrix multiply. Stopwords are dropped and library vectors include
+the clause's heading hints, so headings and content words carry the score.
+The best-scoring segment per library clause decides whether that clause is
+present, deviating (on topic but worded differently) or missing.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .language import STOPWORDS
+from .segment import Segment, clause_segments
+from .types import ClauseMatch
+
+
+DIM = 1 << 12
+BATCH = 512
+# Calibrated on sample contracts: lightly edited library clauses score 0.6-0.85,
+# the same topics in independent wording 0.1-0.4, unrelated clauses up to 0.11
+PRESENT_THRESHOLD = 0.45
+DEVIATION_THRESHOLD = 0.15
+
+# Heading words that mark a segment as being about a library clause, even when
+# its wording is far from the library text (including Indonesian headings).
+HEADING_HINTS: Dict[str, Tuple[str, ...]] = {
+    "confidentiality": ("confidential", "non-disclosure", "kerahasiaan"),
+    "limitation_of_liability": ("limitation of liability", "liability", "batasan tanggung jawab"),
+    "governing_law": ("governing law", "applicable law", "jurisdiction", "hukum yang berlaku"),
+    "termination": ("termination", "pengakhiran", "pemutusan"),
+    "data_protection": ("data protection", "privacy", "personal data", "perlindungan data"),
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+_STOPWORDS = frozenset().union(*STOPWORDS.values())
+
+
+def _features(text: str) -> np.ndarray:
+    """Hashed unigram and bigram feature ids of ``text``, stopwords excluded."""
+    tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+    grams = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) % DIM for g in grams), dtype=np.int64, count=len(grams))
+
+
+def _idf(feature_lists: Sequence[np.ndarray]) -> np.ndarray:
+    df = np.zeros(DIM, dtype=np.float32)
+    for feats in feature_lists:
+        if len(feats):
+            df[np.unique(feats)] += 1
+    n = len(feature_lists)
+    return (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+
+
+def _matrix(feature_lists: Sequence[np.ndarray], idf: np.ndarray) -> np.ndarray:
+    """Row-normalized sublinear TF-IDF matrix for a batch of documents."""
+    m = np.zeros((len(feature_lists), DIM), dtype=np.float32)
+    if feature_lists:
+        rows = np.repeat(np.arange(len(feature_lists)), [len(f) for f in feature_lists])
+        cols = np.concatenate(feature_lists)
+        np.add.at(m, (rows, cols), 1.0)
+    np.log1p(m, out=m)
+    m *= idf
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    m /= norms
+    return m
+
+
+def _hints(key: str) -> Tuple[str, ...]:
+    return HEADING_HINTS.get(key) or (key.replace("_", " "),)
+
+
+def heading_on_topic(heading: Optional[str], key: str) -> bool:
+    """Whether a segment heading names library clause ``key``."""
+    heading = (heading or "").lower()
+    return bool(heading) and any(h in heading for h in _hints(key))
+
+
+def score_segments(texts: Sequence[str], library: Dict[str, str]) -> np.ndarray:
+    """Cosine similarity matrix (segments x library clauses)."""
+    keys = list(library)
+    seg_feats = [_features(t) for t in texts]
+    lib_feats = [_features(" ".join(_hints(k)) + "\n" + library[k]) for k in keys]
+    idf = _idf(seg_feats + lib_feats)
+    lib = _matrix(lib_feats, idf)
+    scores = np.zeros((len(texts), len(keys)), dtype=np.float32)
+    for start in range(0, len(texts), BATCH):
+        batch = _matrix(seg_feats[start : start + BATCH], idf)
+        scores[start : start + BATCH] = batch @ lib.T
+    return scores
+
+
+def classify(
+    text: str,
+    library: Optional[Dict[str, str]] = None,
+    segments: Optional[List[Segment]] = None,
+    lower: Optional[str] = None,
+) -> List[ClauseMatch]:
+    """
+    Report, for every library clause, whether the contract contains it
+    (``present``), covers the topic with different wording (``deviating``) or
+    lacks it (``missing``), with the best matching segment.
+    """
+    if library is None:
+        from .drafting import load_clause_library
+
+        library = load_clause_library()
+    segments = clause_segments(text) if segments is None else segments
+    keys = list(library)
+    if not keys:
+        return []
+    source = text if lower is None else lower
+    scores = score_segments([source[s.start : s.end] for s in segments], library) if segments else None
+
+    matches: List[ClauseMatch] = []
+    for j, key in enumerate(keys):
+        best_idx, best = -1, 0.0
+        topic_idx = -1
+        if scores is not None:
+            col = scores[:, j]
+            best_idx = int(col.argmax())
+            best = float(col[best_idx])
+            topic_idx = next((i for i, s in enumerate(segments) if heading_on_topic(s.heading, key)), -1)
+        if best >= PRESENT_THRESHOLD:
+            status = "present"
+        elif topic_idx != -1:
+            status = "deviating"
+            best_idx, best = topic_idx, float(scores[topic_idx, j])
+        elif best >= DEVIATION_THRESHOLD:
+            status = "deviating"
+        else:
+            status = "missing"
+        seg = segments[best_idx] if status != "missing" else None
+        matches.append(
+            ClauseMatch(
+                key=key,
+                status=status,
+                score=round(best, 4),
+                heading=seg.heading if seg else None,
+                start=seg.start if seg else None,
+                end=seg.end if seg else None,
+            )
+        )
+    return matches
+
+
+def found(matches: Optional[List[ClauseMatch]], key: str) -> Optional[bool]:
+    """
+    Whether the contract has clause ``key``; None when not classified.
+    Present clauses count, and so do deviating ones under a heading naming the
+    topic (real contracts rarely reuse the library wording); a deviating match
+    on wording alone does not.
+    """
+    for m in matches or []:
+        if m.key == key:
+            return m.status == "present" or (m.status == "deviating" and heading_on_topic(m.heading, key))
+    return None
@@ -2,24 +2,64 @@ from __future__ import annotations
 
 import argparse
 import json
-from pathlib import Path
 import os
+import sys
+from datetime import date
 
-from .parser import load_text
-from .extractor import extract
-from .risk import analyze as analyze_risk
+from .parser import ParsedText, load_document
+from .cache import load_document_cached
+
+
+def _read_input(args) -> ParsedText:
+    from .limits import cap_text, get_limits
+
+    limits = get_limits()
+    if not args.input:
+        text, truncation = cap_text(args.text or "", limits.max_chars)
+        return ParsedText(text=text, truncation=truncation)
+    if getattr(args, "no_cache", False):
+        return load_document(args.input, limits.max_pages, limits.max_chars)
+    return load_document_cached(args.input, max_pages=limits.max_pages, max_chars=limits.max_chars)
+
+
+def _emit(model, args, extra=None) -> None:
+    """Print a result model, honouring --fields and --compact; ``extra`` keys are appended."""
+    from .response import parse_fields, to_json
+
+    indent = None if args.compact else 2
+    include = parse_fields(args.fields)
+    if extra:
+        out = json.loads(to_json(model, include))
+        out.update(extra)
+        print(json.dumps(out, ensure_ascii=False, indent=indent, default=str))
+    else:
+        sys.stdout.write(to_json(model, include, indent).decode("utf-8") + "\n")
+
+
+def _llm_debug(args, lr):
+    if args.log_llm and hasattr(lr, "prompt"):
+        return {"llm_debug": {"prompt": getattr(lr, "prompt", None), "response": getattr(lr, "response_text", None)}}
+    return None
 
 
 def cmd_extract(args):
-    txt = load_text(args.input) if args.input else args.text
+    from .extractor import extract
+    from .language import detect_languages
+    from .response import shape_extraction
+    from .types import ExtractionResult
+
+    parsed = _read_input(args)
+    txt = parsed.text
+    langs = detect_languages(txt)
+    extra = None
     try:
         from .llm import GeminiClient
         # Enable file logging if requested
         if args.log_llm:
             os.environ.setdefault("LLM_LOG", "1")
         llm = GeminiClient(log=bool(args.log_llm))
-        lr = llm.extract_and_analyze(txt)
-        rules = extract(txt)
+        lr = llm.extract_and_analyze(txt, langs[0])
+        rules = extract(txt, langs=langs)
         meta = lr.metadata.model_copy(update={
             "effective_date": lr.metadata.effective_date or rules.metadata.effective_date,
             "execution_date": lr.metadata.execution_date or rules.metadata.execution_date,
@@ -28,32 +68,49 @@ def cmd_extract(args):
             "amounts": lr.metadata.amounts or rules.metadata.amounts,
             "obligations": lr.metadata.obligations or rules.metadata.obligations,
         })
-        out = {"text": txt, "metadata": meta.model_dump()}
-        if args.log_llm and hasattr(lr, "prompt"):
-            out["llm_debug"] = {"prompt": getattr(lr, "prompt", None), "response": getattr(lr, "response_text", None)}
-        print(json.dumps(out, ensure_ascii=False, indent=2, default=str))
+        result = ExtractionResult(text=txt, metadata=meta, language=langs[0])
+        extra = _llm_debug(args, lr)
     except Exception:
-        result = extract(txt)
-        print(json.dumps(result.model_dump(), ensure_ascii=False, indent=2, default=str))
+        result = extract(txt, langs=langs)
+    result.truncation = parsed.truncation
+    if args.document_id:
+        from .search import index_document
+
+        index_document(args.document_id, result, txt)
+    _emit(shape_extraction(result, args.text_mode, parsed.offsets or None), args, extra)
 
 
 def cmd_analyze(args):
     # Defer imports to avoid requiring optional deps on help command
-    from .compliance import check as check_compliance, load_policies
+    from .clauses import classify
+    from .compliance import check as check_compliance, default_policies, load_policies
+    from .extractor import extract
+    from .language import detect_languages
+    from .risk import analyze as analyze_risk
+    from .segment import lower_text
+    from .types import AnalysisResult
 
-    txt = load_text(args.input) if args.input else args.text
-    if args.policies:
-        policies = load_policies(args.policies)
-    else:
-        resources = Path(__file__).parent / "resources" / "policies.yaml"
-        policies = load_policies(str(resources)) if resources.exists() else []
+    parsed = _read_input(args)
+    txt = parsed.text
+    policies = load_policies(args.policies) if args.policies else default_policies()
+    if args.document_id:
+        from .incremental import analyze_revision
+
+        result = analyze_revision(txt, policies, document_id=args.document_id, reuse_similar=args.reuse_similar)
+        result.truncation = parsed.truncation
+        _emit(result, args)
+        return
+    lower = lower_text(txt)
+    langs = detect_languages(txt, lower)
+    clauses = classify(txt, lower=lower)
+    extra = None
     try:
         from .llm import GeminiClient
         if args.log_llm:
             os.environ.setdefault("LLM_LOG", "1")
         llm = GeminiClient(log=bool(args.log_llm))
-        lr = llm.extract_and_analyze(txt)
-        rules = extract(txt)
+        lr = llm.extract_and_analyze(txt, langs[0])
+        rules = extract(txt, langs=langs)
         merged_meta = lr.metadata.model_copy(update={
             "effective_date": rules.metadata.effective_date or lr.metadata.effective_date,
             "execution_date": rules.metadata.execution_date or lr.metadata.execution_date,
@@ -61,53 +118,113 @@ def cmd_analyze(args):
             "amounts": rules.metadata.amounts or lr.metadata.amounts,
             "obligations": rules.metadata.obligations or lr.metadata.obligations,
         })
-        rr = analyze_risk(txt, merged_meta)
+        rr = analyze_risk(txt, merged_meta, clauses, lower, langs)
         combined = {r.id: r for r in lr.risks}
         for r in rr:
             combined.setdefault(r.id, r)
-        comp = check_compliance(merged_meta, txt, policies)
-        out = {"metadata": merged_meta.model_dump(), "risks": [r.model_dump() for r in combined.values()], "compliance": [c.model_dump() for c in comp]}
-        if args.log_llm and hasattr(lr, "prompt"):
-            out["llm_debug"] = {"prompt": getattr(lr, "prompt", None), "response": getattr(lr, "response_text", None)}
-        print(json.dumps(out, ensure_ascii=False, indent=2, default=str))
+        comp = check_compliance(merged_meta, txt, policies, clauses, lower)
+        result = AnalysisResult(
+            metadata=merged_meta, risks=list(combined.values()), compliance=comp, clauses=clauses, language=langs[0]
+        )
+        extra = _llm_debug(args, lr)
     except Exception:
-        ex = extract(txt)
-        risks = analyze_risk(txt, ex.metadata)
-        comp = check_compliance(ex.metadata, txt, policies)
-        out = {"metadata": ex.metadata.model_dump(), "risks": [r.model_dump() for r in risks], "compliance": [c.model_dump() for c in comp]}
-        print(json.dumps(out, ensure_ascii=False, indent=2, default=str))
+        ex = extract(txt, langs=langs)
+        risks = analyze_risk(txt, ex.metadata, clauses, lower, langs)
+        comp = check_compliance(ex.metadata, txt, policies, clauses, lower)
+        result = AnalysisResult(metadata=ex.metadata, risks=risks, compliance=comp, clauses=clauses, language=langs[0])
+    result.truncation = parsed.truncation
+    _emit(result, args, extra)
+
+
+def _add_output_args(sp, text_mode: bool = False) -> None:
+    if text_mode:
+        sp.add_argument("--text-mode", dest="text_mode", choices=["full", "none", "hash", "offsets"], default="full",
+                        help="Echo input text (full), drop it (none), or return its hash/offsets instead")
+    sp.add_argument("--fields", type=str, help="Comma-separated dotted fields to include, e.g. metadata.parties,risks")
+    sp.add_argument("--compact", action="store_true", help="Print single-line JSON instead of indented output")
+
+
+def cmd_diff(args):
+    from .compliance import load_policies
+    from .diff import diff_documents
+    from .limits import get_limits
+
+    limits = get_limits()
+    if args.no_cache:
+        old, new = (load_document(p, limits.max_pages, limits.max_chars) for p in (args.old, args.new))
+    else:
+        old, new = (load_document_cached(p, max_pages=limits.max_pages, max_chars=limits.max_chars) for p in (args.old, args.new))
+    policies = load_policies(args.policies) if args.policies else None
+    result = diff_documents(old.text, new.text, policies, use_llm=not args.no_llm, findings=not args.no_findings)
+    result.old_truncation, result.new_truncation = old.truncation, new.truncation
+    _emit(result, args)
+
+
+def cmd_clauses(args):
+    from .clauses import classify
+
+    matches = classify(_read_input(args).text)
+    print(json.dumps([m.model_dump() for m in matches], ensure_ascii=False, indent=None if args.compact else 2))
+
+
+def cmd_search(args):
+    from .search import get_search_index
+
+    index = get_search_index()
+    hits = index.search(
+        text=args.query,
+        party=args.party,
+        expires_after=args.expires_after,
+        expires_before=args.expires_before,
+        risk_id=args.risk,
+        policy_id=args.policy,
+        limit=args.limit,
+    ) if index is not None else []
+    print(json.dumps([h.model_dump(mode="json") for h in hits], ensure_ascii=False, indent=None if args.compact else 2))
+
+
+def cmd_similar(args):
+    from .similarity import get_default_index
+
+    txt = _read_input(args).text
+    index = get_default_index()
+    matches = index.query(txt, top_k=args.top_k, threshold=args.threshold) if index is not None else []
+    print(json.dumps([m.model_dump() for m in matches], ensure_ascii=False, indent=None if args.compact else 2))
+
+
+def cmd_ingest(args):
+    from .ingest import IngestOptions, ingest, summary
+
+    options = IngestOptions(
+        mode=args.mode,
+        use_llm=not args.no_llm,
+        policies=args.policies,
+        text_mode=args.text_mode,
+        use_cache=not args.no_cache,
+        reuse_similar=args.reuse_similar,
+    )
+    progress = ingest(
+        args.root,
+        args.output,
+        manifest_path=args.manifest,
+        options=options,
+        workers=args.workers,
+        llm_rpm=args.llm_rpm,
+        retry_errors=args.retry_errors,
+    )
+    print(json.dumps(summary(progress)))
+    if progress.interrupted:
+        sys.exit(130)
 
 
 def cmd_draft(args):
     # Defer imports to avoid requiring optional deps on help command
-    from .drafting import render_contract, select_clauses
-    resources = Path(__file__).parent / "resources"
-    clauses_path = resources / "clauses.yaml"
-    clause_library = None
-    if clauses_path.exists():
-        # Try YAML first via compliance loader to leverage existing dependency
-        try:
-            from .compliance import yaml as _yaml  # type: ignore
-            if _yaml is not None:
-                clause_library = _yaml.safe_load(clauses_path.read_text(encoding="utf-8"))
-        except Exception:
-            clause_library = None
-        if clause_library is None:
-            # Try JSON as a fallback if the YAML happens to be valid JSON
-            try:
-                clause_library = json.loads(clauses_path.read_text(encoding="utf-8"))
-            except Exception:
-                clause_library = None
-    if clause_library is None:
-        # Minimal built-in fallback
-        clause_library = {
-            "confidentiality": "Each party shall keep confidential any proprietary information...",
-            "governing_law": "This Agreement shall be governed by the laws of [Jurisdiction].",
-            "limitation_of_liability": "In no event shall either party be liable for indirect, incidental, special, or consequential damages...",
-        }
+    from .drafting import TEMPLATES_DIR, load_clause_library, render_contract, select_clauses
+
+    clause_library = load_clause_library()
     selected = select_clauses(clause_library, args.clauses)
     variables = {"party_a": args.party_a, "party_b": args.party_b, "clauses": selected}
-    content = render_contract("base_contract.jinja", variables, resources / "templates")
+    content = render_contract("base_contract.jinja", variables, TEMPLATES_DIR)
     print(content)
 
 
@@ -119,6 +236,9 @@ def build_parser():
     pe.add_argument("--input", type=str, help="Path to file (pdf, docx, txt)")
     pe.add_argument("--text", type=str, help="Raw text input if no file provided")
     pe.add_argument("--log-llm", action="store_true", help="Print LLM prompt and response in output and enable file logging")
+    pe.add_argument("--no-cache", dest="no_cache", action="store_true", help="Bypass the parsed-text cache")
+    pe.add_argument("--document-id", dest="document_id", type=str, help="Also write the result to the search and similarity indexes under this id")
+    _add_output_args(pe, text_mode=True)
     pe.set_defaults(func=cmd_extract)
 
     pa = sub.add_parser("analyze", help="Analyze risks and compliance")
@@ -126,14 +246,81 @@ def build_parser():
     pa.add_argument("--text", type=str)
     pa.add_argument("--policies", type=str, help="Path to policies.yaml or .json")
     pa.add_argument("--log-llm", action="store_true", help="Print LLM prompt and response in output and enable file logging")
+    pa.add_argument("--no-cache", dest="no_cache", action="store_true", help="Bypass the parsed-text cache")
+    pa.add_argument("--document-id", dest="document_id", type=str,
+                    help="Analyze as a revision of this document, re-analyzing only changed clauses; also indexes it for search")
+    pa.add_argument("--reuse-similar", dest="reuse_similar", action="store_true",
+                    help="With --document-id: compare a first upload against its closest indexed contract")
+    _add_output_args(pa)
     pa.set_defaults(func=cmd_analyze)
 
+    pf = sub.add_parser("diff", help="Compare two contract versions clause by clause")
+    pf.add_argument("--old", required=True, help="Path to the earlier version")
+    pf.add_argument("--new", required=True, help="Path to the later version")
+    pf.add_argument("--policies", type=str, help="Path to policies.yaml or .json")
+    pf.add_argument("--no-llm", dest="no_llm", action="store_true", help="Use rules only for risk/compliance deltas")
+    pf.add_argument("--no-findings", dest="no_findings", action="store_true", help="Only diff text, skip risk/compliance deltas")
+    pf.add_argument("--no-cache", dest="no_cache", action="store_true", help="Bypass the parsed-text cache")
+    _add_output_args(pf)
+    pf.set_defaults(func=cmd_diff)
+
+    pc = sub.add_parser("clauses", help="Classify clauses as present, deviating or missing against the clause library")
+    pc.add_argument("--input", type=str)
+    pc.add_argument("--text", type=str)
+    pc.add_argument("--no-cache", dest="no_cache", action="store_true", help="Bypass the parsed-text cache")
+    pc.add_argument("--compact", action="store_true", help="Print single-line JSON instead of indented output")
+    pc.set_defaults(func=cmd_clauses)
+
+    pq = sub.add_parser("search", help="Search indexed contracts by text and metadata")
+    pq.add_argument("query", nargs="?", help="Full-text query; append * to a word for prefix search")
+    pq.add_argument("--party", type=str, help="Party name substring")
+    pq.add_argument("--expires-after", dest="expires_after", type=date.fromisoformat, help="Earliest expiration date (YYYY-MM-DD)")
+    pq.add_argument("--expires-before", dest="expires_before", type=date.fromisoformat, help="Latest expiration date (YYYY-MM-DD)")
+    pq.add_argument("--risk", type=str, help="Risk id, e.g. risk.auto_renew.hidden")
+    pq.add_argument("--policy", type=str, help="Compliance policy id with an open issue")
+    pq.add_argument("--limit", type=int, default=50)
+    pq.add_argument("--compact", action="store_true", help="Print single-line JSON instead of indented output")
+    pq.set_defaults(func=cmd_search)
+
+    ps = sub.add_parser("similar", help="Find indexed contracts similar to a document")
+    ps.add_argument("--input", type=str)
+    ps.add_argument("--text", type=str)
+    ps.add_argument("--top-k", dest="top_k", type=int, default=5)
+    ps.add_argument("--threshold", type=float, default=0.5, help="Minimum estimated Jaccard similarity (0-1)")
+    ps.add_argument("--no-cache", dest="no_cache", action="store_true", help="Bypass the parsed-text cache")
+    ps.add_argument("--compact", action="store_true", help="Print single-line JSON instead of indented output")
+    ps.set_defaults(func=cmd_similar)
+
+    pi = sub.add_parser("ingest", help="Extract or analyze every contract under a directory into JSONL (resumable)")
+    pi.add_argument("root", help="Directory to walk for pdf, docx and txt files")
+    pi.add_argument("--output", "-o", required=True, help="JSONL file results are appended to")
+    pi.add_argument("--manifest", type=str, help="Manifest of ingested content hashes (default: <output>.manifest)")
+    pi.add_argument("--mode", choices=["extract", "analyze"], default="analyze")
+    pi.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    pi.add_argument("--llm-rpm", dest="llm_rpm", type=float, default=float(os.getenv("CONTRACT_AI_LLM_RPM", "60")),
+                    help="Max Gemini requests per minute across all workers; 0 for no limit")
+    pi.add_argument("--no-llm", dest="no_llm", action="store_true", help="Use rules only")
+    pi.add_argument("--policies", type=str, help="Path to policies.yaml or .json (analyze mode)")
+    pi.add_argument("--text-mode", dest="text_mode", choices=["full", "none", "hash", "offsets"], default="hash",
+                    help="How extract-mode results carry the document text")
+    pi.add_argument("--reuse-similar", dest="reuse_similar", action="store_true",
+                    help="Analyze mode: compare each new file against its closest already-ingested contract")
+    pi.add_argument("--retry-errors", dest="retry_errors", action="store_true", help="Reprocess files that failed previously")
+    pi.add_argument("--no-cache", dest="no_cache", action="store_true", help="Bypass the parsed-text cache")
+    pi.set_defaults(func=cmd_ingest)
+
     pd = sub.add_parser("draft", help="Draft a contract from clauses and template")
     pd.add_argument("--party-a", dest="party_a", required=True)
     pd.add_argument("--party-b", dest="party_b", required=True)
     pd.add_argument("--clauses", nargs="*", help="List of clause keys to include")
     pd.set_defaults(func=cmd_draft)
 
+    for sp in sub.choices.values():
+        sp.add_argument("--profile", metavar="PATH",
+                        help="Profile this run: cProfile stats to PATH, or a speedscope sampling profile if PATH ends in .json")
+        sp.add_argument("--trace-memory", dest="trace_memory", action="store_true",
+                        help="Report the run's peak traced Python memory (tracemalloc) on stderr")
+
     return p
 
 
@@ -146,7 +333,30 @@ def main(argv=None):
         pass
     parser = build_parser()
     args = parser.parse_args(argv)
-    args.func(args)
+    if args.trace_memory:
+        from .limits import track_peak
+
+        with track_peak() as peak:
+            _run(args)
+        print(f"[memory] peak {peak.peak_bytes / (1024 * 1024):.1f} MB traced", file=sys.stderr)
+    else:
+        _run(args)
+
+
+def _run(args) -> None:
+    if not args.profile:
+        args.func(args)
+        return
+    from .profiling import profiled
+
+    with profiled(args.profile, name=f"contract-ai {args.cmd}") as prof:
+        try:
+            args.func(args)
+        finally:
+            sys.stdout.flush()
+    print(f"[profile] {prof.format} profile of {prof.elapsed:.3f}s written to {prof.path}", file=sys.stderr)
+    if prof.stats is not None:
+        print(prof.summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-import yaml
+from .segment import lower_text
+from .types import ClauseMatch, ComplianceIssue, Metadata
 
-from .types import ComplianceIssue, Metadata
+
+DEFAULT_POLICIES_PATH = Path(__file__).parent / "resources" / "policies.yaml"
 
 
 def load_policies(path: str | Path) -> List[Dict[str, Any]]:
@@ -14,14 +17,36 @@ def load_policies(path: str | Path) -> List[Dict[str, Any]]:
     if not p.exists():
         return []
     if p.suffix.lower() in (".yaml", ".yml"):
+        import yaml
+
         return yaml.safe_load(p.read_text(encoding="utf-8")) or []
     else:
         return json.loads(p.read_text(encoding="utf-8"))
 
 
-def check(metadata: Metadata, text: str, policies: List[Dict[str, Any]]) -> List[ComplianceIssue]:
+@lru_cache(maxsize=1)
+def default_policies() -> List[Dict[str, Any]]:
+    """Bundled policies, loaded once per process. Treat the result as read-only."""
+    return load_policies(DEFAULT_POLICIES_PATH)
+
+
+def check(
+    metadata: Metadata,
+    text: str,
+    policies: List[Dict[str, Any]],
+    clauses: Optional[List[ClauseMatch]] = None,
+    lower: Optional[str] = None,
+) -> List[ComplianceIssue]:
+    """
+    Evaluate ``policies``. A ``clause_key`` requirement is satisfied when the
+    clause classifier (``clauses``) found that library clause (see
+    ``clauses.found``) or when the key's words appear in the text.
+    ``lower`` is the document's shared lowercased view, if already computed.
+    """
+    from .clauses import found
+
     issues: List[ComplianceIssue] = []
-    lower = text.lower()
+    lower = lower_text(text) if lower is None else lower
     for policy in policies:
         pid = policy.get("id", "policy.unknown")
         severity = policy.get("severity", "medium")
@@ -29,12 +54,18 @@ def check(metadata: Metadata, text: str, policies: List[Dict[str, Any]]) -> List
         requirement = policy.get("requirement", "")
         clause_required = policy.get("clause_contains")
         field_required = policy.get("field_required")
+        clause_key = policy.get("clause_key")
 
         satisfied = True
         finding = []
         if clause_required and clause_required.lower() not in lower:
             satisfied = False
             finding.append(f"Missing clause containing: '{clause_required}'")
+        if clause_key:
+            present = found(clauses, clause_key) or clause_key.replace("_", " ").lower() in lower
+            if not present:
+                satisfied = False
+                finding.append(f"Missing clause: {clause_key}")
         if field_required:
             val = getattr(metadata, field_required, None)
             if not val:
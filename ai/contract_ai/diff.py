@@ -0,0 +1,186 @@
+"""Clause-aligned comparison of two contract versions.
+
+Documents are split into clause segments and aligned in three passes, all
+hash/dict based so alignment is near-linear in the number of clauses:
+
+1. identical segment hashes are paired; pairs that keep their relative order
+   (longest increasing subsequence) are unchanged, the rest are ``moved``;
+2. leftover segments with the same heading (numbering ignored) are ``modified``
+   and get a word-level diff of just that clause;
+3. anything else is ``added`` or ``removed``.
+
+Risk and compliance deltas come from analyzing both versions through
+``incremental.analyze_revision``, which reuses per-clause cached results.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+from .segment import Segment, clause_segments
+from .types import AnalysisResult, ClauseDiff, ContractDiff, TextChange
+
+
+# Word-level diffs of clauses longer than this fall back to line granularity
+MAX_WORD_TOKENS = 4000
+
+_WORD_RE = re.compile(r"\S+\s*")
+
+
+def _increasing_subsequence(values: List[int]) -> set:
+    """Indexes into ``values`` forming a longest strictly increasing subsequence (O(n log n))."""
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev: List[int] = [-1] * len(values)
+    for i, v in enumerate(values):
+        pos = bisect_left(tails, v)
+        if pos == len(tails):
+            tails.append(v)
+            tail_idx.append(i)
+        else:
+            tails[pos] = v
+            tail_idx[pos] = i
+        prev[i] = tail_idx[pos - 1] if pos > 0 else -1
+    keep = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+def text_changes(old: str, new: str) -> List[TextChange]:
+    """Word-level edit operations between two clause texts (line-level for very long clauses)."""
+    a = _WORD_RE.findall(old)
+    b = _WORD_RE.findall(new)
+    if max(len(a), len(b)) > MAX_WORD_TOKENS:
+        a = old.splitlines(keepends=True)
+        b = new.splitlines(keepends=True)
+    changes: List[TextChange] = []
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if op == "equal":
+            continue
+        changes.append(
+            TextChange(
+                op=op,
+                old="".join(a[i1:i2]).strip() or None,
+                new="".join(b[j1:j2]).strip() or None,
+            )
+        )
+    return changes
+
+
+def align_segments(old: List[Segment], new: List[Segment]) -> Tuple[List[Tuple[int, int, str]], List[int], List[int]]:
+    """
+    Pair old and new segments. Returns ``(pairs, removed, added)`` where pairs are
+    ``(old_index, new_index, status)`` with status unchanged/moved/modified.
+    """
+    by_hash: Dict[str, List[int]] = {}
+    for i, seg in enumerate(old):
+        by_hash.setdefault(seg.sha256, []).append(i)
+    for idxs in by_hash.values():
+        idxs.reverse()
+
+    exact: List[Tuple[int, int]] = []
+    unmatched_new: List[int] = []
+    for j, seg in enumerate(new):
+        idxs = by_hash.get(seg.sha256)
+        if idxs:
+            exact.append((idxs.pop(), j))
+        else:
+            unmatched_new.append(j)
+    in_order = _increasing_subsequence([i for i, _ in exact])
+    pairs: List[Tuple[int, int, str]] = [
+        (i, j, "unchanged" if k in in_order else "moved") for k, (i, j) in enumerate(exact)
+    ]
+
+    matched_old = {i for i, _ in exact}
+    by_key: Dict[str, List[int]] = {}
+    for i, seg in enumerate(old):
+        if i not in matched_old and seg.key:
+            by_key.setdefault(seg.key, []).append(i)
+    for idxs in by_key.values():
+        idxs.reverse()
+    added: List[int] = []
+    for j in unmatched_new:
+        idxs = by_key.get(new[j].key) if new[j].key else None
+        if idxs:
+            i = idxs.pop()
+            matched_old.add(i)
+            pairs.append((i, j, "modified"))
+        else:
+            added.append(j)
+    removed = [i for i in range(len(old)) if i not in matched_old]
+    pairs.sort(key=lambda p: p[1])
+    return pairs, removed, added
+
+
+def _risk_deltas(before: AnalysisResult, after: AnalysisResult, out: ContractDiff) -> None:
+    old_risks = {r.id: r for r in before.risks}
+    new_risks = {r.id: r for r in after.risks}
+    out.risks_added = [r for rid, r in new_risks.items() if rid not in old_risks]
+    out.risks_removed = [r for rid, r in old_risks.items() if rid not in new_risks]
+    out.risks_changed = [
+        r
+        for rid, r in new_risks.items()
+        if rid in old_risks and (r.severity, r.clause_snippet) != (old_risks[rid].severity, old_risks[rid].clause_snippet)
+    ]
+    old_issues = {c.policy_id: c for c in before.compliance}
+    new_issues = {c.policy_id: c for c in after.compliance}
+    out.compliance_added = [c for pid, c in new_issues.items() if pid not in old_issues]
+    out.compliance_resolved = [c for pid, c in old_issues.items() if pid not in new_issues]
+
+
+def diff_documents(
+    old_text: str,
+    new_text: str,
+    policies: Optional[List[Dict[str, Any]]] = None,
+    use_llm: bool = True,
+    findings: bool = True,
+) -> ContractDiff:
+    """Compare two versions clause by clause, with risk/compliance deltas unless ``findings`` is False."""
+    old_segs = clause_segments(old_text)
+    new_segs = clause_segments(new_text)
+    pairs, removed, added = align_segments(old_segs, new_segs)
+
+    out = ContractDiff()
+    for i, j, status in pairs:
+        if status == "unchanged":
+            out.unchanged += 1
+            continue
+        o, n = old_segs[i], new_segs[j]
+        clause = ClauseDiff(
+            status=status,
+            old_heading=o.heading,
+            new_heading=n.heading,
+            old_start=o.start,
+            new_start=n.start,
+        )
+        if status == "modified":
+            clause.changes = text_changes(old_text[o.start : o.end], new_text[n.start : n.end])
+        out.clauses.append(clause)
+    for j in added:
+        n = new_segs[j]
+        out.clauses.append(
+            ClauseDiff(status="added", new_heading=n.heading, new_start=n.start,
+                       changes=[TextChange(op="insert", new=new_text[n.start : n.end])])
+        )
+    for i in removed:
+        o = old_segs[i]
+        out.clauses.append(
+            ClauseDiff(status="removed", old_heading=o.heading, old_start=o.start,
+                       changes=[TextChange(op="delete", old=old_text[o.start : o.end])])
+        )
+
+    if findings:
+        from .compliance import default_policies
+        from .incremental import analyze_revision
+
+        policies = default_policies() if policies is None else policies
+        before = analyze_revision(old_text, policies, use_llm=use_llm)
+        after = analyze_revision(new_text, policies, use_llm=use_llm)
+        _risk_deltas(before, after, out)
+    return out
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+RESOURCES_DIR = Path(__file__).parent / "resources"
+TEMPLATES_DIR = RESOURCES_DIR / "templates"
+
+FALLBACK_CLAUSES = {
+    "confidentiality": "Each party shall keep confidential any proprietary information...",
+    "governing_law": "This Agreement shall be governed by the laws of [Jurisdiction].",
+    "limitation_of_liability": "In no event shall either party be liable for indirect, incidental, special, or consequential damages...",
+}
+
+
+@lru_cache(maxsize=None)
+def _env(templates_dir: Path):
+    # One Environment per directory so compiled templates are reused across renders
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-def _env(templates_dir: Path) -> Environment:
     return Environment(
         loader=FileSystemLoader(str(templates_dir)),
         autoescape=select_autoescape(enabled_extensions=(".html", ".jinja")),
@@ -15,12 +29,36 @@ def _env(templates_dir: Path) -> Environment:
     )
 
 
+def get_template(template_name: str, templates_dir: str | Path = TEMPLATES_DIR):
+    return _env(Path(templates_dir)).get_template(template_name)
+
+
 def render_contract(template_name: str, variables: Dict[str, Any], templates_dir: str | Path) -> str:
-    env = _env(Path(templates_dir))
-    tpl = env.get_template(template_name)
+    tpl = get_template(template_name, templates_dir)
     return tpl.render(**variables)
 
 
+@lru_cache(maxsize=1)
+def load_clause_library() -> Dict[str, str]:
+    """Bundled clause library (YAML, or JSON as a fallback), loaded once per process."""
+    clauses_path = RESOURCES_DIR / "clauses.yaml"
+    if not clauses_path.exists():
+        return dict(FALLBACK_CLAUSES)
+    raw = clauses_path.read_text(encoding="utf-8")
+    try:
+        import yaml
+
+        library = yaml.safe_load(raw)
+    except Exception:
+        library = None
+    if library is None:
+        try:
+            library = json.loads(raw)
+        except Exception:
+            library = None
+    return library or dict(FALLBACK_CLAUSES)
+
+
 def select_clauses(clause_library: Dict[str, str], requested: List[str] | None) -> Dict[str, str]:
     if not requested:
         return clause_library
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import os
 import re
-from typing import List, Tuple
-
-import dateparser
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
 
+from .language import DEFAULT_LANGUAGE, detect_languages
+from .segment import sentence_spans, strip_numbering
 from .types import Metadata, ExtractedParty, Obligation, ExtractionResult
 
 
@@ -13,10 +16,81 @@ DATE_PATTERNS = [
     r"\b\d{4}-\d{2}-\d{2}\b",  # 2025-09-26
     r"\b\d{1,2}/\d{1,2}/\d{2,4}\b",  # 1/5/2025
 ]
-
-
-def parse_date(text: str):
-    dt = dateparser.parse(text)
+_DATE_RE = re.compile("|".join(DATE_PATTERNS))
+
+# Per-language rule tables, keyed by language.detect_languages codes. Labels are
+# tried in order (main language first); the first one followed by a parseable
+# date wins.
+DATE_LABELS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "en": {
+        "effective": ("effective date", "effective as of"),
+        "execution": ("date of execution", "executed on"),
+        "expiration": ("expires on", "expiration"),
+    },
+    "id": {
+        "effective": ("berlaku sejak",),
+        "execution": ("ditandatangani pada",),
+        "expiration": ("berakhir pada",),
+    },
+}
+OBLIGATION_WORDS: Dict[str, Tuple[str, ...]] = {
+    "en": ("shall", "must"),
+    "id": ("wajib",),
+}
+# Indonesian contracts routinely quote English dates as well
+DATEPARSER_LANGUAGES: Dict[str, Tuple[str, ...]] = {
+    "en": ("en",),
+    "id": ("id", "en"),
+}
+
+MAX_OBLIGATION_CHARS = 500
+DEFAULT_MAX_OBLIGATIONS = 100
+
+
+def default_max_obligations() -> int:
+    try:
+        return int(os.getenv("CONTRACT_AI_MAX_OBLIGATIONS", DEFAULT_MAX_OBLIGATIONS))
+    except ValueError:
+        return DEFAULT_MAX_OBLIGATIONS
+
+
+def _langs(text: str, langs: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    return tuple(langs) if langs else detect_languages(text)
+
+
+def _known(table: Dict[str, object], langs: Sequence[str]) -> List[str]:
+    return [lang for lang in langs if lang in table] or [DEFAULT_LANGUAGE]
+
+
+@lru_cache(maxsize=None)
+def date_label_patterns(langs: Tuple[str, ...]) -> Dict[str, Tuple[Pattern[str], ...]]:
+    """``DATE_LABELS`` of ``langs`` compiled, each capturing the text after the label."""
+    patterns: Dict[str, List[Pattern[str]]] = {}
+    for lang in _known(DATE_LABELS, langs):
+        for field, names in DATE_LABELS[lang].items():
+            patterns.setdefault(field, []).extend(
+                re.compile(re.escape(label) + r"[:\s]+(.{0,40})", re.IGNORECASE) for label in names
+            )
+    return {field: tuple(rxs) for field, rxs in patterns.items()}
+
+
+@lru_cache(maxsize=None)
+def obligation_re(langs: Tuple[str, ...] = (DEFAULT_LANGUAGE,)) -> Pattern[str]:
+    words = [w for lang in _known(OBLIGATION_WORDS, langs) for w in OBLIGATION_WORDS[lang]]
+    return re.compile(r"\b(" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE)
+
+
+def parse_date(text: str, langs: Optional[Sequence[str]] = None):
+    """
+    Parse a date, restricted to the dateparser locales of ``langs`` when given
+    (which skips dateparser's own per-call language detection).
+    """
+    # Imported lazily: dateparser adds ~0.3s to import and loads locales on first use
+    import dateparser
+
+    codes = (code for lang in langs or () for code in DATEPARSER_LANGUAGES.get(lang, ()))
+    languages = list(dict.fromkeys(codes))
+    dt = dateparser.parse(text, languages=languages) if languages else dateparser.parse(text)
     return dt.date() if dt else None
 
 
@@ -33,36 +107,28 @@ def extract_parties(text: str) -> List[ExtractedParty]:
     return parties
 
 
-def extract_dates(text: str) -> Tuple:
-    effective = None
-    execution = None
-    expiration = None
-    for label in ["effective date", "effective as of", "berlaku sejak"]:
-        m = re.search(label + r"[:\s]+(.{0,40})", text, re.IGNORECASE)
-        if m:
-            d = parse_date(m.group(1))
-            if d:
-                effective = d
-                break
-    for label in ["date of execution", "executed on", "ditandatangani pada"]:
-        m = re.search(label + r"[:\s]+(.{0,40})", text, re.IGNORECASE)
+def _labelled_date(text: str, patterns: Tuple[Pattern[str], ...], langs: Tuple[str, ...]):
+    for rx in patterns:
+        m = rx.search(text)
         if m:
-            d = parse_date(m.group(1))
+            d = parse_date(m.group(1), langs)
             if d:
-                execution = d
-                break
-    for label in ["expires on", "expiration", "berakhir pada"]:
-        m = re.search(label + r"[:\s]+(.{0,40})", text, re.IGNORECASE)
-        if m:
-            d = parse_date(m.group(1))
-            if d:
-                expiration = d
-                break
+                return d
+    return None
+
+
+def extract_dates(text: str, langs: Optional[Sequence[str]] = None) -> Tuple:
+    """Effective, execution and expiration dates found after the labels of ``langs``."""
+    langs = _langs(text, langs)
+    patterns = date_label_patterns(langs)
+    effective = _labelled_date(text, patterns["effective"], langs)
+    execution = _labelled_date(text, patterns["execution"], langs)
+    expiration = _labelled_date(text, patterns["expiration"], langs)
     if not effective:
         for pat in DATE_PATTERNS:
             m = re.search(pat, text)
             if m:
-                d = parse_date(m.group(0))
+                d = parse_date(m.group(0), langs)
                 if d:
                     effective = d
                     break
@@ -74,19 +140,83 @@ def extract_amounts(text: str) -> List[str]:
     return list(dict.fromkeys(amounts))
 
 
-def extract_obligations(text: str) -> List[Obligation]:
+def obligation_owner(subject: str, parties: List[ExtractedParty]) -> Optional[str]:
+    """
+    Party whose name appears, as whole words, last in the text preceding the
+    modal verb. Generic role labels ("Party A") are not matched: they also
+    occur in "each party agrees" or "third party auditor".
+    """
+    best = None
+    best_pos = -1
+    for party in parties:
+        if not party.name:
+            continue
+        for m in re.finditer(r"(?<!\w)" + re.escape(party.name) + r"(?!\w)", subject, re.IGNORECASE):
+            if m.start() > best_pos:
+                best, best_pos = party.name, m.start()
+    return best
+
+
+def obligation_key(description: str) -> str:
+    """De-duplication key: the lowercased description without its list numbering."""
+    return strip_numbering(description).lower()
+
+
+def extract_obligations(
+    text: str,
+    parties: Optional[List[ExtractedParty]] = None,
+    max_obligations: Optional[int] = None,
+    langs: Optional[Sequence[str]] = None,
+) -> List[Obligation]:
+    """
+    One obligation per sentence containing a modal verb of ``langs`` (shall/
+    must, wajib), de-duplicated on normalized text without list numbering.
+    ``owner`` is the closest party named before the modal verb and
+    ``due_date`` the first date in the sentence. At most ``max_obligations``
+    are returned (CONTRACT_AI_MAX_OBLIGATIONS, default 100).
+    """
+    limit = default_max_obligations() if max_obligations is None else max_obligations
     obligations: List[Obligation] = []
-    for m in re.finditer(r"\b(shall|must|wajib)\b(.{0,200})", text, re.IGNORECASE):
-        desc = (m.group(1) + m.group(2)).strip()
-        obligations.append(Obligation(description=desc))
+    if limit <= 0:
+        return obligations
+    spans = sentence_spans(text)
+    starts = [s for s, _ in spans]
+    seen = set()
+    last_idx = -1
+    langs = _langs(text, langs)
+    for m in obligation_re(langs).finditer(text):
+        idx = bisect_right(starts, m.start()) - 1
+        if idx < 0 or idx == last_idx or m.start() >= spans[idx][1]:
+            continue
+        last_idx = idx
+        s, e = spans[idx]
+        desc = re.sub(r"\s+", " ", text[s:e])[:MAX_OBLIGATION_CHARS]
+        key = obligation_key(desc)
+        if key in seen:
+            continue
+        seen.add(key)
+        due = None
+        dm = _DATE_RE.search(text, s, e)
+        if dm:
+            due = parse_date(dm.group(0), langs)
+        owner = obligation_owner(text[s : m.start()], parties) if parties else None
+        obligations.append(Obligation(description=desc, due_date=due, owner=owner))
+        if len(obligations) >= limit:
+            break
     return obligations
 
 
-def extract(text: str) -> ExtractionResult:
+def extract(
+    text: str,
+    max_obligations: Optional[int] = None,
+    langs: Optional[Sequence[str]] = None,
+) -> ExtractionResult:
+    """Rule-based extraction with the rule sets of ``langs`` (detected when omitted)."""
+    langs = _langs(text, langs)
     parties = extract_parties(text)
-    effective, execution, expiration = extract_dates(text)
+    effective, execution, expiration = extract_dates(text, langs)
     amounts = extract_amounts(text)
-    obligations = extract_obligations(text)
+    obligations = extract_obligations(text, parties, max_obligations, langs)
 
     meta = Metadata(
         effective_date=effective,
@@ -96,4 +226,4 @@ def extract(text: str) -> ExtractionResult:
         amounts=amounts,
         obligations=obligations,
     )
-    return ExtractionResult(text=text, metadata=meta)
+    return ExtractionResult(text=text, metadata=meta, language=langs[0])
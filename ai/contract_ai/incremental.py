@@ -0,0 +1,328 @@
+"""Version-aware analysis for contracts that are re-uploaded with small edits.
+
+The text is split into clause segments (see ``segment.clause_segments``), each
+identified by a hash of its normalized text. Rule extraction, pattern risk
+scans and LLM risk analysis are cached per segment hash, so a new revision only
+pays for the segments that changed. LLM metadata is document-level, so cached
+LLM results are only reused when the text just adds clauses to an earlier
+revision (or similar base contract); any other revision is sent to the model
+whole. Risks the model reports without a locatable clause snippet are kept at
+document level rather than cached against a segment. Document-level rule
+pieces (parties, key dates, predicate risks, compliance) are cheap and always
+recomputed on the full text.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import SQLiteCache, get_segment_cache
+from .clauses import classify
+from .compliance import check as check_compliance
+from .extractor import (
+    default_max_obligations,
+    extract_amounts,
+    extract_dates,
+    extract_obligations,
+    extract_parties,
+    obligation_key,
+    obligation_owner,
+    obligation_re,
+)
+from .language import detect_languages
+from .risk import document_findings, scan_patterns
+from .search import index_document
+from .segment import Segment, clause_segments, lower_text, normalize
+from .similarity import get_default_index, signature
+from .types import (
+    Metadata,
+    Obligation,
+    RevisionAnalysisResult,
+    RevisionChanges,
+    RiskFinding,
+    SegmentChange,
+)
+
+
+# Bump when per-segment rule output changes so cached entries are ignored.
+ANALYSIS_VERSION = "5"
+
+
+def _get_json(cache: Optional[SQLiteCache], key: str):
+    if cache is None:
+        return None
+    raw = cache.get(key)
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def _put_json(cache: Optional[SQLiteCache], key: str, value: Any) -> None:
+    if cache is not None:
+        cache.put(key, json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _segment_rules(text: str, seg: Segment, cap: int, langs: Tuple[str, ...]) -> Dict[str, Any]:
+    # Party-independent so identical clauses are shared across contracts; owners are set on merge
+    chunk = text[seg.start : seg.end]
+    return {
+        "obligations": [o.model_dump(mode="json") for o in extract_obligations(chunk, None, cap, langs)],
+        "amounts": extract_amounts(chunk),
+        "risks": [r.model_dump(mode="json") for r in scan_patterns(chunk, langs=langs)],
+    }
+
+
+def _segment_llm(
+    text: str, segments: List[Segment], llm, lang: str
+) -> Tuple[Metadata, Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    One LLM call over the given segments; risks are attributed back by snippet.
+    Risks whose snippet is missing or not found in any segment are returned
+    separately as document-level risks.
+    """
+    joined = "\n\n".join(text[s.start : s.end] for s in segments)
+    lr = llm.extract_and_analyze(joined, lang)
+    per_segment: Dict[str, List[Dict[str, Any]]] = {s.sha256: [] for s in segments}
+    unattributed: List[Dict[str, Any]] = []
+    normalized = [(s.sha256, normalize(text[s.start : s.end]).lower()) for s in segments]
+    for risk in lr.risks:
+        owner = None
+        snippet = normalize(risk.clause_snippet or "").lower()
+        if snippet:
+            for sha, seg_text in normalized:
+                if snippet in seg_text:
+                    owner = sha
+                    break
+        target = per_segment[owner] if owner is not None else unattributed
+        target.append(risk.model_dump(mode="json"))
+    return lr.metadata, per_segment, unattributed
+
+
+def _changes(previous: Optional[Dict[str, Any]], segments: List[Segment]) -> RevisionChanges:
+    if not previous:
+        return RevisionChanges(
+            added=len(segments),
+            segments=[SegmentChange(status="added", heading=s.heading, sha256=s.sha256) for s in segments],
+        )
+    prev_segments: List[Dict[str, Any]] = previous.get("segments") or []
+    prev_shas: Dict[str, int] = {}
+    for p in prev_segments:
+        prev_shas[p["sha256"]] = prev_shas.get(p["sha256"], 0) + 1
+    # Previous segments not reused verbatim, indexed by heading key for modification matching
+    leftover_by_key: Dict[str, List[Dict[str, Any]]] = {}
+    new_shas = {s.sha256 for s in segments}
+    for p in prev_segments:
+        if p["sha256"] not in new_shas and p.get("key"):
+            leftover_by_key.setdefault(p["key"], []).append(p)
+
+    changes = RevisionChanges(previous_revision=previous.get("revision"))
+    matched_prev = set()
+    for s in segments:
+        if prev_shas.get(s.sha256, 0) > 0:
+            prev_shas[s.sha256] -= 1
+            changes.unchanged += 1
+            continue
+        candidates = leftover_by_key.get(s.key) if s.key else None
+        if candidates:
+            p = candidates.pop(0)
+            matched_prev.add(id(p))
+            changes.modified += 1
+            changes.segments.append(
+                SegmentChange(status="modified", heading=s.heading, sha256=s.sha256, previous_sha256=p["sha256"])
+            )
+        else:
+            changes.added += 1
+            changes.segments.append(SegmentChange(status="added", heading=s.heading, sha256=s.sha256))
+    for p in prev_segments:
+        if p["sha256"] not in new_shas and id(p) not in matched_prev:
+            changes.removed += 1
+            changes.segments.append(SegmentChange(status="removed", heading=p.get("heading"), sha256=p["sha256"]))
+    return changes
+
+
+def analyze_revision(
+    text: str,
+    policies: List[Dict[str, Any]],
+    document_id: Optional[str] = None,
+    use_llm: bool = True,
+    cache: Optional[SQLiteCache] = None,
+    llm=None,
+    reuse_similar: bool = False,
+    similarity_threshold: float = 0.8,
+) -> RevisionAnalysisResult:
+    """
+    Analyze ``text`` as a revision of ``document_id``, reusing cached per-segment
+    results and reporting which segments were added, modified or removed since
+    the previous revision. Falls back to rules only if the LLM is unavailable.
+
+    With ``reuse_similar``, a document without history is compared against its
+    closest indexed contract (e.g. the template it was filled in from): that
+    contract's LLM metadata is reused and the change report is relative to it.
+    Documents analyzed with a ``document_id`` are added to the similarity and
+    search indexes.
+    """
+    cache = cache if cache is not None else get_segment_cache()
+    segments = clause_segments(text)
+    doc_key = f"doc:{document_id}" if document_id else None
+    own_previous = _get_json(cache, doc_key) if doc_key else None
+    previous = own_previous
+
+    index = get_default_index() if (document_id or reuse_similar) else None
+    text_sig = signature(text) if index is not None else None
+    base_match = None
+    if reuse_similar and own_previous is None and index is not None:
+        for match in index.query(text, top_k=3, threshold=similarity_threshold, exclude=document_id, sig=text_sig):
+            base_state = _get_json(cache, f"doc:{match.document_id}")
+            if base_state:
+                previous, base_match = base_state, match
+                break
+
+    # Segment results depend on the rule sets (and LLM prompt), so the detected
+    # languages are part of their cache keys
+    lower = lower_text(text)
+    langs = detect_languages(text, lower)
+    lang = langs[0]
+    modal_re = obligation_re(langs)
+    parties = extract_parties(text)
+    effective, execution, expiration = extract_dates(text, langs)
+    cap = default_max_obligations()
+
+    obligations: List[Obligation] = []
+    seen_obligations = set()
+    amounts: List[str] = []
+    rule_risks: Dict[str, RiskFinding] = {}
+    reanalyzed = 0
+    for seg in segments:
+        key = f"rules:{ANALYSIS_VERSION}:{'+'.join(langs)}:{seg.sha256}"
+        record = _get_json(cache, key)
+        if record is None:
+            record = _segment_rules(text, seg, cap, langs)
+            _put_json(cache, key, record)
+            reanalyzed += 1
+        for o in record["obligations"]:
+            key = obligation_key(o["description"])
+            if len(obligations) < cap and key not in seen_obligations:
+                seen_obligations.add(key)
+                obligation = Obligation.model_validate(o)
+                m = modal_re.search(obligation.description)
+                if m and parties:
+                    obligation.owner = obligation_owner(obligation.description[: m.start()], parties)
+                obligations.append(obligation)
+        amounts.extend(record["amounts"])
+        for r in record["risks"]:
+            rule_risks.setdefault(r["id"], RiskFinding.model_validate(r))
+
+    rules_meta = Metadata(
+        effective_date=effective,
+        execution_date=execution,
+        expiration_date=expiration,
+        parties=parties,
+        amounts=list(dict.fromkeys(amounts)),
+        obligations=obligations,
+    )
+
+    llm_meta: Optional[Metadata] = None
+    llm_risks: List[RiskFinding] = []
+    doc_risks: List[Dict[str, Any]] = []
+    llm_segments = 0
+    if use_llm:
+        try:
+            if llm is None:
+                from .llm import GeminiClient
+
+                llm = GeminiClient()
+            model = getattr(llm, "model_name", "gemini")
+            per_segment = {s.sha256: _get_json(cache, f"llm:{model}:{lang}:{s.sha256}") for s in segments}
+            prev_meta = (previous or {}).get("llm_metadata")
+            prev_shas = {p["sha256"] for p in (previous or {}).get("segments") or []}
+            # Metadata and unattributed risks are document-level: they can only be
+            # carried over when no earlier clause was removed or modified, otherwise
+            # the whole document goes to the model (identical prompts hit the LLM
+            # response cache)
+            if prev_meta and prev_shas <= {s.sha256 for s in segments}:
+                missing = [s for s in segments if per_segment[s.sha256] is None]
+                doc_risks = list((previous or {}).get("llm_risks") or [])
+            else:
+                missing = list(segments)
+            if missing:
+                fresh_meta, fresh, unattributed = _segment_llm(text, missing, llm, lang)
+                llm_segments = len(missing)
+                for sha, risks in fresh.items():
+                    per_segment[sha] = risks
+                    _put_json(cache, f"llm:{model}:{lang}:{sha}", risks)
+                doc_risks = list({r["id"]: r for r in doc_risks + unattributed}.values())
+                # Partial calls only see added clauses: overlay onto the previous revision's metadata
+                base = Metadata.model_validate(prev_meta) if prev_meta and len(missing) < len(segments) else Metadata()
+                llm_meta = base.model_copy(
+                    update={k: v for k, v in fresh_meta.model_dump().items() if v not in (None, [], {})}
+                )
+            elif prev_meta:
+                llm_meta = Metadata.model_validate(prev_meta)
+            if llm_meta is not None:
+                seen = set()
+                for r in [r for s in segments for r in per_segment[s.sha256] or []] + doc_risks:
+                    if r["id"] not in seen:
+                        seen.add(r["id"])
+                        llm_risks.append(RiskFinding.model_validate(r))
+        except Exception:
+            llm_meta = None
+            llm_risks = []
+            doc_risks = []
+            llm_segments = 0
+
+    if llm_meta is not None:
+        metadata = llm_meta.model_copy(
+            update={
+                "effective_date": rules_meta.effective_date or llm_meta.effective_date,
+                "execution_date": rules_meta.execution_date or llm_meta.execution_date,
+                "expiration_date": rules_meta.expiration_date or llm_meta.expiration_date,
+                "parties": llm_meta.parties or rules_meta.parties,
+                "amounts": rules_meta.amounts or llm_meta.amounts,
+                "obligations": rules_meta.obligations or llm_meta.obligations,
+            }
+        )
+    else:
+        metadata = rules_meta
+
+    clauses = classify(text, segments=segments, lower=lower)
+    combined = {r.id: r for r in llm_risks}
+    for r in list(rule_risks.values()) + document_findings(text, metadata, lower, clauses, langs):
+        combined.setdefault(r.id, r)
+    compliance = check_compliance(metadata, text, policies, clauses, lower)
+
+    changes = _changes(previous, segments)
+    changes.reanalyzed_segments = reanalyzed
+    changes.llm_segments = llm_segments
+    if base_match is not None:
+        changes.previous_revision = None
+        changes.base_document_id = base_match.document_id
+        changes.base_similarity = base_match.similarity
+    revision = ((own_previous or {}).get("revision") or 0) + 1
+    if doc_key:
+        _put_json(
+            cache,
+            doc_key,
+            {
+                "revision": revision,
+                "segments": [{"sha256": s.sha256, "heading": s.heading, "key": s.key} for s in segments],
+                "llm_metadata": llm_meta.model_dump(mode="json") if llm_meta is not None else (own_previous or {}).get("llm_metadata"),
+                "llm_risks": doc_risks if llm_meta is not None else (own_previous or {}).get("llm_risks") or [],
+            },
+        )
+    result = RevisionAnalysisResult(
+        metadata=metadata,
+        risks=list(combined.values()),
+        compliance=compliance,
+        clauses=clauses,
+        language=lang,
+        document_id=document_id,
+        revision=revision,
+        changes=changes,
+    )
+    if document_id:
+        index_document(document_id, result, text, text_sig)
+    return result
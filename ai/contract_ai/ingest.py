@@ -0,0 +1,381 @@
+"""Bulk, resumable ingestion of a directory tree of contracts.
+
+Files are fanned out to a process pool and each result is appended to a JSONL
+file as soon as it is ready. A JSONL manifest records every finished file's
+content hash (plus path, size and mtime so unchanged files are skipped without
+re-hashing); a rerun after a crash or Ctrl-C picks up where the last one
+stopped, and files whose content was already ingested are never processed
+twice: copies get a ``duplicate`` row pointing at the file that was. Gemini
+requests from all workers share one rate limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+SUPPORTED_SUFFIXES = (".pdf", ".docx", ".txt")
+MODES = ("extract", "analyze")
+
+
+def iter_files(root: str | Path) -> Iterator[Path]:
+    """Supported contract files under ``root``, in a stable (sorted) order."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(SUPPORTED_SUFFIXES):
+                yield Path(dirpath) / name
+
+
+def file_sha256(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _open_append(path: Path):
+    """Open a JSONL file for appending, first ending a line torn by a crash."""
+    torn = False
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    fh = open(path, "a", encoding="utf-8")
+    if torn:
+        fh.write("\n")
+    return fh
+
+
+class Manifest:
+    """Append-only JSONL record of ingested files, loaded on start for resuming."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.hashes: Dict[str, str] = {}
+        # sha256 -> path of the file that was processed for that content
+        self.origins: Dict[str, str] = {}
+        # path -> (size, mtime_ns, sha256, status) of the last entry for that path
+        self.files: Dict[str, Tuple[int, int, str, str]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash
+                    self._remember(entry)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = _open_append(self.path)
+
+    def _remember(self, entry: Dict[str, Any]) -> None:
+        if entry.get("status") != "duplicate":
+            self.hashes[entry["sha256"]] = entry.get("status", "ok")
+            self.origins[entry["sha256"]] = entry["path"]
+        self.files[entry["path"]] = (entry.get("size", -1), entry.get("mtime_ns", -1), entry["sha256"], entry.get("status", "ok"))
+
+    def known(self, path: str, size: int, mtime_ns: int) -> Optional[str]:
+        """Hash recorded for ``path`` if its size and mtime are unchanged."""
+        rec = self.files.get(path)
+        if rec is not None and rec[0] == size and rec[1] == mtime_ns:
+            return rec[2]
+        return None
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        self._remember(entry)
+        self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class SharedRateLimiter:
+    """
+    Spaces calls at least ``1 / rate`` seconds apart across processes: the next
+    free slot lives in shared memory and each caller reserves one under a lock,
+    then sleeps outside it.
+    """
+
+    def __init__(self, per_minute: float, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = ctx.Value("d", 0.0, lock=False)
+        self._lock = ctx.Lock()
+
+    def __call__(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next.value)
+            self._next.value = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+@dataclass
+class IngestOptions:
+    mode: str = "analyze"
+    use_llm: bool = True
+    policies: Optional[str] = None
+    text_mode: str = "hash"
+    use_cache: bool = True
+    reuse_similar: bool = False
+
+
+_worker_options: Optional[IngestOptions] = None
+
+
+def _init_worker(options: IngestOptions, limiter: Optional[SharedRateLimiter]) -> None:
+    # Ctrl-C is handled by the parent, which stops submitting and drains the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    global _worker_options
+    _worker_options = options
+    if limiter is not None:
+        from .llm import set_rate_limiter
+
+        set_rate_limiter(limiter)
+
+
+def _extract(txt: str, use_llm: bool):
+    from .extractor import extract
+    from .types import ExtractionResult
+
+    rules = extract(txt)
+    if not use_llm:
+        return rules
+    try:
+        from .llm import GeminiClient
+
+        lr = GeminiClient().extract_and_analyze(txt, rules.language)
+    except Exception:
+        return rules
+    meta = lr.metadata.model_copy(update={
+        "effective_date": lr.metadata.effective_date or rules.metadata.effective_date,
+        "execution_date": lr.metadata.execution_date or rules.metadata.execution_date,
+        "expiration_date": lr.metadata.expiration_date or rules.metadata.expiration_date,
+        "parties": lr.metadata.parties or rules.metadata.parties,
+        "amounts": lr.metadata.amounts or rules.metadata.amounts,
+        "obligations": lr.metadata.obligations or rules.metadata.obligations,
+    })
+    return ExtractionResult(text=txt, metadata=meta, language=rules.language)
+
+
+def process_file(path: str, document_id: str) -> str:
+    """Parse and extract/analyze one file in a worker; returns the result as JSON."""
+    from .cache import load_document_cached
+    from .limits import get_limits
+    from .parser import load_document
+    from .response import shape_extraction, to_json
+
+    options = _worker_options or IngestOptions()
+    limits = get_limits()
+    if options.use_cache:
+        parsed = load_document_cached(path, max_pages=limits.max_pages, max_chars=limits.max_chars)
+    else:
+        parsed = load_document(path, limits.max_pages, limits.max_chars)
+    if options.mode == "extract":
+        result = _extract(parsed.text, options.use_llm)
+        result.truncation = parsed.truncation
+        from .search import index_document
+
+        index_document(document_id, result, parsed.text)
+        result = shape_extraction(result, options.text_mode, parsed.offsets or None)
+    else:
+        from .compliance import default_policies, load_policies
+        from .incremental import analyze_revision
+
+        policies = load_policies(options.policies) if options.policies else default_policies()
+        result = analyze_revision(
+            parsed.text, policies, document_id=document_id, use_llm=options.use_llm, reuse_similar=options.reuse_similar
+        )
+        result.truncation = parsed.truncation
+    return to_json(result).decode("utf-8")
+
+
+def _fmt_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}h{m:02d}m{s:02d}s" if h else f"{m}m{s:02d}s"
+
+
+class Progress:
+    def __init__(self, total: int, stream=sys.stderr, interval: float = 1.0):
+        self.total = total
+        self.done = 0
+        self.skipped = 0
+        # Copies of content ingested under another path (counted in skipped too)
+        self.duplicates = 0
+        self.errors = 0
+        self.interrupted = False
+        self.started = time.monotonic()
+        self._stream = stream
+        self._interval = interval
+        self._last = 0.0
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rate = self.done / elapsed
+        remaining = self.total - self.done - self.skipped
+        eta = _fmt_duration(remaining / rate) if rate > 0 else "?"
+        return (
+            f"[ingest] {self.done + self.skipped}/{self.total} files"
+            f" ({self.done} processed, {self.skipped} skipped, {self.errors} errors)"
+            f" {rate:.2f} files/s, ETA {eta}"
+        )
+
+    def report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if force or now - self._last >= self._interval:
+            self._last = now
+            end = "\n" if force or not self._stream.isatty() else ""
+            self._stream.write(("\r" if self._stream.isatty() else "") + self.line() + end)
+            self._stream.flush()
+
+
+def ingest(
+    root: str | Path,
+    output: str | Path,
+    manifest_path: Optional[str | Path] = None,
+    options: Optional[IngestOptions] = None,
+    workers: Optional[int] = None,
+    llm_rpm: float = 0,
+    retry_errors: bool = False,
+    progress_stream=sys.stderr,
+) -> Progress:
+    """
+    Ingest every supported file under ``root`` into the JSONL ``output``.
+    Each line is ``{"path", "document_id", "sha256", "status", "result"|"error"}``;
+    ``document_id`` is the path relative to ``root``. A file whose content was
+    already ingested under another path gets ``"status": "duplicate"`` and
+    ``"duplicate_of"`` (that path's document_id) instead of a result. Returns the
+    final counters.
+    """
+    options = options or IngestOptions()
+    if options.mode not in MODES:
+        raise ValueError(f"Unknown ingest mode: {options.mode} (expected one of {', '.join(MODES)})")
+    root = Path(root)
+    output = Path(output)
+    manifest = Manifest(manifest_path or output.with_name(output.name + ".manifest"))
+    files = list(iter_files(root))
+    progress = Progress(len(files), progress_stream)
+    workers = workers or os.cpu_count() or 1
+    ctx = mp.get_context("spawn") if sys.platform == "win32" else mp.get_context()
+    limiter = SharedRateLimiter(llm_rpm, ctx) if options.use_llm and llm_rpm > 0 else None
+
+    def _skip(sha: str) -> bool:
+        status = manifest.hashes.get(sha)
+        return status == "ok" or (status is not None and not retry_errors)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    pending: Dict[Any, Tuple[str, int, int, str]] = {}
+    in_flight = set()
+    with _open_append(output) as out, ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(options, limiter)
+    ) as pool:
+
+        def _finish(fut) -> None:
+            rel, size, mtime_ns, sha = pending.pop(fut)
+            entry = {"path": rel, "document_id": rel, "sha256": sha}
+            progress.done += 1
+            try:
+                body = fut.result()
+                entry["status"] = "ok"
+                # The worker already serialized the result; splice it in rather than re-encoding
+                line = json.dumps(entry, ensure_ascii=False)[:-1] + ', "result": ' + body + "}"
+            except Exception as e:
+                entry["status"] = "error"
+                entry["error"] = f"{type(e).__name__}: {e}"
+                line = json.dumps(entry, ensure_ascii=False)
+                progress.errors += 1
+            # Result first, then the manifest: a crash in between at worst repeats one file
+            out.write(line + "\n")
+            out.flush()
+            manifest.add({**{k: entry[k] for k in ("path", "sha256", "status")}, "size": size, "mtime_ns": mtime_ns, "ts": time.time()})
+            progress.report()
+
+        def _duplicate(rel: str, size: int, mtime_ns: int, sha: str, original: str) -> None:
+            entry = {"path": rel, "document_id": rel, "sha256": sha, "status": "duplicate", "duplicate_of": original}
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            out.flush()
+            manifest.add({
+                **{k: entry[k] for k in ("path", "sha256", "status", "duplicate_of")},
+                "size": size, "mtime_ns": mtime_ns, "ts": time.time(),
+            })
+            progress.skipped += 1
+            progress.duplicates += 1
+            progress.report()
+
+        def _drain(block_until: int) -> None:
+            while len(in_flight) > block_until:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    in_flight.discard(fut)
+                    _finish(fut)
+
+        try:
+            seen_run: Dict[str, str] = {}
+            for path in files:
+                rel = path.relative_to(root).as_posix()
+                st = path.stat()
+                sha = manifest.known(rel, st.st_size, st.st_mtime_ns) or file_sha256(path)
+                own = manifest.files.get(rel)
+                if own is not None and own[2] == sha and (own[3] == "duplicate" or _skip(sha)):
+                    # This file's row is already in the output
+                    progress.skipped += 1
+                    progress.report()
+                    continue
+                if sha in seen_run or _skip(sha):
+                    _duplicate(rel, st.st_size, st.st_mtime_ns, sha, seen_run.get(sha) or manifest.origins[sha])
+                    continue
+                seen_run[sha] = rel
+                fut = pool.submit(process_file, str(path), rel)
+                pending[fut] = (rel, st.st_size, st.st_mtime_ns, sha)
+                in_flight.add(fut)
+                # Bound queued work so memory stays flat and Ctrl-C stops quickly
+                _drain(workers * 2)
+            _drain(0)
+        except KeyboardInterrupt:
+            progress.interrupted = True
+            for fut in in_flight:
+                fut.cancel()
+            # Keep what already finished; cancelled files are picked up by the next run
+            for fut in list(in_flight):
+                if not fut.cancelled():
+                    try:
+                        fut.exception()
+                    except Exception:
+                        continue
+                    _finish(fut)
+    manifest.close()
+    progress.report(force=True)
+    if progress.interrupted:
+        progress_stream.write("[ingest] interrupted; rerun the same command to resume\n")
+    return progress
+
+
+def summary(progress: Progress) -> Dict[str, Any]:
+    elapsed = time.monotonic() - progress.started
+    return {
+        "total": progress.total,
+        "processed": progress.done,
+        "skipped": progress.skipped,
+        "duplicates": progress.duplicates,
+        "errors": progress.errors,
+        "elapsed_s": round(elapsed, 2),
+        "files_per_s": round(progress.done / elapsed, 2) if elapsed > 0 else None,
+    }
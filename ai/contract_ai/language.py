@@ -0,0 +1,87 @@
+"""Document language detection for routing language-specific rules.
+
+Rules, date parsing and LLM prompts are keyed by ISO 639-1 codes. Rule-based
+stages run the rule sets of every language ``detect_languages`` finds in a
+document (both, for a bilingual contract) and skip the rest; the LLM prompt
+follows the main one, ``detect_language``. Adding a language means adding its
+stopwords here and its entries in the per-language tables
+(``extractor.DATE_LABELS``/``OBLIGATION_WORDS``/``DATEPARSER_LANGUAGES``,
+``risk.RISK_RULES``/``TERMINATION_WORDS`` and ``llm.PROMPT_HINTS``).
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from .segment import lower_text
+
+
+DEFAULT_LANGUAGE = "en"
+
+# Frequent function words and contract boilerplate; the sets must not overlap
+STOPWORDS: Dict[str, frozenset] = {
+    "en": frozenset(
+        "the and of to in for is that this by with be or any as on are from such will which "
+        "shall all its other under not has have been hereby agreement party parties".split()
+    ),
+    "id": frozenset(
+        "yang dan di ke dari untuk dengan ini itu pada dalam tidak atau akan oleh adalah sebagai "
+        "para pihak perjanjian wajib sesuai tersebut bahwa atas setiap kepada telah dapat".split()
+    ),
+}
+LANGUAGES = tuple(STOPWORDS)
+
+# Detection reads the opening and closing halves of this many characters: enough
+# to be representative, and bilingual contracts often put one version after the other
+DETECT_SAMPLE_CHARS = 20_000
+# A further language is detected when it has this share of the stopword hits
+SECONDARY_SHARE = 0.2
+_MIN_SECONDARY_HITS = 3
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+@lru_cache(maxsize=1)
+def _word_languages() -> Dict[str, str]:
+    return {word: lang for lang, words in STOPWORDS.items() for word in words}
+
+
+def _scores(text: str, lower: Optional[str]) -> Dict[str, int]:
+    half = DETECT_SAMPLE_CHARS // 2
+    if len(text) <= DETECT_SAMPLE_CHARS:
+        windows = [lower_text(text) if lower is None else lower]
+    elif lower is None:
+        windows = [lower_text(text[:half]), lower_text(text[-half:])]
+    else:
+        windows = [lower[:half], lower[-half:]]
+    table = _word_languages()
+    scores = dict.fromkeys(LANGUAGES, 0)
+    for window in windows:
+        for word in _WORD_RE.findall(window):
+            lang = table.get(word)
+            if lang is not None:
+                scores[lang] += 1
+    return scores
+
+
+def detect_languages(text: str, lower: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Languages of ``text`` by stopword counts in one pass over the sample, main
+    language first; others are included when they reach ``SECONDARY_SHARE`` of
+    the hits. ``(DEFAULT_LANGUAGE,)`` when no stopword is found; ties go to the
+    language listed first in ``STOPWORDS``.
+    """
+    scores = _scores(text, lower)
+    total = sum(scores.values())
+    if not total:
+        return (DEFAULT_LANGUAGE,)
+    ranked = sorted(LANGUAGES, key=lambda lang: -scores[lang])
+    return (ranked[0],) + tuple(
+        lang for lang in ranked[1:] if scores[lang] >= max(_MIN_SECONDARY_HITS, SECONDARY_SHARE * total)
+    )
+
+
+def detect_language(text: str, lower: Optional[str] = None) -> str:
+    """Main language of ``text`` (see ``detect_languages``)."""
+    return detect_languages(text, lower)[0]
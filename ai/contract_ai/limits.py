@@ -0,0 +1,108 @@
+"""Memory budget for a single document.
+
+Configured through the environment (``0`` disables a limit):
+
+- ``CONTRACT_AI_MAX_UPLOAD_MB`` (default 25): request bodies and uploaded
+  files above this are rejected while streaming, before they are buffered;
+- ``CONTRACT_AI_MAX_PAGES`` (default 500): PDF pages read per document;
+- ``CONTRACT_AI_MAX_CHARS`` (default 2,000,000): characters of text analyzed.
+
+Documents cut by the page/character caps carry a ``truncation`` flag in
+their results. ``track_peak`` measures the peak Python heap of a block with
+tracemalloc for reporting; one block is measured at a time per process.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+from .types import Truncation
+
+
+DEFAULT_MAX_UPLOAD_MB = 25
+DEFAULT_MAX_PAGES = 500
+DEFAULT_MAX_CHARS = 2_000_000
+
+
+def _env_limit(name: str, default: float, scale: int = 1) -> Optional[int]:
+    try:
+        value = float(os.getenv(name, default))
+    except ValueError:
+        value = default
+    return int(value * scale) if value > 0 else None
+
+
+@dataclass(frozen=True)
+class Limits:
+    max_upload_bytes: Optional[int] = DEFAULT_MAX_UPLOAD_MB * 1024 * 1024
+    max_pages: Optional[int] = DEFAULT_MAX_PAGES
+    max_chars: Optional[int] = DEFAULT_MAX_CHARS
+
+
+def get_limits() -> Limits:
+    return Limits(
+        max_upload_bytes=_env_limit("CONTRACT_AI_MAX_UPLOAD_MB", DEFAULT_MAX_UPLOAD_MB, 1024 * 1024),
+        max_pages=_env_limit("CONTRACT_AI_MAX_PAGES", DEFAULT_MAX_PAGES),
+        max_chars=_env_limit("CONTRACT_AI_MAX_CHARS", DEFAULT_MAX_CHARS),
+    )
+
+
+class UploadTooLarge(ValueError):
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the {limit / (1024 * 1024):.3g} MB limit")
+        self.limit = limit
+
+
+def cap_text(text: str, max_chars: Optional[int]) -> Tuple[str, Optional[Truncation]]:
+    """``text`` cut to ``max_chars`` plus the truncation flag, for texts sent inline."""
+    if max_chars is None or len(text) <= max_chars:
+        return text, None
+    return text[:max_chars], Truncation(reason="chars", limit=max_chars)
+
+
+class PeakMemory:
+    def __init__(self) -> None:
+        self.peak_bytes = 0
+
+
+class PeakBusy(RuntimeError):
+    """Raised by ``track_peak`` when another block is already being measured."""
+
+
+# tracemalloc has a single process-wide peak counter that reset_peak() clears
+_measuring = threading.Lock()
+
+
+@contextmanager
+def track_peak() -> Iterator[PeakMemory]:
+    """
+    Peak traced Python allocations (above the starting level) inside the block.
+    Starts tracemalloc for the block unless it is already tracing; tracing
+    slows allocation-heavy code noticeably, so keep this opt-in.
+
+    Only one block is measured at a time (``PeakBusy`` otherwise), so no one
+    resets the peak mid-block. Allocations by other threads or tasks running
+    meanwhile are still counted: the value is an upper bound for the block.
+    """
+    if not _measuring.acquire(blocking=False):
+        raise PeakBusy("another block is already being measured")
+    try:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = PeakMemory()
+        try:
+            yield result
+        finally:
+            result.peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - base)
+            if started:
+                tracemalloc.stop()
+    finally:
+        _measuring.release()
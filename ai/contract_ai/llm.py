@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import os
 import json
+import hashlib
 import logging
-from typing import List
-
-try:
-    import google.generativeai as genai  # type: ignore
-except Exception:  # pragma: no cover - optional dep
-    genai = None  # fallback when not installed
+from typing import Callable, List, Optional
 
+from .cache import get_llm_cache
 from .types import Metadata, RiskFinding
 
 
+def _load_genai():
+    """Import the Gemini SDK on first client construction; None when not installed."""
+    try:
+        import google.generativeai as genai  # type: ignore
+    except Exception:  # pragma: no cover - optional dep
+        return None
+    return genai
+
+
 def _coerce_json(text: str):
     """Parse JSON from model text; tolerate code fences or extra wrapping."""
     # Fast path
@@ -52,6 +58,28 @@ def _load_dotenv_if_available():
         pass
 
 
+# Called (and may block) before every uncached model request; see set_rate_limiter
+_rate_limiter: Optional[Callable[[], None]] = None
+
+
+def set_rate_limiter(fn: Optional[Callable[[], None]]) -> None:
+    """Install a process-wide hook that throttles Gemini requests (None removes it)."""
+    global _rate_limiter
+    _rate_limiter = fn
+
+
+# Extra prompt instructions per document language (see language.detect_language)
+PROMPT_HINTS = {
+    "en": "",
+    "id": (
+        "The contract is written in Indonesian (Bahasa Indonesia). Read Indonesian dates "
+        "(e.g. '1 Januari 2025') and amounts (e.g. 'Rp 1.000.000,00'); return dates as YYYY-MM-DD, "
+        "keep party names, amounts, obligations and clause snippets verbatim in Indonesian, "
+        "and write risk titles and details in English.\n"
+    ),
+}
+
+
 class LLMNotConfigured(RuntimeError):
     pass
 
@@ -72,6 +100,7 @@ class GeminiClient:
     def __init__(self, model_name: str = "gemini-2.5-pro", log: bool | None = None):
         _load_dotenv_if_available()
         api_key = os.getenv("GEMINI_API_KEY")
+        genai = _load_genai() if api_key else None
         # Logging setup (optional)
         self._log_enabled = bool(_env_truthy("LLM_LOG") or _env_truthy("CONTRACT_AI_LLM_LOG")) if log is None else log
         self._logger = logging.getLogger("contract_ai.llm")
@@ -92,16 +121,22 @@ class GeminiClient:
             # Log fallback event if enabled
             if self._log_enabled:
                 try:
-                    reason = "missing SDK" if genai is None else "missing GEMINI_API_KEY"
+                    reason = "missing GEMINI_API_KEY" if not api_key else "missing SDK"
                     self._logger.info(json.dumps({"event": "llm_fallback", "stage": "init", "reason": reason}))
                 except Exception:
                     pass
             raise LLMNotConfigured("Gemini not configured (missing SDK or GEMINI_API_KEY)")
 
-        genai.configure(api_key=api_key)
+        endpoint = os.getenv("GEMINI_API_ENDPOINT")
+        if endpoint:
+            # e.g. http://127.0.0.1:8089 for the load-test stand-in (python -m app.fake_gemini)
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+        else:
+            genai.configure(api_key=api_key)
         # Allow model name override via environment
         env_model = os.getenv("GEMINI_MODEL")
         model_name = env_model or model_name
+        self.model_name = model_name
         # Prefer JSON responses when supported
         try:
             self.model = genai.GenerativeModel(
@@ -111,11 +146,15 @@ class GeminiClient:
         except Exception:
             self.model = genai.GenerativeModel(model_name)
 
-    def extract_and_analyze(self, text: str):
+    def extract_and_analyze(self, text: str, lang: Optional[str] = None):
         """
-        Ask the model for structured JSON with `metadata` and `risks` keys.
+        Ask the model for structured JSON with `metadata` and `risks` keys, using
+        the prompt variant for the document language `lang` (detected when omitted).
         Returns an object with `.metadata` (Metadata) and `.risks` (List[RiskFinding]).
         """
+        from .language import detect_language
+
+        lang = lang or detect_language(text)
         schema = {
             "type": "object",
             "properties": {
@@ -159,15 +198,25 @@ class GeminiClient:
             "You are a contract analyst. Extract structured metadata and list notable risks.\n"
             "Return strictly valid JSON following this schema. Do not include any prose.\n"
             "Use lowercase severity values: low, medium, high, or critical.\n"
+            f"{PROMPT_HINTS.get(lang, '')}"
             f"Schema: {json.dumps(schema)}\n"
         )
 
         try:
             full_prompt = prompt + "\n\nTEXT:\n" + text
-            response = self.model.generate_content([
-                {"role": "user", "parts": [full_prompt]}
-            ])
-            content = response.text  # type: ignore[attr-defined]
+            # Responses are shared across worker processes via the SQLite cache
+            cache = get_llm_cache()
+            cache_key = hashlib.sha256(f"{self.model_name}\n{full_prompt}".encode("utf-8")).hexdigest()
+            cached = cache.get(cache_key) if cache is not None else None
+            if cached is not None:
+                content = cached.decode("utf-8")
+            else:
+                if _rate_limiter is not None:
+                    _rate_limiter()
+                response = self.model.generate_content([
+                    {"role": "user", "parts": [full_prompt]}
+                ])
+                content = response.text  # type: ignore[attr-defined]
             # Log raw response before parsing for troubleshooting
             if getattr(self, "_log_enabled", False):
                 try:
@@ -207,6 +256,8 @@ class GeminiClient:
 
             risks_raw = data.get("risks", []) or []
             risks: List[RiskFinding] = [RiskFinding.model_validate(_map_risk(r)) for r in risks_raw]
+            if cache is not None and cached is None:
+                cache.put(cache_key, content.encode("utf-8"))
 
             class Result:
                 def __init__(self, metadata: Metadata, risks: List[RiskFinding]):
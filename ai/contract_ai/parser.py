@@ -1,13 +1,55 @@
 from __future__ import annotations
 
+import re
+import zipfile
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import ParseError, iterparse
 
+if TYPE_CHECKING:
+    from .types import Truncation
 
-def read_text_file(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="ignore")
+# Bump whenever extraction output changes so cached parses are invalidated.
+PARSER_VERSION = "4"
 
 
-def read_pdf_file(path: Path) -> str:
+@dataclass
+class ParsedText:
+    """Plain text of a document plus the start offset of each paragraph/page in it."""
+
+    text: str
+    offsets: List[int] = field(default_factory=list)
+    # Set when max_pages/max_chars stopped reading early
+    truncation: Optional[Truncation] = None
+
+
+def read_text_file(path: Path, max_chars: Optional[int] = None) -> str:
+    if max_chars is None:
+        return path.read_text(encoding="utf-8", errors="ignore")
+    with path.open("r", encoding="utf-8", errors="ignore") as fh:
+        return fh.read(max_chars + 1)
+
+
+def _truncation(reason: str, limit: int, total_pages: Optional[int] = None) -> Truncation:
+    # Imported only when a document is actually cut: .types pulls in pydantic,
+    # which the parser (and `contract-ai draft`) otherwise never needs
+    from .types import Truncation
+
+    return Truncation(reason=reason, limit=limit, total_pages=total_pages)
+
+
+def _cap_chars(parsed: ParsedText, max_chars: Optional[int]) -> ParsedText:
+    if max_chars is None or len(parsed.text) <= max_chars:
+        return parsed
+    parsed.text = parsed.text[:max_chars]
+    parsed.offsets = [o for o in parsed.offsets if o < max_chars]
+    if parsed.truncation is None:
+        parsed.truncation = _truncation("chars", max_chars)
+    return parsed
+
+
+def read_pdf_document(path: Path, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> ParsedText:
     try:
         from pypdf import PdfReader  # type: ignore
     except Exception as e:
@@ -15,38 +57,136 @@ def read_pdf_file(path: Path) -> str:
 
     reader = PdfReader(str(path))
     texts = []
-    for page in reader.pages:
+    offsets: List[int] = []
+    pos = 0
+    truncation = None
+    total_pages = len(reader.pages)
+    for i, page in enumerate(reader.pages):
+        if max_pages is not None and i >= max_pages:
+            truncation = _truncation("pages", max_pages, total_pages)
+            break
+        if max_chars is not None and pos > max_chars:
+            truncation = _truncation("chars", max_chars, total_pages)
+            break
         try:
-            texts.append(page.extract_text() or "")
+            page_text = page.extract_text() or ""
         except Exception:
             continue
-    return "\n".join(texts)
+        offsets.append(pos)
+        texts.append(page_text)
+        pos += len(page_text) + 1
+    return _cap_chars(ParsedText(text="\n".join(texts), offsets=offsets, truncation=truncation), max_chars)
 
 
-def read_docx_file(path: Path) -> str:
+def read_pdf_file(path: Path) -> str:
+    return read_pdf_document(path).text
+
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Word stores text boxes twice: as DrawingML under mc:Choice and as VML under mc:Fallback
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_DOCX_BREAKS = {_W_NS + "tab": "\t", _W_NS + "br": "\n", _W_NS + "cr": "\n", _W_NS + "noBreakHyphen": "-"}
+
+
+def _natural_key(name: str):
+    return [int(t) if t.isdigit() else t for t in re.split(r"(\d+)", name)]
+
+
+def _docx_parts(names: List[str]) -> List[str]:
+    """Text-bearing parts of a DOCX package in reading order."""
+    headers = sorted((n for n in names if re.fullmatch(r"word/header\d*\.xml", n)), key=_natural_key)
+    footers = sorted((n for n in names if re.fullmatch(r"word/footer\d*\.xml", n)), key=_natural_key)
+    body = [n for n in ("word/document.xml", "word/footnotes.xml", "word/endnotes.xml") if n in names]
+    return headers + body + footers
+
+
+def _iter_part_paragraphs(stream) -> Iterator[str]:
+    """Stream paragraphs from a WordprocessingML part.
+
+    Each element is detached from its parent as soon as it is closed, so the
+    in-memory tree never grows beyond the current nesting depth. Paragraphs of
+    a text box come before the paragraph anchoring it; mc:Fallback copies are
+    skipped.
+    """
+    stack = []
+    buffers: List[List[str]] = []
+    fallback = 0
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag == _MC_FALLBACK:
+                fallback += 1
+            elif tag == _W_NS + "p" and not fallback:
+                buffers.append([])
+            continue
+        stack.pop()
+        if tag == _MC_FALLBACK:
+            fallback -= 1
+        elif not fallback:
+            if buffers:
+                if tag == _W_NS + "t":
+                    buffers[-1].append(elem.text or "")
+                elif tag in _DOCX_BREAKS:
+                    buffers[-1].append(_DOCX_BREAKS[tag])
+            if tag == _W_NS + "p":
+                yield "".join(buffers.pop())
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def iter_docx_paragraphs(path: Path) -> Iterator[Tuple[str, str]]:
+    """Yield ``(part_name, paragraph_text)`` for headers, body (incl. tables), notes and footers."""
+    with zipfile.ZipFile(path) as zf:
+        for part in _docx_parts(zf.namelist()):
+            with zf.open(part) as stream:
+                for para in _iter_part_paragraphs(stream):
+                    yield part, para
+
+
+def read_docx_document(path: Path, max_chars: Optional[int] = None) -> ParsedText:
     try:
-        import docx  # python-docx
-    except Exception as e:
-        raise RuntimeError("python-docx is required to read DOCX files") from e
+        paragraphs = iter_docx_paragraphs(path)
+        chunks: List[str] = []
+        offsets: List[int] = []
+        pos = 0
+        for _, para in paragraphs:
+            if max_chars is not None and pos > max_chars:
+                break
+            offsets.append(pos)
+            chunks.append(para)
+            pos += len(para) + 1
+    except (zipfile.BadZipFile, KeyError, ParseError) as e:
+        raise ValueError(f"Invalid DOCX file: {path}") from e
+    return _cap_chars(ParsedText(text="\n".join(chunks), offsets=offsets), max_chars)
 
-    document = docx.Document(str(path))
-    lines = [p.text for p in document.paragraphs]
-    return "\n".join(lines)
 
+def read_docx_file(path: Path) -> str:
+    return read_docx_document(path).text
 
-def load_text(path: str | Path) -> str:
+
+def load_document(path: str | Path, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> ParsedText:
+    """
+    Parse ``path``. With ``max_pages``/``max_chars`` reading stops at the
+    budget and the result's ``truncation`` says why.
+    """
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(p)
     suffix = p.suffix.lower()
     if suffix in (".txt", ".md", ".rtf"):
-        return read_text_file(p)
+        return _cap_chars(ParsedText(text=read_text_file(p, max_chars)), max_chars)
     if suffix in (".pdf",):
-        return read_pdf_file(p)
+        return read_pdf_document(p, max_pages, max_chars)
     if suffix in (".docx",):
-        return read_docx_file(p)
+        return read_docx_document(p, max_chars)
     # fallback attempt: try text
     try:
-        return read_text_file(p)
+        return _cap_chars(ParsedText(text=read_text_file(p, max_chars)), max_chars)
     except Exception:
         raise ValueError(f"Unsupported file type: {suffix}")
+
+
+def load_text(path: str | Path) -> str:
+    return load_document(path).text
@@ -0,0 +1,175 @@
+"""On-demand profiling of a single CLI run or API request.
+
+Two output formats:
+
+- ``pstats``: deterministic cProfile data, readable with ``python -m pstats``
+  or snakeviz;
+- ``speedscope``: stacks sampled every millisecond from the profiled thread,
+  written as speedscope JSON (https://www.speedscope.app).
+
+Nothing here is imported or installed unless profiling is requested, so the
+normal paths carry no overhead.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+FORMATS = ("pstats", "speedscope")
+SAMPLE_INTERVAL = 0.001
+
+# cProfile/sys.setprofile allow one active profiler per thread, and sampling
+# several requests at once would mix their stacks: profile one at a time.
+_active = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised by ``profiled`` when another profile is already running."""
+
+
+def format_for(path: str | Path) -> str:
+    """``speedscope`` for ``*.json`` outputs, ``pstats`` otherwise."""
+    return "speedscope" if str(path).lower().endswith(".json") else "pstats"
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack from a background thread."""
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.frames: List[Dict[str, object]] = []
+        self._frame_ids: Dict[Tuple[str, str, int], int] = {}
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def _frame_id(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        idx = self._frame_ids.get(key)
+        if idx is None:
+            idx = self._frame_ids[key] = len(self.frames)
+            self.frames.append({"name": code.co_qualname, "file": code.co_filename, "line": code.co_firstlineno})
+        return idx
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.append(stack)
+            self.weights.append(now - last)
+            last = now
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="contract-ai-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def to_speedscope(self, name: str) -> Dict[str, object]:
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": self.frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.elapsed,
+                    "samples": self.samples,
+                    "weights": self.weights,
+                }
+            ],
+            "name": name,
+            "exporter": "contract_ai.profiling",
+        }
+
+
+class Profile:
+    """Handle yielded by ``profiled``; ``path`` is set once the profile is written."""
+
+    def __init__(self, fmt: str):
+        self.format = fmt
+        self.path: Optional[Path] = None
+        self.elapsed = 0.0
+        self.stats: Optional[pstats.Stats] = None
+
+    def summary(self, limit: int = 15) -> str:
+        """Top functions by cumulative time (pstats profiles only)."""
+        if self.stats is None:
+            return ""
+        buf = io.StringIO()
+        self.stats.stream = buf
+        self.stats.sort_stats("cumulative").print_stats(limit)
+        return buf.getvalue()
+
+
+@contextmanager
+def profiled(path: str | Path, fmt: Optional[str] = None, name: str = "contract-ai") -> Iterator[Profile]:
+    """
+    Profile the enclosed block on the current thread and write the result to
+    ``path`` in ``fmt`` (inferred from the suffix when omitted). Raises
+    ProfilerBusy on entry if another profile is already running in this process.
+    """
+    fmt = fmt or format_for(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown profile format: {fmt} (expected one of {', '.join(FORMATS)})")
+    if not _active.acquire(blocking=False):
+        raise ProfilerBusy("Another profile is already running")
+    profile = Profile(fmt)
+    try:
+        t0 = time.perf_counter()
+        if fmt == "pstats":
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                yield profile
+            finally:
+                prof.disable()
+                profile.elapsed = time.perf_counter() - t0
+                out = Path(path)
+                out.parent.mkdir(parents=True, exist_ok=True)
+                prof.dump_stats(str(out))
+                profile.stats = pstats.Stats(prof)
+                profile.path = out
+        else:
+            sampler = SamplingProfiler()
+            sampler.start()
+            try:
+                yield profile
+            finally:
+                sampler.stop()
+                profile.elapsed = sampler.elapsed
+                out = Path(path)
+                out.parent.mkdir(parents=True, exist_ok=True)
+                out.write_text(json.dumps(sampler.to_speedscope(name)), encoding="utf-8")
+                profile.path = out
+    finally:
+        _active.release()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .types import ExtractionResult
+
+
+# full: echo input text (default); none: drop it; hash: sha256 + length;
+# offsets: sha256 + length + paragraph/page start offsets
+TEXT_MODES = ("full", "none", "hash", "offsets")
+
+_OPTIONAL_FIELDS = ("text", "text_sha256", "text_length", "offsets", "truncation", "old_truncation", "new_truncation", "language")
+
+
+def line_offsets(text: str) -> List[int]:
+    """Start offset of every line in ``text``."""
+    offsets = [0]
+    pos = text.find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = text.find("\n", pos + 1)
+    return offsets
+
+
+def shape_extraction(result: ExtractionResult, text_mode: str = "full", offsets: Optional[List[int]] = None) -> ExtractionResult:
+    if text_mode not in TEXT_MODES:
+        raise ValueError(f"Unknown text mode: {text_mode} (expected one of {', '.join(TEXT_MODES)})")
+    if text_mode == "full":
+        return result
+    txt = result.text or ""
+    update: Dict[str, Any] = {"text": None}
+    if text_mode in ("hash", "offsets"):
+        update["text_sha256"] = hashlib.sha256(txt.encode("utf-8")).hexdigest()
+        update["text_length"] = len(txt)
+    if text_mode == "offsets":
+        update["offsets"] = offsets if offsets is not None else line_offsets(txt)
+    return result.model_copy(update=update)
+
+
+def parse_fields(spec: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Turn ``"metadata.parties,metadata.effective_date,risks"`` into a pydantic
+    ``include`` mapping. Returns None (everything) for an empty spec.
+    """
+    if not spec:
+        return None
+    include: Dict[str, Any] = {}
+    for item in spec.split(","):
+        parts = [p for p in item.strip().split(".") if p]
+        if not parts:
+            continue
+        node = include
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is True:
+                break
+            if child is None:
+                child = node[part] = {}
+            node = child
+        else:
+            node[parts[-1]] = True
+    return include or None
+
+
+def to_json(model: BaseModel, include: Optional[Dict[str, Any]] = None, indent: Optional[int] = None) -> bytes:
+    """
+    Serialize through pydantic-core's native encoder, skipping the optional
+    text, truncation and language fields when they are unset so default responses keep
+    their shape.
+    """
+    exclude = {name for name in _OPTIONAL_FIELDS if name in type(model).model_fields and getattr(model, name) is None}
+    return model.model_dump_json(include=include, exclude=exclude or None, indent=indent).encode("utf-8")
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import re
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Pattern, Sequence, Tuple
 
-from .types import RiskFinding, Metadata
+from .language import DEFAULT_LANGUAGE, detect_languages
+from .segment import lower_text
+from .types import ClauseMatch, RiskFinding, Metadata
 
 
+# Rules with a "lang" only run on documents where that language is detected
 RISK_RULES = [
     {
         "id": "risk.indemnity.broad",
+        "lang": "en",
         "severity": "high",
         "pattern": r"indemnif(y|ies|ication).{0,80}(any|all)\s+claims",
         "title": "Broad indemnity",
@@ -16,6 +21,7 @@ RISK_RULES = [
     },
     {
         "id": "risk.limitation.none",
+        "lang": "en",
         "severity": "critical",
         "pattern": r"no\s+limitation\s+of\s+liability|unlimited\s+liability",
         "title": "Missing limitation of liability",
@@ -23,11 +29,36 @@ RISK_RULES = [
     },
     {
         "id": "risk.auto_renew.hidden",
+        "lang": "en",
         "severity": "medium",
         "pattern": r"auto(matic)?\s+renew(al|s)\b",
         "title": "Automatic renewal",
         "detail": "Automatic renewal detected; ensure notice windows are acceptable.",
     },
+    {
+        "id": "risk.indemnity.broad",
+        "lang": "id",
+        "severity": "high",
+        "pattern": r"ganti\s+rugi.{0,80}(setiap|semua|segala)\s+(klaim|tuntutan)",
+        "title": "Broad indemnity",
+        "detail": "Indemnity appears overly broad (any/all claims). Consider limiting scope and caps.",
+    },
+    {
+        "id": "risk.limitation.none",
+        "lang": "id",
+        "severity": "critical",
+        "pattern": r"tanggung\s+jawab\s+(yang\s+)?tidak\s+terbatas|tanpa\s+batas(an)?\s+tanggung\s+jawab",
+        "title": "Missing limitation of liability",
+        "detail": "Limitation of liability missing or unlimited.",
+    },
+    {
+        "id": "risk.auto_renew.hidden",
+        "lang": "id",
+        "severity": "medium",
+        "pattern": r"(diperpanjang|perpanjangan)\s+(secara\s+)?otomatis",
+        "title": "Automatic renewal",
+        "detail": "Automatic renewal detected; ensure notice windows are acceptable.",
+    },
     {
         "id": "risk.governing_law.missing",
         "severity": "medium",
@@ -39,13 +70,79 @@ RISK_RULES = [
 ]
 
 
-def analyze(text: str, metadata: Metadata) -> List[RiskFinding]:
+# Words whose absence (with no expiration date) flags an open-ended term
+TERMINATION_WORDS = {
+    "en": r"termination",
+    "id": r"pengakhiran|pemutusan",
+}
+
+
+def _langs(text: str, lower: str, langs: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    return tuple(langs) if langs else detect_languages(text, lower)
+
+
+@lru_cache(maxsize=None)
+def compiled_rules(langs: Tuple[str, ...] = (DEFAULT_LANGUAGE,)) -> Tuple[Tuple[dict, Optional[Pattern[str]]], ...]:
+    """
+    RISK_RULES for ``langs`` (plus language-independent ones) paired with their
+    compiled pattern (None for predicate-only rules).
+    """
+    return tuple(
+        (rule, re.compile(rule["pattern"], re.IGNORECASE | re.DOTALL) if rule.get("pattern") else None)
+        for rule in RISK_RULES
+        if rule.get("lang") is None or rule["lang"] in langs
+    )
+
+
+def scan_patterns(
+    text: str,
+    lower: Optional[str] = None,
+    langs: Optional[Sequence[str]] = None,
+) -> List[RiskFinding]:
+    """
+    Findings for the pattern-based rules of ``langs``, each with a snippet
+    around its first match; a rule id is reported once across languages.
+    """
+    findings: List[RiskFinding] = []
+    lower = lower_text(text) if lower is None else lower
+    seen = set()
+    for rule, rx in compiled_rules(_langs(text, lower, langs)):
+        m = rx.search(lower) if rx is not None and rule["id"] not in seen else None
+        if m:
+            seen.add(rule["id"])
+            snippet = text[max(0, m.start() - 60) : m.end() + 60]
+            findings.append(
+                RiskFinding(
+                    id=rule["id"],
+                    severity=rule["severity"],
+                    title=rule["title"],
+                    detail=rule["detail"],
+                    clause_snippet=snippet,
+                )
+            )
+    return findings
+
+
+def document_findings(
+    text: str,
+    metadata: Metadata,
+    lower: Optional[str] = None,
+    clauses: Optional[List[ClauseMatch]] = None,
+    langs: Optional[Sequence[str]] = None,
+) -> List[RiskFinding]:
+    """
+    Findings that depend on the whole document or its metadata rather than one
+    clause. Clauses found by the classifier (``clauses``) also count as present.
+    """
+    from .clauses import found
+
     findings: List[RiskFinding] = []
-    lower = text.lower()
-    for rule in RISK_RULES:
+    lower = lower_text(text) if lower is None else lower
+    langs = _langs(text, lower, langs)
+    for rule, _ in compiled_rules(langs):
         predicate = rule.get("predicate")
         if predicate == "missing_governing_law":
-            if not (metadata.governing_law or metadata.jurisdiction):
+            if not (metadata.governing_law or metadata.jurisdiction or found(clauses, "governing_law")):
                 findings.append(
                     RiskFinding(
                         id=rule["id"],
@@ -54,23 +151,10 @@ def analyze(text: str, metadata: Metadata) -> List[RiskFinding]:
                         detail=rule["detail"],
                     )
                 )
-            continue
-
-        pat = rule.get("pattern")
-        if pat and re.search(pat, lower, re.IGNORECASE | re.DOTALL):
-            m = re.search(pat, lower, re.IGNORECASE | re.DOTALL)
-            snippet = text[max(0, (m.start() if m else 0) - 60) : (m.end() if m else 100) + 60] if m else None
-            findings.append(
-                RiskFinding(
-                    id=rule["id"],
-                    severity=rule["severity"],
-                    title=rule["title"],
-                    detail=rule["detail"],
-                    clause_snippet=snippet,
-                )
-            )
     # Heuristic: if expiration date missing and no termination clause
-    if not metadata.expiration_date and not re.search(r"termination", lower):
+    termination = "|".join(TERMINATION_WORDS[lang] for lang in langs if lang in TERMINATION_WORDS)
+    termination = termination or TERMINATION_WORDS[DEFAULT_LANGUAGE]
+    if not metadata.expiration_date and not found(clauses, "termination") and not re.search(termination, lower):
         findings.append(
             RiskFinding(
                 id="risk.term.open_ended",
@@ -80,3 +164,15 @@ def analyze(text: str, metadata: Metadata) -> List[RiskFinding]:
             )
         )
     return findings
+
+
+def analyze(
+    text: str,
+    metadata: Metadata,
+    clauses: Optional[List[ClauseMatch]] = None,
+    lower: Optional[str] = None,
+    langs: Optional[Sequence[str]] = None,
+) -> List[RiskFinding]:
+    lower = lower_text(text) if lower is None else lower
+    langs = _langs(text, lower, langs)
+    return scan_patterns(text, lower, langs) + document_findings(text, metadata, lower, clauses, langs)
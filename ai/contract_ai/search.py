@@ -0,0 +1,293 @@
+"""Portfolio search over analyzed contracts.
+
+Extraction and analysis results are written to a local SQLite file: contract
+text goes into an FTS5 table, metadata into plain tables (documents, parties,
+risks, compliance issues) with indexes on the filter columns. Queries such as
+"auto-renewal contracts expiring next quarter" are then a single indexed
+query instead of re-analyzing the portfolio.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .cache import default_cache_dir, env_truthy
+from .types import AnalysisResult, ExtractionResult, SearchHit
+
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        doc_id TEXT NOT NULL UNIQUE,
+        title TEXT,
+        effective_date TEXT,
+        expiration_date TEXT,
+        governing_law TEXT,
+        metadata_sha256 TEXT,
+        text_sha256 TEXT,
+        analysis_sha256 TEXT,
+        updated REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS documents_expiration ON documents(expiration_date)",
+    "CREATE TABLE IF NOT EXISTS parties (doc INTEGER NOT NULL, name TEXT NOT NULL, name_lower TEXT NOT NULL, role TEXT)",
+    "CREATE INDEX IF NOT EXISTS parties_doc ON parties(doc)",
+    "CREATE INDEX IF NOT EXISTS parties_name ON parties(name_lower)",
+    "CREATE TABLE IF NOT EXISTS risks (doc INTEGER NOT NULL, risk_id TEXT NOT NULL, severity TEXT)",
+    "CREATE INDEX IF NOT EXISTS risks_doc ON risks(doc)",
+    "CREATE INDEX IF NOT EXISTS risks_id ON risks(risk_id)",
+    "CREATE TABLE IF NOT EXISTS compliance (doc INTEGER NOT NULL, policy_id TEXT NOT NULL, severity TEXT)",
+    "CREATE INDEX IF NOT EXISTS compliance_doc ON compliance(doc)",
+    "CREATE INDEX IF NOT EXISTS compliance_id ON compliance(policy_id)",
+    # rowid = documents.id, so a document's text is replaced with a rowid delete
+    "CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(body, tokenize='unicode61 remove_diacritics 2')",
+)
+
+
+def _sha(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _match_query(text: str) -> str:
+    """Quote each word so user input is never parsed as FTS5 syntax; a trailing ``*`` keeps prefix search."""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*") if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Persistent full-text and metadata index of contracts, keyed by document id."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else default_cache_dir() / "search.sqlite3"
+        self._lock = threading.Lock()
+        self._conn_obj: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._conn_obj is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            conn.commit()
+            self._conn_obj = conn
+            self._pid = os.getpid()
+        return self._conn_obj
+
+    def upsert(
+        self,
+        doc_id: str,
+        result: Union[ExtractionResult, AnalysisResult],
+        text: Optional[str] = None,
+    ) -> bool:
+        """
+        Insert or update ``doc_id`` from an extraction or analysis result.
+        Only the parts that changed are rewritten: metadata always comes from
+        ``result``, risks and compliance only from an ``AnalysisResult``, and
+        the full text (``text`` or ``ExtractionResult.text``) only when given.
+        Returns False when nothing changed.
+        """
+        meta = result.metadata
+        meta_sha = _sha(meta.model_dump_json())
+        body = text if text is not None else getattr(result, "text", None)
+        text_sha = _sha(body) if body is not None else None
+        analysis_sha = None
+        if isinstance(result, AnalysisResult):
+            analysis_sha = _sha(
+                "\n".join(sorted(f"r:{r.id}:{r.severity}" for r in result.risks))
+                + "\n"
+                + "\n".join(sorted(f"c:{c.policy_id}:{c.severity}" for c in result.compliance))
+            )
+
+        with self._lock:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT id, metadata_sha256, text_sha256, analysis_sha256 FROM documents WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            if row is not None and row[1] == meta_sha and text_sha in (None, row[2]) and analysis_sha in (None, row[3]):
+                return False
+            with conn:
+                values = (
+                    meta.title,
+                    meta.effective_date.isoformat() if meta.effective_date else None,
+                    meta.expiration_date.isoformat() if meta.expiration_date else None,
+                    meta.governing_law,
+                    meta_sha,
+                    time.time(),
+                )
+                if row is None:
+                    doc = conn.execute(
+                        "INSERT INTO documents (doc_id, title, effective_date, expiration_date, governing_law, metadata_sha256, updated)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (doc_id,) + values,
+                    ).lastrowid
+                else:
+                    doc = row[0]
+                    conn.execute(
+                        "UPDATE documents SET title = ?, effective_date = ?, expiration_date = ?, governing_law = ?,"
+                        " metadata_sha256 = ?, updated = ? WHERE id = ?",
+                        values + (doc,),
+                    )
+                if row is None or row[1] != meta_sha:
+                    conn.execute("DELETE FROM parties WHERE doc = ?", (doc,))
+                    conn.executemany(
+                        "INSERT INTO parties (doc, name, name_lower, role) VALUES (?, ?, ?, ?)",
+                        [(doc, p.name, p.name.lower(), p.role) for p in meta.parties],
+                    )
+                if text_sha is not None and (row is None or row[2] != text_sha):
+                    conn.execute("DELETE FROM contracts_fts WHERE rowid = ?", (doc,))
+                    conn.execute("INSERT INTO contracts_fts (rowid, body) VALUES (?, ?)", (doc, body))
+                    conn.execute("UPDATE documents SET text_sha256 = ? WHERE id = ?", (text_sha, doc))
+                if analysis_sha is not None and (row is None or row[3] != analysis_sha):
+                    conn.execute("DELETE FROM risks WHERE doc = ?", (doc,))
+                    conn.execute("DELETE FROM compliance WHERE doc = ?", (doc,))
+                    conn.executemany(
+                        "INSERT INTO risks (doc, risk_id, severity) VALUES (?, ?, ?)",
+                        [(doc, r.id, r.severity) for r in result.risks],
+                    )
+                    conn.executemany(
+                        "INSERT INTO compliance (doc, policy_id, severity) VALUES (?, ?, ?)",
+                        [(doc, c.policy_id, c.severity) for c in result.compliance],
+                    )
+                    conn.execute("UPDATE documents SET analysis_sha256 = ? WHERE id = ?", (analysis_sha, doc))
+            return True
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            conn = self._conn()
+            row = conn.execute("SELECT id FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+            if row is None:
+                return
+            with conn:
+                for table in ("parties", "risks", "compliance"):
+                    conn.execute(f"DELETE FROM {table} WHERE doc = ?", row)
+                conn.execute("DELETE FROM contracts_fts WHERE rowid = ?", row)
+                conn.execute("DELETE FROM documents WHERE id = ?", row)
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        party: Optional[str] = None,
+        expires_after: Optional[date] = None,
+        expires_before: Optional[date] = None,
+        risk_id: Optional[str] = None,
+        policy_id: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[SearchHit]:
+        """
+        Documents matching every given filter: full-text ``text`` (best bm25
+        rank first), a case-insensitive ``party`` name substring, an inclusive
+        ``expiration_date`` range, a risk id and a compliance policy id.
+        Without a text query, results are ordered by expiration date.
+        """
+        select = "SELECT d.id, d.doc_id, d.title, d.effective_date, d.expiration_date"
+        joins = ""
+        where: List[str] = []
+        params: List[object] = []
+        if text and text.strip():
+            select += ", snippet(contracts_fts, 0, '[', ']', '...', 12), bm25(contracts_fts)"
+            joins = " JOIN contracts_fts ON contracts_fts.rowid = d.id"
+            where.append("contracts_fts MATCH ?")
+            params.append(_match_query(text))
+            order = "bm25(contracts_fts)"
+        else:
+            select += ", NULL, NULL"
+            order = "d.expiration_date IS NULL, d.expiration_date, d.doc_id"
+        if party:
+            where.append("EXISTS (SELECT 1 FROM parties p WHERE p.doc = d.id AND p.name_lower LIKE ? ESCAPE '\\')")
+            escaped = party.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if expires_after:
+            where.append("d.expiration_date >= ?")
+            params.append(expires_after.isoformat())
+        if expires_before:
+            where.append("d.expiration_date <= ?")
+            params.append(expires_before.isoformat())
+        if risk_id:
+            where.append("EXISTS (SELECT 1 FROM risks r WHERE r.doc = d.id AND r.risk_id = ?)")
+            params.append(risk_id)
+        if policy_id:
+            where.append("EXISTS (SELECT 1 FROM compliance c WHERE c.doc = d.id AND c.policy_id = ?)")
+            params.append(policy_id)
+        sql = f"{select} FROM documents d{joins}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            conn = self._conn()
+            rows = conn.execute(sql, params).fetchall()
+            ids = [r[0] for r in rows]
+            parties: Dict[int, List[str]] = {i: [] for i in ids}
+            risks: Dict[int, List[str]] = {i: [] for i in ids}
+            policies: Dict[int, List[str]] = {i: [] for i in ids}
+            if ids:
+                marks = ",".join("?" * len(ids))
+                for doc, name in conn.execute(f"SELECT doc, name FROM parties WHERE doc IN ({marks})", ids):
+                    parties[doc].append(name)
+                for doc, rid in conn.execute(f"SELECT doc, risk_id FROM risks WHERE doc IN ({marks})", ids):
+                    risks[doc].append(rid)
+                for doc, pid in conn.execute(f"SELECT doc, policy_id FROM compliance WHERE doc IN ({marks})", ids):
+                    policies[doc].append(pid)
+        return [
+            SearchHit(
+                document_id=doc_id,
+                title=title,
+                effective_date=effective,
+                expiration_date=expiration,
+                parties=parties[doc],
+                risk_ids=risks[doc],
+                policy_ids=policies[doc],
+                snippet=snippet,
+                rank=round(rank, 4) if rank is not None else None,
+            )
+            for doc, doc_id, title, effective, expiration, snippet, rank in rows
+        ]
+
+
+_default_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """Process-wide index, or None when disabled via CONTRACT_AI_SEARCH_INDEX=0."""
+    global _default_index
+    if not env_truthy("CONTRACT_AI_SEARCH_INDEX", default=True):
+        return None
+    if _default_index is None:
+        _default_index = SearchIndex()
+    return _default_index
+
+
+def index_document(
+    document_id: str,
+    result: Union[AnalysisResult, ExtractionResult],
+    text: str,
+    sig=None,
+) -> None:
+    """
+    Write ``result`` to the search index and fingerprint ``text`` in the
+    similarity index (``similarity.get_default_index``), so the contract is
+    both searchable and found by /similar; either index may be disabled.
+    ``sig`` is the text's MinHash signature, if already computed.
+    """
+    from .similarity import get_default_index
+
+    similar = get_default_index()
+    if similar is not None:
+        similar.add(document_id, text, sig)
+    index = get_search_index()
+    if index is not None:
+        index.upsert(document_id, result, text)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+# Start of a numbered/bulleted item line: "1.", "2.1", "(a)", "b)", "-", "•"
+_ITEM = r"[ \t]*(?:\d+(?:\.\d+)*[.)]?|\([a-zA-Z0-9]{1,4}\)|[a-z][.)]|[-•*])\s"
+_ITEM_RE = re.compile(_ITEM)
+
+# Candidate boundaries: sentence punctuation followed by whitespace, ";" at end
+# of line, blank lines, and line breaks that start a numbered/bulleted item.
+_BOUNDARY_RE = re.compile(
+    r"(?<=[.!?])[\"')\]]*\s+"
+    r"|;[ \t]*\n\s*"
+    r"|\n[ \t]*\n\s*"
+    r"|\n(?=" + _ITEM + r")"
+)
+
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "no", "nos", "inc", "ltd", "co", "corp", "llc", "pt", "tbk",
+    "cv", "e.g", "i.e", "etc", "vs", "art", "sec", "para", "jl", "st", "u.s", "hlm", "dll", "dsb", "yth",
+}
+
+_LAST_WORD_RE = re.compile(r"([A-Za-z][A-Za-z.]*)\.$")
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    """True when the period ending at ``end`` belongs to a known abbreviation."""
+    m = _LAST_WORD_RE.search(text, max(0, end - 12), end)
+    if not m:
+        return False
+    word = m.group(1).lower()
+    return word in _ABBREVIATIONS
+
+
+_NUMBERING_RE = re.compile(r"(?:\d{1,3}(?:\.\d{1,3})*|[a-zA-Z]|[ivxIVX]{1,4})\.")
+
+
+def _is_numbering(text: str, end: int) -> bool:
+    """True when the period ending at ``end`` closes a list number such as "2." or "3.1." at line start."""
+    line_start = text.rfind("\n", 0, end) + 1
+    return _NUMBERING_RE.fullmatch(text[line_start:end].strip()) is not None
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Split text into sentence/clause spans as ``(start, end)`` offsets, trimmed of
+    surrounding whitespace. Single pass over the text; empty spans are dropped.
+    """
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    for m in _BOUNDARY_RE.finditer(text):
+        end = m.start()
+        if end > 0 and text[end - 1] == "." and (_is_abbreviation(text, end) or _is_numbering(text, end)):
+            # "Beta LLC." still ends the line when the next one starts a list item
+            nl = text.rfind("\n", m.start(), m.end())
+            if nl == -1 or not _ITEM_RE.match(text, nl + 1):
+                continue
+        spans.append((start, end))
+        start = m.end()
+    spans.append((start, len(text)))
+
+    out: List[Tuple[int, int]] = []
+    for s, e in spans:
+        while s < e and text[s].isspace():
+            s += 1
+        while e > s and text[e - 1].isspace():
+            e -= 1
+        if e <= s:
+            continue
+        # A short heading line ("2. Payment") is its own span, not part of the next sentence
+        nl = text.find("\n", s, e)
+        if nl != -1 and nl - s <= 80 and _HEADING_RE.match(text, s, nl) and text[nl - 1] not in ".;:,":
+            out.append((s, nl))
+            s = nl + 1
+            while s < e and text[s].isspace():
+                s += 1
+        if e > s:
+            out.append((s, e))
+    return out
+
+
+def split_sentences(text: str) -> List[str]:
+    return [text[s:e] for s, e in sentence_spans(text)]
+
+
+# Line-start clause headings: "5.", "5.1", "Article 5", "Pasal 12", "BAB III",
+# or short ALL-CAPS lines such as "TERMINATION".
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?:article|section|clause|schedule|annex|pasal|bab|bagian|lampiran)\s+[0-9IVXLC]+[.:)]?"
+    r"|\d{1,3}(?:\.\d{1,3})*\.?(?=[ \t]+\S)"
+    r"|(?-i:[A-Z][A-Z0-9 ,&/'()-]{2,78}[A-Z)])$"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_HEADING_NUMBER_RE = re.compile(
+    r"^\s*(?:(?:article|section|clause|schedule|annex|pasal|bab|bagian|lampiran)\s+)?[0-9IVXLC]+(?:\.\d+)*[.:)]?\s+",
+    re.IGNORECASE,
+)
+# List item markers: (a), a), (iv), (1)
+_LIST_MARKER_RE = re.compile(r"^\s*(?:\((?:[a-z]|[ivxlc]+|\d{1,3})\)|[a-z]\))\s+", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A clause-level slice of a document, identified by a hash of its normalized text."""
+
+    start: int
+    end: int
+    heading: Optional[str]
+    sha256: str
+
+    @property
+    def key(self) -> str:
+        """Heading without its numbering, lowercased: stable when clauses are renumbered."""
+        if not self.heading:
+            return ""
+        return _HEADING_NUMBER_RE.sub("", self.heading).strip().lower() or self.heading.strip().lower()
+
+
+def strip_numbering(text: str) -> str:
+    """``text`` without its leading clause numbers and list markers ("5.2", "Pasal 3", "(a)")."""
+    prev = None
+    while text != prev:
+        prev = text
+        text = _LIST_MARKER_RE.sub("", _HEADING_NUMBER_RE.sub("", text, count=1), count=1)
+    return text
+
+
+def normalize(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
+
+
+def lower_text(text: str) -> str:
+    """
+    Lowercased copy of ``text`` with the same length, so offsets found in it
+    index ``text`` too. Compute it once per document and share it between
+    stages; the rare characters whose lowercase form is longer (e.g. "İ")
+    are kept as-is.
+    """
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def segment_hash(text: str) -> str:
+    return hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()
+
+
+def clause_segments(text: str) -> List[Segment]:
+    """
+    Split text into clause segments at heading lines (numbered clauses, Article/
+    Pasal/Section headings, ALL-CAPS titles). Text before the first heading is a
+    preamble segment. Without any headings, blank-line paragraphs are used so
+    edits still only invalidate the paragraphs they touch.
+    """
+    cuts: List[int] = []
+    for m in _HEADING_RE.finditer(text):
+        line_end = text.find("\n", m.start())
+        line = text[m.start() : line_end if line_end != -1 else len(text)]
+        # A bare number on its own line is not a heading
+        if any(c.isalpha() for c in line):
+            cuts.append(m.start())
+    has_headings = bool(cuts)
+    if not has_headings:
+        cuts = [m.end() for m in re.finditer(r"\n[ \t]*\n", text)]
+
+    bounds = [0] + [c for c in cuts if c > 0] + [len(text)]
+    segments: List[Segment] = []
+    for s, e in zip(bounds, bounds[1:]):
+        heading_start = has_headings and (s in cuts)
+        while s < e and text[s].isspace():
+            s += 1
+        while e > s and text[e - 1].isspace():
+            e -= 1
+        if e <= s:
+            continue
+        chunk = text[s:e]
+        heading = chunk.split("\n", 1)[0].strip()[:120] if heading_start else None
+        segments.append(Segment(start=s, end=e, heading=heading, sha256=segment_hash(chunk)))
+    return segments
@@ -0,0 +1,175 @@
+"""Near-duplicate contract detection with MinHash signatures and LSH banding.
+
+Documents are reduced to hashed word 5-gram shingles, summarized as a
+128-value MinHash signature (vectorized with NumPy) and bucketed into 32 LSH
+bands of 4 rows, which surfaces pairs above roughly 0.4 Jaccard similarity.
+Signatures and band buckets live in a local SQLite file so lookups are a
+handful of indexed queries regardless of portfolio size.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .cache import env_truthy, default_cache_dir
+from .types import SimilarContract
+
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_rng = np.random.default_rng(0x5EED)
+# a < 2**31 keeps a * x (x < 2**32) inside uint64 without overflow
+_A = _rng.integers(1, 2**31 - 1, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2**31 - 1, size=NUM_PERM, dtype=np.uint64)
+_CHUNK = 8192
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Unique 32-bit hashes of the word k-grams of ``text`` (lowercased)."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    tok = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    if len(tok) < k:
+        k = len(tok)
+    n = len(tok) - k + 1
+    acc = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        # Polynomial rolling combine; uint64 arithmetic wraps, then fold to 32 bits
+        acc = acc * np.uint64(1000003) + tok[j : j + n]
+    acc = (acc ^ (acc >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+    return np.unique(acc)
+
+
+def minhash(shingles: np.ndarray) -> np.ndarray:
+    """MinHash signature (NUM_PERM values) of a set of shingle hashes."""
+    sig = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(shingles), _CHUNK):
+        x = shingles[start : start + _CHUNK]
+        hv = (_A[:, None] * x[None, :] + _B[:, None]) % _PRIME
+        np.minimum(sig, hv.min(axis=1), out=sig)
+    return sig
+
+
+def signature(text: str) -> np.ndarray:
+    return minhash(shingle_hashes(text))
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: fraction of agreeing signature slots."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def _band_keys(sig: np.ndarray) -> List[int]:
+    rows = sig.reshape(BANDS, ROWS)
+    # crc32 of each band's bytes; collisions only add candidates, which are re-scored
+    return [zlib.crc32(row.tobytes()) for row in rows]
+
+
+class SimilarityIndex:
+    """Persistent MinHash/LSH index of analyzed contracts, keyed by document id."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else default_cache_dir() / "similarity.sqlite3"
+        self._lock = threading.Lock()
+        self._conn_obj: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._conn_obj is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS docs (doc_id TEXT PRIMARY KEY, signature BLOB NOT NULL, shingles INTEGER NOT NULL, updated REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, bucket INTEGER NOT NULL, doc_id TEXT NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS bands_lookup ON bands(band, bucket)")
+            conn.execute("CREATE INDEX IF NOT EXISTS bands_doc ON bands(doc_id)")
+            conn.commit()
+            self._conn_obj = conn
+            self._pid = os.getpid()
+        return self._conn_obj
+
+    def add(self, doc_id: str, text: str, sig: Optional[np.ndarray] = None) -> None:
+        """Insert or replace ``doc_id``'s signature."""
+        shingles = shingle_hashes(text)
+        if not len(shingles):
+            return
+        sig = minhash(shingles) if sig is None else sig
+        with self._lock:
+            conn = self._conn()
+            conn.execute("DELETE FROM bands WHERE doc_id = ?", (doc_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO docs (doc_id, signature, shingles, updated) VALUES (?, ?, ?, ?)",
+                (doc_id, sig.tobytes(), int(len(shingles)), time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO bands (band, bucket, doc_id) VALUES (?, ?, ?)",
+                [(b, key, doc_id) for b, key in enumerate(_band_keys(sig))],
+            )
+            conn.commit()
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            conn = self._conn()
+            conn.execute("DELETE FROM bands WHERE doc_id = ?", (doc_id,))
+            conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+            conn.commit()
+
+    def query(
+        self,
+        text: str,
+        top_k: int = 5,
+        threshold: float = 0.5,
+        exclude: Optional[str] = None,
+        sig: Optional[np.ndarray] = None,
+    ) -> List[SimilarContract]:
+        """Indexed documents most similar to ``text``, best first, at or above ``threshold``."""
+        sig = signature(text) if sig is None else sig
+        keys = _band_keys(sig)
+        with self._lock:
+            conn = self._conn()
+            candidates = set()
+            for b, key in enumerate(keys):
+                for (doc_id,) in conn.execute("SELECT doc_id FROM bands WHERE band = ? AND bucket = ?", (b, key)):
+                    candidates.add(doc_id)
+            candidates.discard(exclude)
+            rows = []
+            for doc_id in candidates:
+                row = conn.execute("SELECT signature FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+                if row is not None:
+                    rows.append((doc_id, np.frombuffer(row[0], dtype=np.uint64)))
+        matches = [
+            SimilarContract(document_id=doc_id, similarity=round(estimate_similarity(sig, other), 4))
+            for doc_id, other in rows
+        ]
+        matches = [m for m in matches if m.similarity >= threshold]
+        matches.sort(key=lambda m: m.similarity, reverse=True)
+        return matches[:top_k]
+
+
+_default_index: Optional[SimilarityIndex] = None
+
+
+def get_default_index() -> Optional[SimilarityIndex]:
+    """Process-wide index, or None when disabled via CONTRACT_AI_SIMILARITY_INDEX=0."""
+    global _default_index
+    if not env_truthy("CONTRACT_AI_SIMILARITY_INDEX", default=True):
+        return None
+    if _default_index is None:
+        _default_index = SimilarityIndex()
+    return _default_index
@@ -47,15 +47,114 @@ class Metadata(BaseModel):
     custom: Dict[str, Any] = Field(default_factory=dict)
 
 
+class Truncation(BaseModel):
+    """Set when a document was cut to the configured page/character budget (see contract_ai.limits)."""
+
+    reason: str = Field(pattern="^(pages|chars)$")
+    limit: int
+    total_pages: Optional[int] = None
+
+
 class ExtractionResult(BaseModel):
-    text: str
+    text: Optional[str] = None
     metadata: Metadata
+    # Populated instead of `text` by lean response modes (see contract_ai.response)
+    text_sha256: Optional[str] = None
+    text_length: Optional[int] = None
+    offsets: Optional[List[int]] = None
+    truncation: Optional[Truncation] = None
+    # Detected document language (ISO 639-1), which selected the rule set
+    language: Optional[str] = None
+
+
+class ClauseMatch(BaseModel):
+    key: str
+    status: str = Field(pattern="^(present|deviating|missing)$")
+    score: float
+    heading: Optional[str] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
 
 
 class AnalysisResult(BaseModel):
     metadata: Metadata
     risks: List[RiskFinding]
     compliance: List[ComplianceIssue]
+    clauses: List[ClauseMatch] = Field(default_factory=list)
+    truncation: Optional[Truncation] = None
+    language: Optional[str] = None
+
+
+class SegmentChange(BaseModel):
+    status: str = Field(pattern="^(added|removed|modified)$")
+    heading: Optional[str] = None
+    sha256: str
+    previous_sha256: Optional[str] = None
+
+
+class SimilarContract(BaseModel):
+    document_id: str
+    similarity: float
+
+
+class RevisionChanges(BaseModel):
+    previous_revision: Optional[int] = None
+    # Set when an unseen document was compared against its closest indexed contract
+    base_document_id: Optional[str] = None
+    base_similarity: Optional[float] = None
+    unchanged: int = 0
+    added: int = 0
+    modified: int = 0
+    removed: int = 0
+    reanalyzed_segments: int = 0
+    llm_segments: int = 0
+    segments: List[SegmentChange] = Field(default_factory=list)
+
+
+class RevisionAnalysisResult(AnalysisResult):
+    document_id: Optional[str] = None
+    revision: int = 1
+    changes: RevisionChanges
+
+
+class TextChange(BaseModel):
+    op: str = Field(pattern="^(replace|insert|delete)$")
+    old: Optional[str] = None
+    new: Optional[str] = None
+
+
+class ClauseDiff(BaseModel):
+    status: str = Field(pattern="^(added|removed|modified|moved)$")
+    old_heading: Optional[str] = None
+    new_heading: Optional[str] = None
+    old_start: Optional[int] = None
+    new_start: Optional[int] = None
+    changes: List[TextChange] = Field(default_factory=list)
+
+
+class ContractDiff(BaseModel):
+    unchanged: int = 0
+    clauses: List[ClauseDiff] = Field(default_factory=list)
+    risks_added: List[RiskFinding] = Field(default_factory=list)
+    risks_removed: List[RiskFinding] = Field(default_factory=list)
+    risks_changed: List[RiskFinding] = Field(default_factory=list)
+    compliance_added: List[ComplianceIssue] = Field(default_factory=list)
+    compliance_resolved: List[ComplianceIssue] = Field(default_factory=list)
+    old_truncation: Optional[Truncation] = None
+    new_truncation: Optional[Truncation] = None
+
+
+class SearchHit(BaseModel):
+    document_id: str
+    title: Optional[str] = None
+    effective_date: Optional[date] = None
+    expiration_date: Optional[date] = None
+    parties: List[str] = Field(default_factory=list)
+    risk_ids: List[str] = Field(default_factory=list)
+    policy_ids: List[str] = Field(default_factory=list)
+    # Highlighted excerpt and bm25 rank (lower is better) for text queries
+    snippet: Optional[str] = None
+    rank: Optional[float] = None
 
 
 class DraftRequest(BaseModel):
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, Optional
+
+
+_SAMPLE = (
+    "This Agreement is made between PT Contoh Indonesia and Example Corp.\n"
+    "Effective date: 1 January 2025. Berlaku sejak 1 Januari 2025. Expires on 2026-01-01.\n"
+    "Party A shall pay USD 1,000. Para pihak wajib menjaga kerahasiaan.\n"
+)
+
+# Timings of the last completed warm-up in this process (inherited across fork)
+last_timings: Optional[Dict[str, float]] = None
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Load heavy dependencies and bundled resources ahead of the first request:
+    dateparser (English and Indonesian locales), the compiled risk rules and
+    extraction regexes of every supported language, default policies, the
+    clause library, templates and the clause classifier.
+    Returns the time spent per step in milliseconds.
+    """
+    timings: Dict[str, float] = {}
+
+    def step(name: str, fn) -> None:
+        t0 = time.perf_counter()
+        fn()
+        timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+
+    def _dateparser():
+        import dateparser
+
+        dateparser.parse("1 January 2025", languages=["en"])
+        dateparser.parse("1 Januari 2025", languages=["id"])
+        dateparser.parse("2025-01-01")
+
+    def _rules():
+        from .extractor import date_label_patterns, extract, obligation_re
+        from .language import LANGUAGES
+        from .risk import analyze, compiled_rules
+
+        for langs in [(lang,) for lang in LANGUAGES] + [LANGUAGES]:
+            compiled_rules(langs)
+            date_label_patterns(langs)
+            obligation_re(langs)
+        analyze(_SAMPLE, extract(_SAMPLE).metadata)
+
+    def _policies():
+        from .compliance import default_policies
+
+        default_policies()
+
+    def _templates():
+        from .drafting import TEMPLATES_DIR, get_template, load_clause_library
+
+        load_clause_library()
+        for tpl in TEMPLATES_DIR.glob("*.jinja"):
+            get_template(tpl.name)
+
+    def _clauses():
+        from .clauses import classify
+
+        classify(_SAMPLE)
+
+    step("dateparser", _dateparser)
+    step("rules", _rules)
+    step("policies", _policies)
+    step("templates", _templates)
+    step("clauses", _clauses)
+    global last_timings
+    last_timings = timings
+    return timings
+
+
+def enabled() -> bool:
+    """Warm-up runs unless CONTRACT_AI_WARMUP is set to a false value."""
+    return os.getenv("CONTRACT_AI_WARMUP", "1").strip().lower() not in {"0", "false", "no", "off"}
@@ -0,0 +1,166 @@
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+_CACHE_DIR = tempfile.mkdtemp(prefix="contract-ai-test-")
+atexit.register(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
+os.environ["CONTRACT_AI_CACHE_DIR"] = _CACHE_DIR
+os.environ["CONTRACT_AI_WARMUP"] = "0"
+os.environ["GEMINI_API_KEY"] = ""
+os.environ.setdefault("CONTRACT_AI_SIMILARITY_INDEX", "0")
+os.environ.setdefault("CONTRACT_AI_SEARCH_INDEX", "0")
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from fastapi.testclient import TestClient
+
+from app import main
+from app.main import BodySizeLimit, app
+from contract_ai.limits import Limits
+
+
+CONTRACT = (
+    "This Agreement is made between Acme Corp and Beta LLC. Effective date: 1 January 2025.\n"
+    "1. Acme Corp shall pay USD 1,000 within 30 days of each invoice.\n"
+    "2. This Agreement is governed by the laws of Indonesia.\n"
+)
+
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        env = mock.patch.dict(os.environ, {"CONTRACT_AI_PROFILE_DIR": self.profile_dir.name})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def _extract(self, **headers):
+        response = self.client.post("/extract", json={"text": CONTRACT}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_not_profiled_unless_enabled(self):
+        with mock.patch.dict(os.environ, {"CONTRACT_AI_PROFILING": "", "CONTRACT_AI_PROFILING_TOKEN": ""}):
+            self.assertNotIn("x-profile-file", self._extract(**{"X-Profile": "pstats"}).headers)
+
+    def test_token_enables_profiling_at_runtime(self):
+        with mock.patch.dict(os.environ, {"CONTRACT_AI_PROFILING_TOKEN": "s3cret"}):
+            self.assertNotIn("x-profile-file", self._extract(**{"X-Profile": "pstats", "X-Profile-Token": "wrong"}).headers)
+            response = self._extract(**{"X-Profile": "pstats", "X-Profile-Token": "s3cret"})
+        self.assertTrue(os.path.exists(response.headers["x-profile-file"]))
+
+    def test_flag_enables_profiling_without_token(self):
+        with mock.patch.dict(os.environ, {"CONTRACT_AI_PROFILING": "1", "CONTRACT_AI_PROFILING_TOKEN": ""}):
+            response = self._extract(**{"X-Profile": "speedscope"})
+        self.assertTrue(response.headers["x-profile-file"].endswith(".speedscope.json"))
+
+
+class ResponseShapingTest(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_extract_text_mode_and_fields(self):
+        response = self.client.post(
+            "/extract",
+            params={"text_mode": "hash", "fields": "text_sha256,text_length,metadata.parties"},
+            json={"text": CONTRACT},
+        )
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(set(body), {"text_sha256", "text_length", "metadata"})
+        self.assertEqual(set(body["metadata"]), {"parties"})
+        self.assertEqual(body["text_length"], len(CONTRACT))
+
+    def test_unknown_text_mode_is_rejected(self):
+        response = self.client.post("/extract", params={"text_mode": "summary"}, json={"text": CONTRACT})
+        self.assertEqual(response.status_code, 422)
+
+    def test_analyze_fields(self):
+        response = self.client.post("/analyze", params={"fields": "compliance"}, json={"text": CONTRACT})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()), ["compliance"])
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def _limits(self, **limits):
+        patch = mock.patch.object(main, "LIMITS", Limits(**limits))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_inline_text_is_cut_and_flagged(self):
+        self._limits(max_chars=40)
+        response = self.client.post("/extract", json={"text": CONTRACT})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["text"], CONTRACT[:40])
+        self.assertEqual(body["truncation"], {"reason": "chars", "limit": 40, "total_pages": None})
+
+    def test_uploaded_text_is_cut_and_flagged(self):
+        self._limits(max_chars=40)
+        response = self.client.post("/analyze/upload", files={"file": ("contract.txt", CONTRACT.encode("utf-8"))})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["truncation"]["reason"], "chars")
+
+    def test_untruncated_response_has_no_flag(self):
+        response = self.client.post("/extract", json={"text": CONTRACT})
+        self.assertNotIn("truncation", response.json())
+
+    def test_diff_flags_each_side(self):
+        self._limits(max_chars=40)
+        response = self.client.post("/diff", json={"old_text": CONTRACT, "new_text": CONTRACT[:30]})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["old_truncation"]["limit"], 40)
+        self.assertNotIn("new_truncation", body)
+
+    def test_oversized_upload_file_is_rejected(self):
+        self._limits(max_upload_bytes=100)
+        response = self.client.post("/extract/upload", files={"file": ("contract.txt", b"x" * 101)})
+        self.assertEqual(response.status_code, 413)
+
+    def test_body_over_content_length_limit_is_rejected_up_front(self):
+        client = TestClient(BodySizeLimit(app, max_bytes=64))
+        response = client.post("/extract", json={"text": CONTRACT})
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("MB limit", response.json()["detail"])
+
+    def test_chunked_upload_is_rejected_once_it_crosses_the_limit(self):
+        client = TestClient(BodySizeLimit(app, max_bytes=1000))
+
+        def multipart():
+            # No Content-Length: the body is streamed with chunked transfer encoding
+            yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="big.txt"\r\n\r\n'
+            for _ in range(100):
+                yield b"x" * 500
+            yield b"\r\n--b--\r\n"
+
+        response = client.post(
+            "/extract/upload", content=multipart(), headers={"Content-Type": "multipart/form-data; boundary=b"}
+        )
+        self.assertEqual(response.status_code, 413)
+
+    def test_chunked_body_under_the_limit_is_accepted(self):
+        client = TestClient(BodySizeLimit(app, max_bytes=10_000))
+        data = CONTRACT.encode("utf-8")
+
+        def chunks():
+            yield b'{"text": '
+            yield json.dumps(data.decode("utf-8")).encode("utf-8")
+            yield b"}"
+
+        response = client.post("/extract", content=chunks(), headers={"Content-Type": "application/json"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["text"], CONTRACT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from contract_ai import cache
+from contract_ai.cache import ParsedTextCache, file_key, load_document_cached
+from contract_ai.parser import load_document
+
+
+TEXT = "This Agreement is made between Acme Corp and Beta LLC.\nAcme Corp shall pay USD 1,000.\n"
+
+
+class ParsedTextCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ParsedTextCache(Path(self.tmp.name) / "parsed", max_bytes=1 << 20)
+        self.path = self._write("contract.txt", TEXT)
+
+    def _write(self, name, text):
+        path = Path(self.tmp.name) / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def _load(self, path, **limits):
+        with mock.patch.object(cache, "load_document", wraps=load_document) as parse:
+            parsed = load_document_cached(path, self.cache, **limits)
+        return parsed, parse.call_count
+
+    def test_identical_bytes_are_parsed_once(self):
+        first, parsed_first = self._load(self.path)
+        copy = self._write("copy.txt", TEXT)
+        second, parsed_second = self._load(copy)
+        self.assertEqual((parsed_first, parsed_second), (1, 0))
+        self.assertEqual(second.text, first.text)
+
+    def test_key_includes_file_suffix(self):
+        markdown = self._write("contract.md", TEXT)
+        self.assertNotEqual(file_key(self.path), file_key(markdown))
+        self._load(self.path)
+        self.assertEqual(self._load(markdown)[1], 1)
+
+    def test_parser_version_bump_invalidates_entries(self):
+        key = file_key(self.path)
+        self._load(self.path)
+        with mock.patch.object(cache, "PARSER_VERSION", "test-next"):
+            self.assertNotEqual(file_key(self.path), key)
+            self.assertEqual(self._load(self.path)[1], 1)
+        self.assertEqual(self._load(self.path)[1], 0)
+
+    def test_limits_are_part_of_the_key_and_truncation_survives_a_hit(self):
+        self._load(self.path)
+        capped, parsed = self._load(self.path, max_chars=10)
+        self.assertEqual(parsed, 1)
+        hit, parsed = self._load(self.path, max_chars=10)
+        self.assertEqual(parsed, 0)
+        self.assertEqual(hit.text, TEXT[:10])
+        self.assertEqual(hit.truncation, capped.truncation)
+        self.assertEqual(hit.truncation.reason, "chars")
+
+    def test_corrupt_entry_is_a_miss_and_removed(self):
+        key = file_key(self.path)
+        self._load(self.path)
+        entry = self.cache._path(key)
+        entry.write_bytes(b"garbage")
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(entry.exists())
+
+    def test_least_recently_used_entries_are_evicted(self):
+        paths = [self._write(f"doc{i}.txt", f"{TEXT} {i}") for i in range(3)]
+        keys = [file_key(p) for p in paths]
+        for p in paths[:2]:
+            load_document_cached(p, self.cache)
+        now = time.time()
+        for age, key in ((100, keys[0]), (50, keys[1])):
+            os.utime(self.cache._path(key), (now - age, now - age))
+        self.cache.max_bytes = sum(self.cache._path(k).stat().st_size for k in keys[:2]) + 16
+        self.assertIsNotNone(self.cache.get(keys[0]))  # a hit makes doc0 the most recent
+        load_document_cached(paths[2], self.cache)
+        self.assertEqual(sorted(os.listdir(self.cache.directory)), sorted(f"{k}.json.z" for k in (keys[0], keys[2])))
+
+
+if __name__ == "__main__":
+    unittest.main()
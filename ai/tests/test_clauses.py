@@ -0,0 +1,117 @@
+import unittest
+
+from contract_ai.clauses import classify, found
+from contract_ai.compliance import check, default_policies
+from contract_ai.types import ClauseMatch, Metadata
+
+
+# Library clauses with light edits (party names, periods, jurisdiction)
+NEAR_LIBRARY = """SERVICES AGREEMENT
+
+1. Confidentiality
+Each party agrees to keep confidential all non-public information disclosed under this Agreement and to use it solely for performing its obligations under this Agreement.
+
+2. Limitation of Liability
+Except for wilful misconduct, in no event shall either party be liable for indirect, incidental, special or consequential damages. The total liability of each party shall not exceed the fees paid in the twelve (12) months preceding the claim.
+
+3. Governing Law
+This Agreement shall be governed by and construed in accordance with the laws of Singapore, without regard to its conflict of laws principles. The parties submit to the exclusive jurisdiction of the courts of Singapore.
+
+4. Termination
+Either party may terminate this Agreement upon sixty (60) days' written notice for material breach not cured within such period, or immediately for insolvency.
+
+5. Data Protection
+Each party will comply with applicable data protection laws and implement appropriate technical and organisational measures to protect personal data.
+"""
+
+# The same topics in independent wording
+REWORDED = """MASTER SERVICES AGREEMENT
+
+1. Services
+Supplier shall provide the services described in each Statement of Work.
+
+2. Limitation of Liability
+Neither party shall be liable to the other for any loss of profits, loss of revenue or any indirect or consequential loss. Each party's aggregate liability arising out of or in connection with this Agreement is capped at the total fees paid by Customer in the preceding twelve months.
+
+3. Confidentiality
+The Receiving Party shall hold the Disclosing Party's Confidential Information in strict confidence and shall not disclose it to any third party except its employees who need to know it.
+
+4. Governing Law
+This Agreement is governed by the laws of England and Wales, and the courts of London shall have exclusive jurisdiction over any dispute.
+
+5. Termination
+Either party may terminate this Agreement by giving ninety days' written notice to the other party. Customer may terminate immediately if Supplier commits a material breach which is not remedied within thirty days.
+
+6. Privacy
+Supplier shall process personal data only on the documented instructions of Customer and in accordance with the GDPR, and shall implement appropriate security measures.
+"""
+
+UNRELATED = """SUPPLY AGREEMENT
+
+1. Delivery
+Supplier shall deliver the goods to the Customer's warehouse within fourteen days of each purchase order.
+
+2. Price
+The price of the goods is set out in Schedule 1 and includes packaging and insurance.
+
+3. Force Majeure
+Neither party is responsible for delays caused by events beyond its reasonable control, including flood, fire or strike.
+
+4. Assignment
+Neither party may assign this Agreement without the prior written consent of the other party.
+"""
+
+KEYS = ["confidentiality", "limitation_of_liability", "governing_law", "termination", "data_protection"]
+
+
+def _statuses(text):
+    return {m.key: m.status for m in classify(text)}
+
+
+class ClassifyTest(unittest.TestCase):
+    def test_library_wording_is_present(self):
+        self.assertEqual(_statuses(NEAR_LIBRARY), dict.fromkeys(KEYS, "present"))
+
+    def test_independent_wording_is_deviating_but_found(self):
+        matches = classify(REWORDED)
+        self.assertEqual({m.key: m.status for m in matches}, dict.fromkeys(KEYS, "deviating"))
+        for key in KEYS:
+            self.assertTrue(found(matches, key), key)
+
+    def test_unrelated_clauses_are_missing(self):
+        matches = classify(UNRELATED)
+        self.assertEqual({m.key: m.status for m in matches}, dict.fromkeys(KEYS, "missing"))
+        self.assertFalse(found(matches, "termination"))
+
+    def test_indonesian_headings_are_found(self):
+        text = (
+            "Pasal 1 Kerahasiaan\nPara Pihak wajib menjaga kerahasiaan seluruh informasi.\n\n"
+            "Pasal 2 Batasan Tanggung Jawab\nTanggung jawab masing-masing pihak terbatas pada biaya yang dibayarkan.\n"
+        )
+        matches = classify(text)
+        self.assertTrue(found(matches, "confidentiality"))
+        self.assertTrue(found(matches, "limitation_of_liability"))
+
+    def test_deviating_wording_without_topic_heading_is_not_found(self):
+        match = ClauseMatch(key="termination", status="deviating", score=0.2, heading="5. Assignment")
+        self.assertFalse(found([match], "termination"))
+        self.assertIsNone(found([match], "governing_law"))
+
+
+class ComplianceClauseKeyTest(unittest.TestCase):
+    def test_reworded_liability_clause_satisfies_policy(self):
+        issues = check(Metadata(governing_law="England"), REWORDED, default_policies(), classify(REWORDED))
+        self.assertEqual(issues, [])
+
+    def test_missing_liability_clause_fails_policy(self):
+        issues = check(Metadata(governing_law="England"), UNRELATED, default_policies(), classify(UNRELATED))
+        self.assertEqual([i.policy_id for i in issues], ["policy.limitation_of_liability.required"])
+
+    def test_key_words_in_text_satisfy_policy(self):
+        text = "The limitation of liability in Schedule 2 applies."
+        matches = [ClauseMatch(key="limitation_of_liability", status="missing", score=0.0)]
+        self.assertEqual(check(Metadata(governing_law="Indonesia"), text, default_policies(), matches), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
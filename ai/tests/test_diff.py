@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+os.environ.setdefault("CONTRACT_AI_SIMILARITY_INDEX", "0")
+os.environ.setdefault("CONTRACT_AI_SEARCH_INDEX", "0")
+
+from contract_ai import incremental
+from contract_ai.cache import SQLiteCache
+from contract_ai.diff import diff_documents
+from contract_ai.types import Metadata, RiskFinding
+
+
+OLD = (
+    "1. Payment\nThe Client shall pay USD 1,000 within 30 days.\n\n"
+    "2. Governing Law\nThis Agreement is governed by the laws of Indonesia.\n"
+)
+NEW = OLD.replace("within 30 days", "within 60 days") + "\n3. Renewal\nThis Agreement renews by automatic renewal.\n"
+
+
+class StubClient:
+    model_name = "stub"
+
+    def extract_and_analyze(self, text, lang=None):
+        class Result:
+            pass
+
+        result = Result()
+        result.metadata = Metadata(governing_law="Indonesia" if "Governing Law" in text else None)
+        result.risks = [RiskFinding(id="llm.renewal", severity="medium", title="Renewal", detail="Renews")] if "Renewal" in text else []
+        return result
+
+
+class DiffDocumentsTest(unittest.TestCase):
+    def test_repeated_diff_gives_same_findings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SQLiteCache(os.path.join(tmp, "segments.sqlite3"))
+            with mock.patch.object(incremental, "get_segment_cache", return_value=cache), \
+                    mock.patch("contract_ai.llm.GeminiClient", StubClient):
+                runs = [diff_documents(OLD, NEW) for _ in range(2)]
+        summaries = [
+            (sorted(r.id for r in d.risks_added), sorted(r.id for r in d.risks_removed), sorted(c.policy_id for c in d.compliance_added))
+            for d in runs
+        ]
+        self.assertEqual(summaries[0], summaries[1])
+        self.assertIn("llm.renewal", summaries[0][0])
+        self.assertEqual(summaries[0][1], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
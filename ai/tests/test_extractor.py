@@ -0,0 +1,57 @@
+import unittest
+
+from contract_ai.extractor import extract_obligations, extract_parties, obligation_owner
+from contract_ai.segment import split_sentences
+from contract_ai.types import ExtractedParty
+
+
+PARTIES = [ExtractedParty(name="Acme Corp", role="Party A"), ExtractedParty(name="Beta LLC", role="Party B")]
+
+
+class ObligationOwnerTest(unittest.TestCase):
+    def test_generic_party_wording_has_no_owner(self):
+        self.assertIsNone(obligation_owner("Each party agrees that it ", PARTIES))
+        self.assertIsNone(obligation_owner("The third party auditor ", PARTIES))
+
+    def test_last_named_party_owns_the_obligation(self):
+        self.assertEqual(obligation_owner("Upon request by Acme Corp, Beta LLC ", PARTIES), "Beta LLC")
+
+    def test_name_must_match_whole_words(self):
+        parties = [ExtractedParty(name="Acme", role="Party A")]
+        self.assertIsNone(obligation_owner("Acmeco Holdings ", parties))
+
+
+class SentenceSplitTest(unittest.TestCase):
+    def test_list_item_after_abbreviation_starts_a_sentence(self):
+        text = (
+            "This Agreement is made between Acme Corp and Beta LLC.\n"
+            "1. Beta LLC shall deliver the goods by 1 March 2025.\n"
+            "2. Acme Corp shall pay within 30 days."
+        )
+        self.assertEqual(
+            split_sentences(text),
+            [
+                "This Agreement is made between Acme Corp and Beta LLC.",
+                "1. Beta LLC shall deliver the goods by 1 March 2025.",
+                "2. Acme Corp shall pay within 30 days.",
+            ],
+        )
+
+    def test_abbreviation_inside_a_line_does_not_split(self):
+        text = "Signed by PT Maju Tbk. on behalf of the parties."
+        self.assertEqual(split_sentences(text), [text])
+
+    def test_obligations_after_abbreviation_get_their_own_owner_and_date(self):
+        text = (
+            "This Agreement is made between Acme Corp and Beta LLC.\n"
+            "1. Beta LLC shall deliver the goods by 1 March 2025.\n"
+            "2. Acme Corp shall pay within 30 days.\n"
+            "3. Each party shall keep this Agreement confidential."
+        )
+        obligations = extract_obligations(text, extract_parties(text), langs=("en",))
+        self.assertEqual([o.owner for o in obligations], ["Beta LLC", "Acme Corp", None])
+        self.assertEqual(str(obligations[0].due_date), "2025-03-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("CONTRACT_AI_SIMILARITY_INDEX", "0")
+os.environ.setdefault("CONTRACT_AI_SEARCH_INDEX", "0")
+
+from contract_ai.cache import SQLiteCache
+from contract_ai.compliance import default_policies
+from contract_ai.incremental import analyze_revision
+from contract_ai.types import Metadata, RiskFinding
+
+
+PAYMENT = "1. Payment\nThe Client shall pay USD 1,000 within 30 days.\n\n"
+GOVERNING_LAW = "2. Governing Law\nThis Agreement is governed by the laws of Indonesia.\n\n"
+TERM = "3. Term\nThis Agreement expires on 2026-01-01.\n"
+RENEWAL = "\n4. Renewal\nThis Agreement renews for successive one-year periods.\n"
+DOC = PAYMENT + GOVERNING_LAW + TERM
+
+
+class StubLLM:
+    """Deterministic stand-in for GeminiClient; governing law only comes from here."""
+
+    model_name = "stub"
+
+    def __init__(self):
+        self.calls = []
+
+    def extract_and_analyze(self, text, lang=None):
+        self.calls.append(text)
+
+        class Result:
+            pass
+
+        result = Result()
+        result.metadata = Metadata(governing_law="Indonesia" if "Governing Law" in text else None)
+        result.risks = [RiskFinding(id="llm.risk", severity="low", title="LLM risk", detail="From the model")]
+        if "Renewal" in text:
+            # No clause_snippet, so the risk cannot be attributed to a segment
+            result.risks.append(RiskFinding(id="llm.renewal", severity="medium", title="Renewal", detail="Renews"))
+        return result
+
+
+def _summary(result):
+    return (
+        sorted(r.id for r in result.risks),
+        result.metadata.governing_law,
+        sorted(c.policy_id for c in result.compliance),
+    )
+
+
+class AnalyzeRevisionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = SQLiteCache(os.path.join(self.tmp.name, "segments.sqlite3"))
+        self.llm = StubLLM()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_text_twice_gives_same_result(self):
+        first = analyze_revision(DOC, default_policies(), cache=self.cache, llm=self.llm)
+        second = analyze_revision(DOC, default_policies(), cache=self.cache, llm=self.llm)
+        self.assertEqual(_summary(first), _summary(second))
+        self.assertEqual(second.metadata.governing_law, "Indonesia")
+        self.assertIn("llm.risk", [r.id for r in second.risks])
+
+    def test_segments_cached_from_another_contract_keep_document_metadata(self):
+        analyze_revision(DOC, default_policies(), cache=self.cache, llm=self.llm)
+        other = DOC.replace("USD 1,000", "USD 2,000")
+        result = analyze_revision(other, default_policies(), cache=self.cache, llm=self.llm)
+        self.assertEqual(result.metadata.governing_law, "Indonesia")
+        self.assertNotIn("policy.governing_law.required", [c.policy_id for c in result.compliance])
+
+    def test_appended_clause_only_sends_new_segment(self):
+        analyze_revision(DOC, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        result = analyze_revision(DOC + RENEWAL, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        self.assertEqual(result.changes.llm_segments, 1)
+        self.assertEqual(result.metadata.governing_law, "Indonesia")
+        self.assertIn("llm.renewal", [r.id for r in result.risks])
+
+    def test_modified_clause_resends_document(self):
+        analyze_revision(DOC, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        revised = DOC.replace("USD 1,000", "USD 2,000")
+        result = analyze_revision(revised, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        self.assertEqual(result.changes.modified, 1)
+        self.assertEqual(result.changes.llm_segments, 3)
+        self.assertEqual(result.metadata.governing_law, "Indonesia")
+
+    def test_removed_clause_drops_its_metadata(self):
+        analyze_revision(DOC, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        result = analyze_revision(PAYMENT + TERM, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        fresh = analyze_revision(PAYMENT + TERM, default_policies(), cache=self.cache, llm=StubLLM())
+        self.assertEqual(result.changes.removed, 1)
+        self.assertIsNone(result.metadata.governing_law)
+        self.assertIn("risk.governing_law.missing", [r.id for r in result.risks])
+        self.assertIn("policy.governing_law.required", [c.policy_id for c in result.compliance])
+        self.assertEqual(_summary(result), _summary(fresh))
+
+    def test_removed_clause_drops_unattributed_risk(self):
+        analyze_revision(DOC + RENEWAL, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        result = analyze_revision(DOC, default_policies(), document_id="doc", cache=self.cache, llm=self.llm)
+        self.assertEqual(result.changes.removed, 1)
+        self.assertNotIn("llm.renewal", [r.id for r in result.risks])
+
+
+if __name__ == "__main__":
+    unittest.main()
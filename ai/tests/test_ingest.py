@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from contract_ai.ingest import IngestOptions, Manifest, ingest, summary
+
+
+CONTRACT = "This Agreement is made between Acme Corp and Beta LLC.\nAcme Corp shall pay USD {amount} within 30 days.\n"
+OPTIONS = IngestOptions(mode="extract", use_llm=False, use_cache=False)
+
+
+class IngestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        base = Path(self.tmp.name)
+        self.root = base / "contracts"
+        self.output = base / "out" / "results.jsonl"
+        env = mock.patch.dict(
+            os.environ,
+            {
+                "CONTRACT_AI_CACHE_DIR": str(base / "cache"),
+                "CONTRACT_AI_SEARCH_INDEX": "0",
+                "CONTRACT_AI_SIMILARITY_INDEX": "0",
+            },
+        )
+        env.start()
+        self.addCleanup(env.stop)
+        self._write("a.txt", CONTRACT.format(amount="1,000"))
+        self._write("nested/copy-of-a.txt", CONTRACT.format(amount="1,000"))
+        self._write("c.txt", CONTRACT.format(amount="3,000"))
+        self._write("broken.docx", "not a zip")
+        self._write("notes.csv", "ignored")
+
+    def _write(self, rel, text):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def _run(self, **kwargs):
+        progress = ingest(self.root, self.output, options=OPTIONS, workers=1, progress_stream=io.StringIO(), **kwargs)
+        return summary(progress)
+
+    def _rows(self):
+        with open(self.output, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def _counts(self, stats):
+        return {k: stats[k] for k in ("total", "processed", "skipped", "duplicates", "errors")}
+
+    def test_first_run_records_results_duplicates_and_errors(self):
+        stats = self._run()
+        self.assertEqual(self._counts(stats), {"total": 4, "processed": 3, "skipped": 1, "duplicates": 1, "errors": 1})
+        rows = {r["path"]: r for r in self._rows()}
+        self.assertEqual(set(rows), {"a.txt", "nested/copy-of-a.txt", "c.txt", "broken.docx"})
+        self.assertEqual(rows["a.txt"]["status"], "ok")
+        self.assertEqual(rows["a.txt"]["result"]["metadata"]["amounts"], ["USD 1,000"])
+        self.assertIn("text_sha256", rows["a.txt"]["result"])
+        self.assertEqual(rows["nested/copy-of-a.txt"]["status"], "duplicate")
+        self.assertEqual(rows["nested/copy-of-a.txt"]["duplicate_of"], "a.txt")
+        self.assertNotIn("result", rows["nested/copy-of-a.txt"])
+        self.assertEqual(rows["broken.docx"]["status"], "error")
+        manifest = Manifest(self.output.with_name(self.output.name + ".manifest"))
+        manifest.close()
+        self.assertEqual(manifest.files["nested/copy-of-a.txt"][3], "duplicate")
+        self.assertEqual(manifest.origins[rows["a.txt"]["sha256"]], "a.txt")
+
+    def test_rerun_skips_everything(self):
+        self._run()
+        before = self._rows()
+        stats = self._run()
+        self.assertEqual(self._counts(stats), {"total": 4, "processed": 0, "skipped": 4, "duplicates": 0, "errors": 0})
+        self.assertEqual(self._rows(), before)
+
+    def test_resume_processes_only_new_and_changed_files(self):
+        self._run()
+        self._write("d.txt", CONTRACT.format(amount="4,000"))
+        self._write("c.txt", CONTRACT.format(amount="5,000"))
+        self._write("copy-of-c.txt", CONTRACT.format(amount="3,000"))
+        stats = self._run()
+        self.assertEqual(stats["processed"], 2)
+        self.assertEqual(stats["duplicates"], 1)
+        new_rows = self._rows()[4:]
+        self.assertEqual(sorted(r["path"] for r in new_rows if r["status"] == "ok"), ["c.txt", "d.txt"])
+        # The old content of c.txt was ingested before, so a new copy of it is a duplicate
+        self.assertEqual([r["duplicate_of"] for r in new_rows if r["status"] == "duplicate"], ["c.txt"])
+
+    def test_errors_are_retried_only_on_request(self):
+        self._run()
+        self.assertEqual(self._run()["errors"], 0)
+        stats = self._run(retry_errors=True)
+        self.assertEqual((stats["processed"], stats["errors"]), (1, 1))
+
+    def test_torn_lines_from_a_crash_are_closed(self):
+        self._run()
+        manifest_path = self.output.with_name(self.output.name + ".manifest")
+        for path in (manifest_path, self.output):
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('{"path": "c.txt", "sha2')
+        self._write("d.txt", CONTRACT.format(amount="4,000"))
+        self.assertEqual(self._run()["processed"], 1)
+        # d.txt's entries must not have been glued onto the torn lines
+        self.assertEqual(self._run()["processed"], 0)
+        with open(self.output, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.read().splitlines()[-1])["path"], "d.txt")
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ingest(self.root, self.output, options=IngestOptions(mode="summarize"), progress_stream=io.StringIO())
+
+
+if __name__ == "__main__":
+    unittest.main()
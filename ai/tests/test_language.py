@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+from contract_ai.cache import SQLiteCache
+from contract_ai.compliance import default_policies
+from contract_ai.extractor import extract, obligation_re
+from contract_ai.incremental import analyze_revision
+from contract_ai.language import DETECT_SAMPLE_CHARS, detect_language, detect_languages
+from contract_ai.risk import compiled_rules, scan_patterns
+
+
+ENGLISH = (
+    "This Agreement is made between Acme Corp and Beta LLC.\n"
+    "1. Acme Corp shall pay USD 1,000 to Beta LLC by 10 February 2025.\n"
+    "2. The parties shall keep all information confidential.\n"
+)
+
+INDONESIAN = (
+    "Perjanjian ini dibuat antara PT Maju Jaya dan PT Sentosa Abadi.\n"
+    "Pasal 1 Pembayaran\n"
+    "PT Maju Jaya wajib membayar Rp 100.000.000,00 kepada PT Sentosa Abadi paling lambat 10 Februari 2025.\n"
+    "Perjanjian ini akan diperpanjang secara otomatis untuk jangka waktu satu tahun.\n"
+)
+
+# English-majority bilingual contract: the automatic renewal is only stated in Indonesian
+BILINGUAL = (
+    "PERJANJIAN KERJASAMA / COOPERATION AGREEMENT\n\n"
+    "Perjanjian ini dibuat antara PT Maju Jaya dan Example Corp.\n"
+    "This Agreement is made between PT Maju Jaya and Example Corp.\n\n"
+    "Pasal 1 Pembayaran / Article 1 Payment\n"
+    "PT Maju Jaya wajib membayar Rp 100.000.000,00 kepada Example Corp paling lambat 10 Februari 2025.\n"
+    "PT Maju Jaya shall pay IDR 100,000,000.00 to Example Corp no later than 10 February 2025.\n\n"
+    "Pasal 2 Kerahasiaan / Article 2 Confidentiality\n"
+    "Para pihak wajib menjaga kerahasiaan informasi yang diterima dari pihak lainnya.\n"
+    "The parties shall keep confidential all information received from the other party.\n"
+    "Perjanjian ini akan diperpanjang secara otomatis untuk jangka waktu satu tahun.\n"
+)
+
+
+class DetectLanguagesTest(unittest.TestCase):
+    def test_single_language_documents(self):
+        self.assertEqual(detect_languages(ENGLISH), ("en",))
+        self.assertEqual(detect_languages(INDONESIAN), ("id",))
+        self.assertEqual(detect_language(INDONESIAN), "id")
+
+    def test_bilingual_document_lists_both_main_first(self):
+        langs = detect_languages(BILINGUAL)
+        self.assertEqual(sorted(langs), ["en", "id"])
+        self.assertEqual(detect_language(BILINGUAL), langs[0])
+
+    def test_no_stopwords_falls_back_to_default(self):
+        self.assertEqual(detect_languages("12345 --- ###"), ("en",))
+
+    def test_stray_words_do_not_add_a_language(self):
+        # A quoted Indonesian term is below the secondary share and hit minimum
+        text = ENGLISH * 3 + 'The term "wajib" means mandatory.\n'
+        self.assertEqual(detect_languages(text), ("en",))
+
+    def test_translation_appended_after_the_sample_head_is_detected(self):
+        text = ENGLISH * (DETECT_SAMPLE_CHARS // len(ENGLISH) + 1) + INDONESIAN * 40
+        self.assertEqual(detect_languages(text), ("en", "id"))
+
+
+class BilingualRoutingTest(unittest.TestCase):
+    def test_obligations_in_both_languages_are_extracted(self):
+        result = extract(BILINGUAL)
+        descriptions = [o.description for o in result.metadata.obligations]
+        self.assertEqual(len(descriptions), 4)
+        self.assertEqual(sum("wajib" in d for d in descriptions), 2)
+        self.assertEqual(sum("shall" in d for d in descriptions), 2)
+        due = {str(o.due_date) for o in result.metadata.obligations if o.due_date}
+        self.assertEqual(due, {"2025-02-10"})
+        self.assertEqual(result.language, detect_language(BILINGUAL))
+
+    def test_risk_rules_of_every_detected_language_run_once(self):
+        risks = scan_patterns(BILINGUAL)
+        self.assertEqual([r.id for r in risks].count("risk.auto_renew.hidden"), 1)
+
+    def test_rules_are_limited_to_the_given_languages(self):
+        self.assertEqual([r.id for r in scan_patterns(INDONESIAN, langs=("en",))], [])
+        self.assertEqual([r.id for r in scan_patterns(INDONESIAN, langs=("id",))], ["risk.auto_renew.hidden"])
+        english_only = {rule.get("lang") for rule, _ in compiled_rules(("en",))}
+        self.assertEqual(english_only, {"en", None})
+
+    def test_modal_verbs_are_unioned(self):
+        self.assertIsNone(obligation_re(("en",)).search("PT Maju Jaya wajib membayar"))
+        self.assertIsNotNone(obligation_re(("en", "id")).search("PT Maju Jaya wajib membayar"))
+        self.assertIsNotNone(obligation_re(("en", "id")).search("Acme shall pay"))
+
+    def test_revision_analysis_routes_both_languages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SQLiteCache(os.path.join(tmp, "segments.sqlite3"))
+            result = analyze_revision(BILINGUAL, default_policies(), use_llm=False, cache=cache)
+        self.assertEqual(len(result.metadata.obligations), 4)
+        self.assertIn("risk.auto_renew.hidden", [r.id for r in result.risks])
+        self.assertEqual(result.language, detect_language(BILINGUAL))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from contract_ai.limits import DEFAULT_MAX_CHARS, PeakBusy, UploadTooLarge, cap_text, get_limits, track_peak
+from contract_ai.parser import load_document
+
+
+class LimitsTest(unittest.TestCase):
+    def test_environment_configures_limits(self):
+        env = {"CONTRACT_AI_MAX_UPLOAD_MB": "0.5", "CONTRACT_AI_MAX_PAGES": "0", "CONTRACT_AI_MAX_CHARS": "lots"}
+        with mock.patch.dict(os.environ, env):
+            limits = get_limits()
+        self.assertEqual(limits.max_upload_bytes, 512 * 1024)
+        self.assertIsNone(limits.max_pages)
+        self.assertEqual(limits.max_chars, DEFAULT_MAX_CHARS)
+
+    def test_upload_too_large_message(self):
+        self.assertEqual(str(UploadTooLarge(512 * 1024)), "Upload exceeds the 0.5 MB limit")
+
+    def test_cap_text(self):
+        self.assertEqual(cap_text("abcdef", None), ("abcdef", None))
+        self.assertEqual(cap_text("abcdef", 6), ("abcdef", None))
+        text, truncation = cap_text("abcdef", 4)
+        self.assertEqual(text, "abcd")
+        self.assertEqual((truncation.reason, truncation.limit, truncation.total_pages), ("chars", 4, None))
+
+
+class DocumentTruncationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_text_file_cut_at_max_chars(self):
+        path = Path(self.tmp.name) / "contract.txt"
+        path.write_text("x" * 50, encoding="utf-8")
+        parsed = load_document(path, max_chars=20)
+        self.assertEqual(len(parsed.text), 20)
+        self.assertEqual(parsed.truncation.reason, "chars")
+        self.assertIsNone(load_document(path, max_chars=50).truncation)
+
+    def test_pdf_cut_at_max_pages(self):
+        from pypdf import PdfWriter
+
+        path = Path(self.tmp.name) / "contract.pdf"
+        writer = PdfWriter()
+        for _ in range(3):
+            writer.add_blank_page(width=200, height=200)
+        with open(path, "wb") as f:
+            writer.write(f)
+        parsed = load_document(path, max_pages=2)
+        self.assertEqual(len(parsed.offsets), 2)
+        self.assertEqual(
+            (parsed.truncation.reason, parsed.truncation.limit, parsed.truncation.total_pages), ("pages", 2, 3)
+        )
+        self.assertIsNone(load_document(path, max_pages=3).truncation)
+
+
+class TrackPeakTest(unittest.TestCase):
+    def test_peak_covers_the_block(self):
+        with track_peak() as peak:
+            data = bytearray(2 * 1024 * 1024)
+            del data
+        self.assertGreaterEqual(peak.peak_bytes, 2 * 1024 * 1024)
+
+    def test_overlapping_block_is_refused(self):
+        with track_peak():
+            with self.assertRaises(PeakBusy):
+                with track_peak():
+                    pass
+        with track_peak() as peak:
+            pass
+        self.assertGreaterEqual(peak.peak_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from contract_ai.parser import iter_docx_paragraphs, load_document
+
+
+_NS = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+
+def _part(root: str, body: str) -> str:
+    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:{root} {_NS}>{body}</w:{root}>'
+
+
+def _p(*runs: str) -> str:
+    return "<w:p>" + "".join(f"<w:r>{r}</w:r>" for r in runs) + "</w:p>"
+
+
+def _t(text: str) -> str:
+    return f"<w:t xml:space=\"preserve\">{text}</w:t>"
+
+
+def _cell(text: str) -> str:
+    return f"<w:tc>{_p(_t(text))}</w:tc>"
+
+
+TEXT_BOX = (
+    "<w:p><w:r><mc:AlternateContent>"
+    "<mc:Choice Requires=\"wps\"><w:drawing><wps:wsp><wps:txbx><w:txbxContent>"
+    + _p(_t("Boxed note"))
+    + "</w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>"
+    "<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>"
+    + _p(_t("Boxed note"))
+    + "</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>"
+    "</mc:AlternateContent></w:r>" + "<w:r>" + _t("Anchor") + "</w:r></w:p>"
+)
+
+DOCUMENT = _part(
+    "document",
+    "<w:body>"
+    + _p(_t("1. Payment"))
+    + _p(_t("Fee:"), "<w:tab/>", _t("USD 1,000"), "<w:br/>", _t("due monthly"))
+    + "<w:tbl><w:tr>" + _cell("Party") + _cell("Acme Corp") + "</w:tr>"
+    + "<w:tr>" + _cell("Term") + _cell("12 months") + "</w:tr></w:tbl>"
+    + TEXT_BOX
+    + "</w:body>",
+)
+
+
+def _write_docx(directory: str, parts: dict) -> Path:
+    path = Path(directory) / "contract.docx"
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, xml in parts.items():
+            zf.writestr(name, xml)
+    return path
+
+
+class DocxReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_reads_headers_body_tables_text_boxes_and_footers_in_order(self):
+        path = _write_docx(
+            self.tmp.name,
+            {
+                "word/document.xml": DOCUMENT,
+                "word/header2.xml": _part("hdr", _p(_t("Second header"))),
+                "word/header1.xml": _part("hdr", _p(_t("CONFIDENTIAL"))),
+                "word/footer1.xml": _part("ftr", _p(_t("Page footer"))),
+                "word/styles.xml": _part("styles", _p(_t("not text"))),
+            },
+        )
+        self.assertEqual(
+            list(iter_docx_paragraphs(path)),
+            [
+                ("word/header1.xml", "CONFIDENTIAL"),
+                ("word/header2.xml", "Second header"),
+                ("word/document.xml", "1. Payment"),
+                ("word/document.xml", "Fee:\tUSD 1,000\ndue monthly"),
+                ("word/document.xml", "Party"),
+                ("word/document.xml", "Acme Corp"),
+                ("word/document.xml", "Term"),
+                ("word/document.xml", "12 months"),
+                ("word/document.xml", "Boxed note"),
+                ("word/document.xml", "Anchor"),
+                ("word/footer1.xml", "Page footer"),
+            ],
+        )
+
+    def test_load_document_offsets_point_at_paragraphs(self):
+        path = _write_docx(self.tmp.name, {"word/document.xml": DOCUMENT})
+        parsed = load_document(path)
+        starts = [parsed.text[o : o + 6] for o in parsed.offsets]
+        self.assertEqual(starts, ["1. Pay", "Fee:\tU", "Party\n", "Acme C", "Term\n1", "12 mon", "Boxed ", "Anchor"])
+        self.assertEqual(parsed.text.count("Boxed note"), 1)
+        self.assertIsNone(parsed.truncation)
+
+    def test_max_chars_truncates(self):
+        path = _write_docx(self.tmp.name, {"word/document.xml": DOCUMENT})
+        parsed = load_document(path, max_chars=12)
+        self.assertEqual(len(parsed.text), 12)
+        self.assertEqual(parsed.truncation.reason, "chars")
+        self.assertEqual(parsed.truncation.limit, 12)
+
+    def test_invalid_package_raises_value_error(self):
+        path = Path(self.tmp.name) / "broken.docx"
+        path.write_bytes(b"not a zip")
+        with self.assertRaises(ValueError):
+            load_document(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
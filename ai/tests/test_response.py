@@ -0,0 +1,78 @@
+import hashlib
+import json
+import unittest
+
+from contract_ai.extractor import extract
+from contract_ai.response import line_offsets, parse_fields, shape_extraction, to_json
+from contract_ai.types import AnalysisResult, Metadata, Truncation
+
+
+TEXT = "This Agreement is made between Acme Corp and Beta LLC.\nAcme Corp shall pay USD 1,000.\n"
+
+
+def _json(model, fields=None):
+    return json.loads(to_json(model, include=parse_fields(fields)))
+
+
+class ShapeExtractionTest(unittest.TestCase):
+    def setUp(self):
+        self.result = extract(TEXT, langs=("en",))
+
+    def test_full_echoes_text_without_hash_fields(self):
+        body = _json(shape_extraction(self.result, "full"))
+        self.assertEqual(body["text"], TEXT)
+        self.assertNotIn("text_sha256", body)
+        self.assertNotIn("offsets", body)
+        self.assertNotIn("truncation", body)
+
+    def test_none_drops_text(self):
+        body = _json(shape_extraction(self.result, "none"))
+        self.assertNotIn("text", body)
+        self.assertNotIn("text_sha256", body)
+        self.assertIn("metadata", body)
+
+    def test_hash_reports_digest_and_length(self):
+        body = _json(shape_extraction(self.result, "hash"))
+        self.assertNotIn("text", body)
+        self.assertEqual(body["text_sha256"], hashlib.sha256(TEXT.encode("utf-8")).hexdigest())
+        self.assertEqual(body["text_length"], len(TEXT))
+        self.assertNotIn("offsets", body)
+
+    def test_offsets_default_to_line_starts(self):
+        body = _json(shape_extraction(self.result, "offsets"))
+        self.assertEqual(body["offsets"], [0, TEXT.index("Acme Corp shall"), len(TEXT)])
+        self.assertEqual(body["offsets"], line_offsets(TEXT))
+        self.assertEqual(_json(shape_extraction(self.result, "offsets", [0, 7]))["offsets"], [0, 7])
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            shape_extraction(self.result, "summary")
+
+
+class FieldsTest(unittest.TestCase):
+    def test_parse_fields_builds_nested_include(self):
+        self.assertIsNone(parse_fields(None))
+        self.assertIsNone(parse_fields(" , "))
+        self.assertEqual(
+            parse_fields("metadata.parties, metadata.effective_date,risks"),
+            {"metadata": {"parties": True, "effective_date": True}, "risks": True},
+        )
+
+    def test_whole_field_wins_over_its_subfields(self):
+        self.assertEqual(parse_fields("metadata,metadata.parties"), {"metadata": True})
+        self.assertEqual(parse_fields("metadata.parties,metadata"), {"metadata": True})
+
+    def test_fields_limit_the_serialized_response(self):
+        result = AnalysisResult(metadata=Metadata(governing_law="Indonesia", amounts=["USD 1"]), risks=[], compliance=[])
+        self.assertEqual(_json(result, "metadata.governing_law"), {"metadata": {"governing_law": "Indonesia"}})
+
+    def test_set_optional_fields_are_kept(self):
+        result = extract(TEXT, langs=("en",))
+        result.truncation = Truncation(reason="chars", limit=10)
+        body = _json(result)
+        self.assertEqual(body["truncation"]["reason"], "chars")
+        self.assertEqual(body["language"], "en")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from contract_ai import search, similarity
+from contract_ai.extractor import extract
+from contract_ai.search import SearchIndex, index_document
+from contract_ai.similarity import SimilarityIndex
+from contract_ai.types import AnalysisResult, ComplianceIssue, ExtractedParty, Metadata, RiskFinding
+
+
+CONTRACT = (
+    "This Agreement is made between Acme Corp and Beta LLC. Effective date: 1 January 2025.\n"
+    "1. Acme Corp shall pay USD 1,000 within 30 days of each invoice.\n"
+    "2. Beta LLC shall deliver the services described in Schedule 1.\n"
+    "3. This Agreement is governed by the laws of Indonesia.\n"
+)
+
+
+class IndexDocumentTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.search = SearchIndex(os.path.join(self.tmp.name, "search.sqlite3"))
+        self.similar = SimilarityIndex(os.path.join(self.tmp.name, "similarity.sqlite3"))
+        patches = [
+            mock.patch.object(search, "get_search_index", return_value=self.search),
+            mock.patch.object(similarity, "get_default_index", return_value=self.similar),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_indexed_extraction_is_searchable_and_similar(self):
+        index_document("acme", extract(CONTRACT), CONTRACT)
+        self.assertEqual([h.document_id for h in self.search.search("invoice")], ["acme"])
+        matches = self.similar.query(CONTRACT.replace("USD 1,000", "USD 2,000"))
+        self.assertEqual([m.document_id for m in matches], ["acme"])
+
+
+def _analysis(parties, expiration=None, risks=(), policies=(), title=None):
+    return AnalysisResult(
+        metadata=Metadata(
+            title=title,
+            expiration_date=expiration,
+            parties=[ExtractedParty(name=name, role=f"Party {'AB'[i]}") for i, name in enumerate(parties)],
+        ),
+        risks=[RiskFinding(id=r, severity="high", title=r, detail=r) for r in risks],
+        compliance=[ComplianceIssue(policy_id=p, title=p, severity="medium", requirement=p, finding=p) for p in policies],
+    )
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.index = SearchIndex(os.path.join(self.tmp.name, "search.sqlite3"))
+        self.index.upsert(
+            "lease",
+            _analysis(["Acme Corp", "Beta LLC"], date(2025, 6, 30), ["risk.auto_renewal"], title="Office Lease"),
+            "The lease renews by automatic renewal unless terminated. Rent is payable monthly.",
+        )
+        self.index.upsert(
+            "supply",
+            _analysis(["Gamma_Ltd", "Acme Corp"], date(2026, 1, 31), policies=["policy.governing_law.required"]),
+            "Gamma_Ltd shall supply widgets. Payment is due within 30 days of delivery.",
+        )
+        self.index.upsert("nda", _analysis(["Delta PT"]), "Each party keeps information confidential.")
+
+    def _ids(self, **filters):
+        return [h.document_id for h in self.index.search(**filters)]
+
+    def test_full_text_query_returns_snippet_and_rank(self):
+        hits = self.index.search("renewal")
+        self.assertEqual([h.document_id for h in hits], ["lease"])
+        self.assertIn("[renewal]", hits[0].snippet)
+        self.assertIsNotNone(hits[0].rank)
+        self.assertEqual(hits[0].title, "Office Lease")
+        self.assertEqual(hits[0].risk_ids, ["risk.auto_renewal"])
+
+    def test_prefix_and_fts_syntax_in_user_input(self):
+        self.assertEqual(self._ids(text="widg*"), ["supply"])
+        self.assertEqual(self._ids(text='widgets" OR "rent'), [])
+        self.assertEqual(self._ids(text="NEAR(rent"), [])
+
+    def test_metadata_filters(self):
+        self.assertEqual(self._ids(party="acme"), ["lease", "supply"])
+        self.assertEqual(self._ids(party="gamma_"), ["supply"])
+        self.assertEqual(self._ids(party="%"), [])
+        self.assertEqual(self._ids(expires_after=date(2025, 7, 1)), ["supply"])
+        self.assertEqual(self._ids(expires_before=date(2025, 6, 30)), ["lease"])
+        self.assertEqual(self._ids(risk_id="risk.auto_renewal"), ["lease"])
+        self.assertEqual(self._ids(policy_id="policy.governing_law.required"), ["supply"])
+        self.assertEqual(self._ids(text="payment", party="acme", expires_after=date(2025, 1, 1)), ["supply"])
+
+    def test_without_text_results_are_ordered_by_expiration(self):
+        self.assertEqual(self._ids(), ["lease", "supply", "nda"])
+        self.assertEqual(self._ids(limit=1), ["lease"])
+
+    def test_upsert_replaces_changed_parts_only(self):
+        self.assertFalse(
+            self.index.upsert(
+                "lease",
+                _analysis(["Acme Corp", "Beta LLC"], date(2025, 6, 30), ["risk.auto_renewal"], title="Office Lease"),
+            )
+        )
+        self.assertTrue(self.index.upsert("lease", _analysis(["Acme Corp", "Epsilon Inc"], date(2025, 6, 30))))
+        hit = self.index.search(party="epsilon")[0]
+        self.assertEqual(hit.parties, ["Acme Corp", "Epsilon Inc"])
+        self.assertEqual(hit.risk_ids, [])
+        self.assertEqual(self._ids(party="beta"), [])
+        # The text was not passed again, so it is still searchable
+        self.assertEqual(self._ids(text="rent"), ["lease"])
+
+    def test_extraction_result_does_not_clear_analysis(self):
+        self.index.upsert("lease", extract("Acme Corp shall pay rent. Effective date: 1 January 2025."))
+        self.assertEqual(self._ids(risk_id="risk.auto_renewal"), ["lease"])
+        self.assertEqual(self._ids(text="renewal"), [])
+        self.assertEqual(self._ids(text="rent"), ["lease"])
+
+    def test_remove(self):
+        self.index.remove("lease")
+        self.index.remove("missing")
+        self.assertEqual(self._ids(), ["supply", "nda"])
+        self.assertEqual(self._ids(text="renewal"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()